@@ -0,0 +1,153 @@
+"""Sustained load against the local JSON API.
+
+Starts `cli.py serve` on a temporary database, seeds it, then keeps a number
+of keep-alive clients busy with a read-heavy mix for a fixed time.
+
+Usage: python -m benchmarks.api_load [--clients 32] [--seconds 10] [--write-ratio 0.2]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class Client:
+    """Minimal HTTP/1.1 client over one keep-alive connection"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, port: int):
+        return cls(*await asyncio.open_connection('127.0.0.1', port))
+
+    async def request(self, method: str, path: str, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        length = 0
+        for line in head.split(b"\r\n"):
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":", 1)[1])
+        data = json.loads(await self.reader.readexactly(length)) if length else None
+        return status, data
+
+    def close(self):
+        self.writer.close()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_server(port: int, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            client = await Client.connect(port)
+            client.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+async def worker(port: int, task_ids: list, deadline: float, write_ratio: float, samples: dict):
+    client = await Client.connect(port)
+    try:
+        while time.monotonic() < deadline:
+            roll = random.random()
+            if roll < write_ratio / 2:
+                kind, request = 'create', ('POST', '/tasks', {
+                    'quadrant': random.randint(1, 4), 'description': f"Load task {random.random():.6f}"})
+            elif roll < write_ratio:
+                kind, request = 'update', ('PATCH', f"/tasks/{random.choice(task_ids)}",
+                                           {'done': random.random() < 0.5})
+            elif roll < 0.5 + write_ratio / 2:
+                kind, request = 'get', ('GET', f"/tasks/{random.choice(task_ids)}", None)
+            elif roll < 0.98:
+                kind, request = 'list', ('GET', f"/tasks?quadrant={random.randint(1, 4)}&limit=20", None)
+            else:
+                kind, request = 'stats', ('GET', '/stats', None)
+            start = time.perf_counter()
+            status, _ = await client.request(*request)
+            elapsed = time.perf_counter() - start
+            samples.setdefault(kind, []).append(elapsed)
+            if status >= 400:
+                samples.setdefault('errors', []).append(elapsed)
+    finally:
+        client.close()
+
+
+async def run(args, port: int):
+    await wait_for_server(port)
+    seed = await Client.connect(port)
+    operations = [{'op': 'add', 'quadrant': i % 4 + 1, 'description': f"Seed task {i}"}
+                  for i in range(args.tasks)]
+    status, data = await seed.request('POST', '/tasks/bulk', {'operations': operations})
+    seed.close()
+    if status != 200:
+        raise SystemExit(f"Seeding failed: {status} {data}")
+    task_ids = data['ids']
+
+    samples = {}
+    start = time.monotonic()
+    deadline = start + args.seconds
+    await asyncio.gather(*(worker(port, task_ids, deadline, args.write_ratio, samples)
+                           for _ in range(args.clients)))
+    elapsed = time.monotonic() - start
+
+    errors = len(samples.pop('errors', []))
+    total = sum(len(values) for values in samples.values())
+    print(f"{total} requests in {elapsed:.1f}s with {args.clients} clients: "
+          f"{total / elapsed:,.0f} req/s, {errors} errors")
+    print(f"{'kind':<8}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for kind, values in sorted(samples.items()):
+        values.sort()
+        p50 = values[len(values) // 2] * 1000
+        p99 = values[min(len(values) - 1, int(len(values) * 0.99))] * 1000
+        print(f"{kind:<8}{len(values):>8}{p50:>10.2f}{p99:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--tasks', type=int, default=2000, help="tasks seeded before the run")
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    parser.add_argument('--profile', default='balanced')
+    args = parser.parse_args()
+
+    port = free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        server = subprocess.Popen(
+            [sys.executable, str(ROOT / 'cli.py'), '--db', os.path.join(tmp, 'load.db'),
+             '--profile', args.profile, 'serve', '--port', str(port)],
+            cwd=ROOT, stdout=subprocess.DEVNULL
+        )
+        try:
+            asyncio.run(run(args, port))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Compare the SQLite performance profiles on typical task workloads.
+
+Usage: python -m benchmarks.db_profiles [--tasks N]
+"""
+import argparse
+import os
+import tempfile
+import time
+import uuid
+
+from src.database.db_manager import DatabaseManager
+from src.utils.constants import DB_PROFILES, QUADRANT_NAMES
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run_profile(profile: str, task_count: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, 'bench.db'), profile=profile)
+        task_ids = [str(uuid.uuid4()) for _ in range(task_count)]
+
+        def add_tasks():
+            for i, task_id in enumerate(task_ids):
+                db.add_task(task_id, QUADRANT_NAMES[i % 4], f"Task number {i}")
+
+        def toggle_status():
+            for task_id in task_ids[::4]:
+                db.update_task_status(task_id, True)
+
+        def load_quadrants():
+            for _ in range(20):
+                for quadrant in QUADRANT_NAMES:
+                    db.get_tasks(quadrant)
+
+        def statistics():
+            for _ in range(20):
+                db.get_statistics()
+
+        results = {
+            'add': timed(add_tasks),
+            'toggle': timed(toggle_status),
+            'load x20': timed(load_quadrants),
+            'stats x20': timed(statistics),
+        }
+        db.close()
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=2000)
+    args = parser.parse_args()
+
+    columns = None
+    for profile in DB_PROFILES:
+        results = run_profile(profile, args.tasks)
+        if columns is None:
+            columns = list(results)
+            print(f"{'profile':<10}" + "".join(f"{c:>12}" for c in columns))
+        print(f"{profile:<10}" + "".join(f"{results[c]:>11.3f}s" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Local JSON API over the task database, built on asyncio streams.
+
+Endpoints (JSON in and out):
+
+    GET    /health
+    GET    /tasks?quadrant=1&done=0&q=text&limit=100&offset=0
+    POST   /tasks                {"quadrant": 1, "description": "...", "tags": ["a"]}
+    GET    /tasks/<id>
+    PATCH  /tasks/<id>           any of quadrant, description, done, tags, due_at, remind_at
+    DELETE /tasks/<id>
+    POST   /tasks/bulk           {"operations": [{"op": "add", ...}, ...]}, all or nothing
+    GET    /stats
+    GET    /changes?since=<watermark>
+
+Reads run on a small thread pool through DatabaseManager's read-only
+snapshot connections. Writes are queued and applied by a single writer
+thread, which commits everything waiting in the queue as one transaction.
+"""
+import asyncio
+import hmac
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from src.database.db_manager import DatabaseManager
+from src.database.task_operations import TaskNotFoundError, apply_operation, resolve_quadrant
+from src.utils.constants import (API_HOST, API_MAX_BODY_BYTES, API_PORT, API_WRITE_BATCH_SIZE,
+                                 API_WRITE_QUEUE_SIZE, READ_POOL_SIZE)
+
+MAX_PAGE_SIZE = 1000
+
+
+class ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class TaskApiServer:
+    def __init__(self, db_path: str, profile: Optional[str] = None, token: Optional[str] = None):
+        if db_path == ':memory:':
+            raise ValueError("The API needs a database file")
+        self.token = token
+        # The writer connection is created on, and only ever used from, the writer thread
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-writer")
+        self.readers = ThreadPoolExecutor(max_workers=READ_POOL_SIZE, thread_name_prefix="api-reader")
+        self.db = self.writer.submit(DatabaseManager, db_path, profile).result()
+        self.write_queue = None
+
+    async def start(self, host: str = API_HOST, port: int = API_PORT,
+                    unix_path: Optional[str] = None) -> asyncio.AbstractServer:
+        self.write_queue = asyncio.Queue(maxsize=API_WRITE_QUEUE_SIZE)
+        self.write_task = asyncio.create_task(self.write_loop())
+        if unix_path:
+            return await asyncio.start_unix_server(self.handle_client, path=unix_path)
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    def close(self):
+        self.readers.shutdown()
+        self.writer.submit(self.db.close).result()
+        self.writer.shutdown()
+
+    # Writes
+
+    async def submit_write(self, operations: List[Dict[str, Any]]) -> List[str]:
+        """Queue operations that must commit together; returns the touched task ids"""
+        future = asyncio.get_running_loop().create_future()
+        # A full queue makes clients wait here instead of growing memory
+        await self.write_queue.put((operations, future))
+        return await future
+
+    async def write_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.write_queue.get()]
+            count = len(pending[0][0])
+            while count < API_WRITE_BATCH_SIZE and not self.write_queue.empty():
+                pending.append(self.write_queue.get_nowait())
+                count += len(pending[-1][0])
+            groups = [operations for operations, _ in pending]
+            try:
+                results = await loop.run_in_executor(self.writer, self.apply_groups, groups)
+            except Exception as e:
+                results = [e] * len(pending)
+            for (_, future), result in zip(pending, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def apply_groups(self, groups: List[List[Dict[str, Any]]]) -> List[Any]:
+        """Commit every group in one transaction; falls back to one per group if any fails"""
+        try:
+            with self.db.batch():
+                return [[apply_operation(self.db, op) for op in operations] for operations in groups]
+        except (ValueError, KeyError, TypeError) as e:
+            if len(groups) == 1:
+                return [e]
+        # One bad request must not fail the others queued with it
+        return [self.apply_groups([operations])[0] for operations in groups]
+
+    # Reads
+
+    async def read(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.readers, func, *args)
+
+    async def get_task(self, task_id: str) -> Dict[str, Any]:
+        task = await self.read(self.db.get_task, task_id)
+        if task is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"No such task: {task_id}")
+        return task
+
+    async def list_tasks(self, query: Dict[str, str]) -> Dict[str, Any]:
+        quadrant = resolve_quadrant(query['quadrant']) if 'quadrant' in query else None
+        done = query['done'].lower() in ('1', 'true', 'yes') if 'done' in query else None
+        limit = min(int(query.get('limit', 100)), MAX_PAGE_SIZE)
+        offset = int(query.get('offset', 0))
+        tasks = await self.read(self.db.list_tasks, quadrant, done, query.get('q', ''), limit, offset)
+        return {'tasks': tasks, 'limit': limit, 'offset': offset}
+
+    async def get_changes(self, since: Optional[str]) -> Dict[str, Any]:
+        watermark, tasks, deleted = await self.read(self.db.get_changes_since, since)
+        return {'watermark': watermark, 'tasks': tasks, 'deleted': deleted}
+
+    # HTTP
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[HTTPStatus, Any]:
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip('/').split('/') if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        data = json.loads(body) if body else {}
+        if not isinstance(data, dict):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Expected a JSON object")
+
+        if parts == ['health']:
+            return HTTPStatus.OK, {'status': 'ok'}
+        if parts == ['stats'] and method == 'GET':
+            return HTTPStatus.OK, await self.read(self.db.get_statistics)
+        if parts == ['changes'] and method == 'GET':
+            return HTTPStatus.OK, await self.get_changes(query.get('since'))
+        if parts == ['tasks']:
+            if method == 'GET':
+                return HTTPStatus.OK, await self.list_tasks(query)
+            if method == 'POST':
+                task_id, = await self.submit_write([dict(data, op='add')])
+                return HTTPStatus.CREATED, await self.get_task(task_id)
+        elif parts == ['tasks', 'bulk'] and method == 'POST':
+            operations = data.get('operations')
+            if not isinstance(operations, list) or not all(isinstance(op, dict) for op in operations):
+                raise ApiError(HTTPStatus.BAD_REQUEST, "Expected {\"operations\": [...]}")
+            return HTTPStatus.OK, {'ids': await self.submit_write(operations) if operations else []}
+        elif len(parts) == 2 and parts[0] == 'tasks':
+            task_id = parts[1]
+            if method == 'GET':
+                return HTTPStatus.OK, await self.get_task(task_id)
+            if method == 'PATCH':
+                await self.submit_write([dict(data, op='update', id=task_id)])
+                return HTTPStatus.OK, await self.get_task(task_id)
+            if method == 'DELETE':
+                await self.submit_write([{'op': 'delete', 'id': task_id}])
+                return HTTPStatus.OK, {'deleted': task_id}
+        else:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"No route for {url.path}")
+        raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on {url.path}")
+
+    def authorized(self, headers: Dict[str, str]) -> bool:
+        if not self.token:
+            return True
+        return hmac.compare_digest(headers.get('authorization', ''), f"Bearer {self.token}")
+
+    async def respond(self, method: str, target: str, headers: Dict[str, str],
+                      body: bytes) -> Tuple[HTTPStatus, Any]:
+        if target != '/health' and not self.authorized(headers):
+            return HTTPStatus.UNAUTHORIZED, {'error': "Missing or wrong bearer token"}
+        try:
+            return await self.dispatch(method, target, body)
+        except ApiError as e:
+            return e.status, {'error': str(e)}
+        except TaskNotFoundError as e:
+            return HTTPStatus.NOT_FOUND, {'error': str(e)}
+        except KeyError as e:
+            return HTTPStatus.BAD_REQUEST, {'error': f"Missing field: {e}"}
+        except (ValueError, TypeError) as e:
+            return HTTPStatus.BAD_REQUEST, {'error': str(e)}
+        except sqlite3.Error as e:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {'error': f"Database error: {e}"}
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve HTTP/1.1 requests on one connection, keeping it alive between requests"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                request_line, *header_lines = head.decode('latin-1').rstrip("\r\n").split("\r\n")
+                try:
+                    method, target, version = request_line.split(' ', 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                length = int(headers.get('content-length') or 0)
+                if length > API_MAX_BODY_BYTES:
+                    status, payload, keep_alive = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, \
+                        {'error': "Request body too large"}, False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.respond(method.upper(), target, headers, body)
+
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def run_server(server: TaskApiServer, host: str, port: int, unix_path: Optional[str]):
+    listener = await server.start(host, port, unix_path)
+    print(f"Serving the task API on {unix_path or f'http://{host}:{port}'}", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+def serve(db_path: str, profile: Optional[str] = None, host: str = API_HOST, port: int = API_PORT,
+          unix_path: Optional[str] = None, token: Optional[str] = None):
+    """Run the API until interrupted"""
+    server = TaskApiServer(db_path, profile, token)
+    try:
+        asyncio.run(run_server(server, host, port, unix_path))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
@@ -0,0 +1,229 @@
+"""Headless command-line access to the task database.
+
+Deliberately free of Qt imports so scripts and cron jobs start quickly:
+
+    python cli.py add 1 "Call the client" --tags work,client
+    python cli.py list --quadrant 2 --json
+    python cli.py complete <task-id>
+    python cli.py serve --port 8765
+    printf '{"op": "add", "quadrant": 1, "description": "A"}\n' | python cli.py batch
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from typing import List
+
+from src.database.db_manager import DatabaseManager
+from src.database.task_operations import apply_operation, resolve_quadrant
+from src.utils.boards import BoardRegistry
+from src.utils.constants import API_HOST, API_PORT, DB_PROFILE_ENV_VAR, QUADRANT_NAMES
+from src.utils.settings_manager import SettingsManager
+
+DB_PATH_ENV_VAR = "EISENHOWER_DB"
+API_TOKEN_ENV_VAR = "EISENHOWER_API_TOKEN"
+
+
+def print_tasks(tasks, as_json: bool):
+    if as_json:
+        json.dump(tasks, sys.stdout, ensure_ascii=False)
+        sys.stdout.write("\n")
+        return
+    for task in tasks:
+        number = QUADRANT_NAMES.index(task['quadrant']) + 1 if task['quadrant'] in QUADRANT_NAMES else '?'
+        mark = 'x' if task['done'] else ' '
+        print(f"{task['id']}\t{number}\t[{mark}]\t{task['description']}")
+
+
+def cmd_add(db, args):
+    descriptions = [line.strip() for line in sys.stdin] if args.description == ['-'] \
+        else [' '.join(args.description)]
+    ops = [{'op': 'add', 'quadrant': args.quadrant, 'description': text,
+            'tags': args.tags or '', 'done': args.done}
+           for text in descriptions if text]
+    with db.batch():
+        for op in ops:
+            print(apply_operation(db, op))
+
+
+def cmd_list(db, args):
+    quadrant = resolve_quadrant(args.quadrant) if args.quadrant else None
+    tasks = db.list_tasks(quadrant, None if args.all else False, limit=-1)
+    print_tasks(tasks, args.json)
+
+
+def cmd_move(db, args):
+    apply_operation(db, {'op': 'move', 'id': args.id, 'quadrant': args.quadrant})
+
+
+def cmd_complete(db, args):
+    apply_operation(db, {'op': 'complete', 'id': args.id, 'done': not args.undo})
+
+
+def cmd_edit(db, args):
+    apply_operation(db, {'op': 'edit', 'id': args.id, 'description': ' '.join(args.description)})
+
+
+def cmd_tag(db, args):
+    apply_operation(db, {'op': 'tag', 'id': args.id, 'tags': args.tags})
+
+
+def cmd_delete(db, args):
+    apply_operation(db, {'op': 'delete', 'id': args.id})
+
+
+def cmd_search(db, args):
+    print_tasks(db.search_tasks(' '.join(args.text), args.limit), args.json)
+
+
+def cmd_import(db, args):
+    from src.utils.data_manager import DataManager
+    data_manager = DataManager(db)
+    if len(args.files) > 1:
+        success, message = data_manager.import_batch(args.files)
+    elif args.files[0].lower().endswith('.csv'):
+        success, message = data_manager.import_from_csv(args.files[0], merge=not args.replace)
+    else:
+        success, message = data_manager.import_from_json(args.files[0], merge=not args.replace)
+    print(message)
+    if not success:
+        raise SystemExit(1)
+
+
+def cmd_export(db, args):
+    from src.utils.data_manager import DataManager
+    data_manager = DataManager(db)
+    export_format = args.format or ('csv' if args.file.lower().endswith('.csv') else 'json')
+    if args.delta:
+        export = data_manager.export_delta_csv if export_format == 'csv' else data_manager.export_delta_json
+        print(export(args.file))
+    else:
+        export = data_manager.export_to_csv if export_format == 'csv' else data_manager.export_to_json
+        print(export(args.file, include_notes=args.notes))
+
+
+def cmd_batch(db, args):
+    """One JSON operation per stdin line, all applied in a single transaction"""
+    touched = []
+    with db.batch():
+        for number, line in enumerate(sys.stdin, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                touched.append(apply_operation(db, json.loads(line)))
+            except (ValueError, KeyError) as e:
+                raise ValueError(f"line {number}: {e}")
+    print(f"Applied {len(touched)} operations")
+
+
+def cmd_serve(db, args):
+    from src.api.server import serve
+    # The server opens its own connections on its own threads
+    db.close()
+    serve(args.db, profile=db.profile, host=args.host, port=args.port,
+          unix_path=args.socket, token=args.token or os.environ.get(API_TOKEN_ENV_VAR))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description="Eisenhower Matrix tasks from the command line")
+    parser.add_argument('--db', default=os.environ.get(DB_PATH_ENV_VAR, 'tasks.db'),
+                        help=f"database file (default: ${DB_PATH_ENV_VAR} or tasks.db)")
+    parser.add_argument('--board', help="use the database of this board (as listed in the app's Boards menu)")
+    parser.add_argument('--profile', help=f"database performance profile (default: ${DB_PROFILE_ENV_VAR}, "
+                                          "then the app's settings)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add = commands.add_parser('add', help="add a task ('-' reads one description per stdin line)")
+    add.add_argument('quadrant')
+    add.add_argument('description', nargs='+')
+    add.add_argument('--tags')
+    add.add_argument('--done', action='store_true')
+    add.set_defaults(func=cmd_add)
+
+    list_cmd = commands.add_parser('list', help="list open tasks")
+    list_cmd.add_argument('--quadrant')
+    list_cmd.add_argument('--all', action='store_true', help="include completed tasks")
+    list_cmd.add_argument('--json', action='store_true')
+    list_cmd.set_defaults(func=cmd_list)
+
+    move = commands.add_parser('move', help="move a task to another quadrant")
+    move.add_argument('id')
+    move.add_argument('quadrant')
+    move.set_defaults(func=cmd_move)
+
+    complete = commands.add_parser('complete', help="mark a task done")
+    complete.add_argument('id')
+    complete.add_argument('--undo', action='store_true', help="mark it open again")
+    complete.set_defaults(func=cmd_complete)
+
+    edit = commands.add_parser('edit', help="change a task description")
+    edit.add_argument('id')
+    edit.add_argument('description', nargs='+')
+    edit.set_defaults(func=cmd_edit)
+
+    tag = commands.add_parser('tag', help="replace the tags of a task")
+    tag.add_argument('id')
+    tag.add_argument('tags', help="comma separated, empty to clear")
+    tag.set_defaults(func=cmd_tag)
+
+    delete = commands.add_parser('delete', help="delete a task")
+    delete.add_argument('id')
+    delete.set_defaults(func=cmd_delete)
+
+    search = commands.add_parser('search', help="find tasks by description")
+    search.add_argument('text', nargs='+')
+    search.add_argument('--limit', type=int, default=100)
+    search.add_argument('--json', action='store_true')
+    search.set_defaults(func=cmd_search)
+
+    import_cmd = commands.add_parser('import', help="merge JSON/CSV exports into the database")
+    import_cmd.add_argument('files', nargs='+', help="applied in order; for the same task the last file wins")
+    import_cmd.add_argument('--replace', action='store_true', help="replace all tasks (single file)")
+    import_cmd.set_defaults(func=cmd_import)
+
+    export = commands.add_parser('export', help="export tasks to JSON or CSV")
+    export.add_argument('file')
+    export.add_argument('--format', choices=['json', 'csv'])
+    export.add_argument('--delta', action='store_true', help="only changes since the last delta export")
+    export.add_argument('--notes', action='store_true', help="include task notes (full exports only)")
+    export.set_defaults(func=cmd_export)
+
+    batch = commands.add_parser('batch', help="apply JSON-lines operations from stdin in one transaction")
+    batch.set_defaults(func=cmd_batch)
+
+    serve = commands.add_parser('serve', help="run the local JSON API")
+    serve.add_argument('--host', default=API_HOST)
+    serve.add_argument('--port', type=int, default=API_PORT)
+    serve.add_argument('--socket', help="listen on this Unix socket instead of TCP")
+    serve.add_argument('--token', help=f"require this bearer token (or set ${API_TOKEN_ENV_VAR})")
+    serve.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    settings = SettingsManager()
+    if args.board:
+        args.db = BoardRegistry(settings).path(args.board)
+        if args.db is None:
+            print(f"Error: unknown board: {args.board}", file=sys.stderr)
+            return 1
+    db = DatabaseManager(args.db, profile=args.profile, configured_profile=settings.get('database.profile'))
+    try:
+        args.func(db, args)
+        return 0
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except sqlite3.Error as e:
+        # Typically another instance holding the write lock past every retry
+        print(f"Database error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
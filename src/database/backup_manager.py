@@ -0,0 +1,123 @@
+import gzip
+import hashlib
+import shutil
+import sqlite3
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+
+class BackupManager:
+    """Online snapshots of the task database through the SQLite backup API.
+
+    Backups copy a fixed number of pages per step from a dedicated connection
+    on a background thread. The source connection holds one read transaction
+    for the whole copy, so the snapshot is consistent and, in WAL mode,
+    writers are never blocked.
+    """
+
+    def __init__(self, db_path: str, backup_dir: Path = None, keep: int = 7,
+                 compress: bool = True, pages: int = 1024):
+        self.db_path = db_path
+        self.backup_dir = backup_dir or Path.home() / '.eisenhower_matrix' / 'backups'
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        self.keep = keep
+        self.compress = compress
+        self.pages = pages
+        self.lock = threading.Lock()
+        # Boards share the backup folder; the path hash keeps e.g. tasks.db and
+        # boards/tasks.db from listing and rotating each other's backups
+        path_hash = hashlib.blake2b(str(Path(db_path).resolve()).encode('utf-8'), digest_size=4).hexdigest()
+        self.prefix = f"{Path(db_path).stem}-{path_hash}"
+
+    def list_backups(self) -> List[Path]:
+        """Existing backups, newest first"""
+        backups = list(self.backup_dir.glob(f"{self.prefix}_*.db")) + \
+            list(self.backup_dir.glob(f"{self.prefix}_*.db.gz"))
+        return sorted(backups, key=lambda path: path.name, reverse=True)
+
+    def last_backup_time(self) -> Optional[datetime]:
+        backups = self.list_backups()
+        return datetime.fromtimestamp(backups[0].stat().st_mtime) if backups else None
+
+    def create_backup(self, on_done: Callable[[bool, str], None] = None) -> threading.Thread:
+        """Run backup_now on a background thread; on_done(success, path_or_error) runs on that thread"""
+        def run():
+            try:
+                path = self.backup_now()
+                if on_done:
+                    on_done(True, str(path))
+            except (sqlite3.Error, OSError) as e:
+                if on_done:
+                    on_done(False, str(e))
+
+        thread = threading.Thread(target=run, name="task-backup", daemon=True)
+        thread.start()
+        return thread
+
+    def backup_now(self) -> Path:
+        """Write one consistent snapshot and rotate old ones; returns its path"""
+        with self.lock:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+            target = self.backup_dir / f"{self.prefix}_{timestamp}.db"
+            partial = target.with_suffix('.partial')
+
+            source = sqlite3.connect(self.db_path, isolation_level=None)
+            destination = sqlite3.connect(partial)
+            try:
+                # Pin one read snapshot for every backup step
+                source.execute("BEGIN")
+                source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+                source.backup(destination, pages=self.pages, sleep=0.001)
+                source.execute("ROLLBACK")
+            finally:
+                destination.close()
+                source.close()
+
+            if self.compress:
+                target = target.with_suffix('.db.gz')
+                with open(partial, 'rb') as raw, gzip.open(target, 'wb', compresslevel=6) as packed:
+                    shutil.copyfileobj(raw, packed, 1024 * 1024)
+                partial.unlink()
+            else:
+                partial.replace(target)
+
+            self.rotate()
+            return target
+
+    def rotate(self):
+        for old in self.list_backups()[self.keep:]:
+            old.unlink(missing_ok=True)
+
+    def restore(self, backup_path: str, db_manager) -> bool:
+        """Replace the live database content with a backup, in place"""
+        backup_path = Path(backup_path)
+        temp_path = None
+        try:
+            if backup_path.suffix == '.gz':
+                with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as temp:
+                    temp_path = Path(temp.name)
+                    with gzip.open(backup_path, 'rb') as packed:
+                        shutil.copyfileobj(packed, temp, 1024 * 1024)
+                source_path = temp_path
+            else:
+                source_path = backup_path
+
+            source = sqlite3.connect(source_path)
+            try:
+                db_manager.conn.commit()
+                # Copied onto the live connection, so every open reader sees the restored data
+                source.backup(db_manager.conn)
+            finally:
+                source.close()
+            # Bring older backups up to the current schema
+            db_manager.setup_database()
+            return True
+        except (sqlite3.Error, OSError) as e:
+            print(f"Restore error: {e}")
+            return False
+        finally:
+            if temp_path:
+                temp_path.unlink(missing_ok=True)
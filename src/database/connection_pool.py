@@ -0,0 +1,86 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+from src.utils.constants import DB_BUSY_TIMEOUT_MS
+
+
+class ReadConnectionPool:
+    """A small pool of read-only connections for snapshot reads.
+
+    In WAL mode each reader sees the database as of the start of its read
+    transaction and never blocks the writer, so exports, statistics and
+    search can run while the UI keeps editing through the main connection.
+    """
+
+    def __init__(self, db_path: str, settings: Dict[str, Any], size: int = 4):
+        self.db_path = db_path
+        self.settings = settings
+        self.size = size
+        self.created = 0
+        self.lock = threading.Lock()
+        self.idle = queue.LifoQueue(maxsize=size)
+
+    def _connect(self) -> sqlite3.Connection:
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(
+            uri,
+            uri=True,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=self.settings['cached_statements']
+        )
+        # Readers only wait while a checkpoint resets the WAL or a crashed writer is recovered
+        conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.settings['mmap_size'])}")
+        conn.execute(f"PRAGMA cache_size = {int(self.settings['cache_size'])}")
+        conn.execute(f"PRAGMA temp_store = {self.settings['temp_store']}")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self.lock:
+            can_create = self.created < self.size
+            if can_create:
+                self.created += 1
+        if can_create:
+            try:
+                return self._connect()
+            except sqlite3.Error:
+                with self.lock:
+                    self.created -= 1
+                raise
+        return self.idle.get()
+
+    def release(self, conn: sqlite3.Connection):
+        self.idle.put(conn)
+
+    @contextmanager
+    def snapshot(self) -> Iterator[sqlite3.Connection]:
+        """Yield a connection holding one consistent point-in-time view.
+
+        The snapshot is pinned by the first query run inside the block.
+        """
+        conn = self.acquire()
+        try:
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            finally:
+                conn.execute("ROLLBACK")
+        finally:
+            self.release(conn)
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                break
+        self.created = 0
@@ -1,16 +1,222 @@
+import json
+import os
+import random
 import sqlite3
-from typing import List, Tuple, Dict, Any
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from typing import List, Tuple, Dict, Any, Optional, Iterator
+
+from src.utils.constants import (DB_PROFILES, DEFAULT_DB_PROFILE, DB_PROFILE_ENV_VAR, READ_POOL_SIZE,
+                                 DELTA_EXPORT_OVERLAP_SECONDS, TOMBSTONE_RETENTION_DAYS,
+                                 JOURNAL_MAX_ENTRIES, JOURNAL_MAX_BYTES, DB_BUSY_TIMEOUT_MS,
+                                 DB_LOCK_RETRIES, DB_LOCK_RETRY_DELAY_MS, NOTE_COMPRESS_MIN_BYTES)
+from src.utils.recurrence import next_occurrence
+from src.utils.timestamps import normalize_utc
+from .connection_pool import ReadConnectionPool
+
+# Stored in PRAGMA user_version; bump whenever setup_database changes the schema
+SCHEMA_VERSION = 6
+
+# Millisecond timestamps, so changes within the same second stay ordered
+NOW_MS = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+# ORDER BY clauses for the per-quadrant sort modes (see SORT_MODES)
+_ACTIVE_ORDER = {
+    'manual': "rowid",
+    'oldest': "created_at, rowid",
+    'newest': "created_at DESC, rowid DESC",
+    'alpha': "description COLLATE NOCASE, rowid",
+}
+_COMPLETED_ORDER = {
+    'manual': "completed_at DESC, id",
+    'oldest': "created_at, id",
+    'newest': "created_at DESC, id",
+    'alpha': "description COLLATE NOCASE, id",
+}
+
+
+def _text_filter(text: str) -> Tuple[str, tuple]:
+    """SQL fragment and parameters for a case-insensitive substring filter"""
+    if not text:
+        return "", ()
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return " AND description LIKE ? ESCAPE '\\'", (f"%{escaped}%",)
+
+
+def _task_row(row: tuple) -> Dict[str, Any]:
+    """Dict for an (id, quadrant, description, done, created_at, completed_at, updated_at,
+    due_at, remind_at) row"""
+    return {
+        'id': row[0],
+        'quadrant': row[1],
+        'description': row[2],
+        'done': bool(row[3]),
+        'created_at': row[4],
+        'completed_at': row[5],
+        'updated_at': row[6],
+        'due_at': row[7],
+        'remind_at': row[8],
+    }
+
+
+def _pack_note(text: str) -> Tuple[bytes, bool]:
+    """Stored form of a note body: (body, compressed)"""
+    body = text.encode('utf-8')
+    if len(body) >= NOTE_COMPRESS_MIN_BYTES:
+        packed = zlib.compress(body)
+        if len(packed) < len(body):
+            return packed, True
+    return body, False
+
+
+def _unpack_note(body: bytes, compressed: bool) -> str:
+    return (zlib.decompress(body) if compressed else bytes(body)).decode('utf-8')
+
+
+def is_locked_error(error: sqlite3.Error) -> bool:
+    """True for SQLITE_BUSY/SQLITE_LOCKED, i.e. another connection holds the lock"""
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+
+def resolve_profile(profile: Optional[str] = None, configured: Optional[str] = None) -> str:
+    """Pick the performance profile: explicit argument, environment override,
+    the one configured in the settings file, then the default"""
+    name = profile or os.environ.get(DB_PROFILE_ENV_VAR) or configured or DEFAULT_DB_PROFILE
+    if name not in DB_PROFILES:
+        print(f"Unknown database profile '{name}', using '{DEFAULT_DB_PROFILE}'")
+        name = DEFAULT_DB_PROFILE
+    return name
+
 
 class DatabaseManager:
-    def __init__(self, db_path: str = 'tasks.db'):
+    def __init__(self, db_path: str = 'tasks.db', profile: Optional[str] = None,
+                 configured_profile: Optional[str] = None):
         self.db_path = db_path
-        self.conn = sqlite3.connect(self.db_path)
+        self.profile = resolve_profile(profile, configured_profile)
+        settings = DB_PROFILES[self.profile]
+        self.conn = sqlite3.connect(
+            self.db_path,
+            timeout=DB_BUSY_TIMEOUT_MS / 1000,
+            cached_statements=settings['cached_statements']
+        )
         self.cursor = self.conn.cursor()
+        self.batch_depth = 0
+        self.batch_failed = False
+        # (task id -> state, series id -> state) before the open journal() scope changed them
+        self.journal_scope = None
+        self.apply_profile(settings)
         self.setup_database()
+        self.read_pool = None
+        if self.db_path != ':memory:':
+            self.read_pool = ReadConnectionPool(self.db_path, settings, READ_POOL_SIZE)
+
+    def apply_profile(self, settings: Dict[str, Any]):
+        """Apply the connection pragmas of a performance profile"""
+        try:
+            self.cursor.execute(f"PRAGMA journal_mode = {settings['journal_mode']}")
+            self.cursor.execute(f"PRAGMA synchronous = {settings['synchronous']}")
+            self.cursor.execute(f"PRAGMA mmap_size = {int(settings['mmap_size'])}")
+            self.cursor.execute(f"PRAGMA cache_size = {int(settings['cache_size'])}")
+            self.cursor.execute(f"PRAGMA temp_store = {settings['temp_store']}")
+        except sqlite3.Error as e:
+            print(f"Database profile error: {e}")
+
+    def _commit(self):
+        # Inside batch() the whole batch commits once at the end
+        if self.batch_depth == 0:
+            self.conn.commit()
+
+    def _rollback(self):
+        if self.batch_depth == 0:
+            self.conn.rollback()
+        else:
+            self.batch_failed = True
+
+    def _begin_immediate(self):
+        """Start a transaction holding the write lock, retrying while another process has it.
+
+        Taking the lock up front means a batch never fails half way because a
+        read turned into a write after someone else committed.
+        """
+        delay = DB_LOCK_RETRY_DELAY_MS / 1000
+        for attempt in range(DB_LOCK_RETRIES + 1):
+            try:
+                self.conn.execute("BEGIN IMMEDIATE")
+                return
+            except sqlite3.OperationalError as e:
+                if not is_locked_error(e) or attempt == DB_LOCK_RETRIES:
+                    raise
+            # busy_timeout already waited; back off with jitter so contenders spread out
+            time.sleep(delay * (1 + random.random()))
+            delay *= 2
+
+    @contextmanager
+    def batch(self):
+        """Run several write methods as one all-or-nothing transaction.
+
+        Raises sqlite3.OperationalError if the write lock cannot be taken.
+        """
+        if self.batch_depth == 0 and not self.conn.in_transaction:
+            self._begin_immediate()
+        self.batch_depth += 1
+        try:
+            yield self
+        except Exception:
+            self.batch_failed = True
+            raise
+        finally:
+            self.batch_depth -= 1
+            if self.batch_depth == 0:
+                if self.batch_failed:
+                    self.conn.rollback()
+                else:
+                    self.conn.commit()
+                self.batch_failed = False
+
+    @contextmanager
+    def journal(self, label: str):
+        """Record the task changes made inside as one undoable operation.
+
+        Write methods capture the rows they are about to change; on exit the
+        rows that actually changed are stored with their state before and
+        after. Nested scopes fold into the outermost one.
+        """
+        if self.journal_scope is not None:
+            yield self
+            return
+        self.journal_scope = ({}, {})
+        try:
+            yield self
+        finally:
+            scope, self.journal_scope = self.journal_scope, None
+        self._record_journal(label, *scope)
+
+    @contextmanager
+    def snapshot(self) -> Iterator[sqlite3.Connection]:
+        """Read-only connection with a consistent view, separate from the UI writer"""
+        if self.read_pool is None:
+            # In-memory databases cannot be shared between connections
+            yield self.conn
+            return
+        with self.read_pool.snapshot() as conn:
+            yield conn
 
     def setup_database(self):
         """Create or update the tasks table with correct schema"""
         try:
+            # Up-to-date databases open without touching the schema
+            if self.cursor.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+                return
+            # Another instance may be upgrading the same file; whoever gets the lock
+            # first does it, the other finds the new version once it gets the lock
+            self._begin_immediate()
+            if self.cursor.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+                self.conn.commit()
+                return
+
             # First check if table exists and has correct schema
             self.cursor.execute("PRAGMA table_info(tasks)")
             columns = {column[1] for column in self.cursor.fetchall()}
@@ -62,23 +268,259 @@ class DatabaseManager:
                 # Drop backup table
                 self.cursor.execute("DROP TABLE IF EXISTS tasks_backup")
                 
-           
+            self.setup_archive()
+            self.setup_schedule()
+            self.setup_series()
+            self.setup_indexes()
+            self.setup_tags()
+            self.setup_change_tracking()
+            self.setup_views()
+            self.setup_journal()
+            self.setup_notes()
+            self.cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
             self.conn.commit()
             
         except sqlite3.Error as e:
+            self.conn.rollback()
             print(f"Database setup error: {e}")
     
    
+    def setup_archive(self):
+        """Create the archive tier and the view spanning both tiers"""
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tasks_archive (
+                id TEXT PRIMARY KEY,
+                quadrant TEXT,
+                description TEXT,
+                done BOOLEAN DEFAULT 1,
+                created_at TIMESTAMP,
+                completed_at TIMESTAMP,
+                deleted BOOLEAN DEFAULT 0,
+                archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        # Lets the archive policy find old completed rows without a table scan
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_done_completed ON tasks(done, completed_at)"
+        )
+
+    def setup_schedule(self):
+        """Due dates and reminder times, on both tiers so archiving keeps them"""
+        for table in ('tasks', 'tasks_archive'):
+            self._ensure_column(table, 'due_at', 'TIMESTAMP')
+            self._ensure_column(table, 'remind_at', 'TIMESTAMP')
+        # Only pending reminders are indexed; the scheduler reads the first few in order
+        self.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tasks_remind ON tasks(remind_at, id)
+            WHERE remind_at IS NOT NULL AND done = 0
+        """)
+        # Urgency promotion scans deadlines per quadrant
+        self.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tasks_quadrant_due ON tasks(quadrant, due_at)
+            WHERE due_at IS NOT NULL AND done = 0
+        """)
+        # Small bookkeeping values such as the last promotion threshold
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS app_state (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+
+    def setup_series(self):
+        """Recurring tasks: one row per series, only its next instance lives in tasks"""
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS task_series (
+                id TEXT PRIMARY KEY,
+                quadrant TEXT NOT NULL,
+                description TEXT NOT NULL,
+                frequency TEXT NOT NULL,
+                interval INTEGER NOT NULL DEFAULT 1,
+                anchor_at TIMESTAMP NOT NULL,
+                remind_offset_minutes INTEGER,
+                next_due_at TIMESTAMP
+            )
+        """)
+        for table in ('tasks', 'tasks_archive'):
+            self._ensure_column(table, 'series_id', 'TEXT')
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_series ON tasks(series_id) WHERE series_id IS NOT NULL"
+        )
+
+    def setup_views(self):
+        """View spanning the hot table and the archive"""
+        self.cursor.execute("DROP VIEW IF EXISTS all_tasks")
+        self.cursor.execute("""
+            CREATE VIEW all_tasks AS
+                SELECT id, quadrant, description, done, created_at, completed_at, deleted, updated_at,
+                       due_at, remind_at
+                FROM tasks
+                UNION ALL
+                SELECT id, quadrant, description, done, created_at, completed_at, deleted, updated_at,
+                       due_at, remind_at
+                FROM tasks_archive
+        """)
+
+    def setup_journal(self):
+        """Undo/redo log: one row per operation, its row images zlib-compressed JSON"""
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS op_journal (
+                id INTEGER PRIMARY KEY,
+                label TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                undone BOOLEAN NOT NULL DEFAULT 0,
+                size INTEGER NOT NULL,
+                changes BLOB NOT NULL
+            )
+        """)
+
+    def setup_notes(self):
+        """Long notes, one row per task, kept out of the tasks table so task queries never read them"""
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS task_notes (
+                task_id TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                compressed BOOLEAN NOT NULL DEFAULT 0,
+                size INTEGER NOT NULL
+            )
+        """)
+        # Editing a note changes the task for delta exports and other instances
+        for event, row in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+            self.cursor.execute(f"DROP TRIGGER IF EXISTS task_notes_touch_{event.lower()}")
+            self.cursor.execute(f"""
+                CREATE TRIGGER task_notes_touch_{event.lower()} AFTER {event} ON task_notes
+                BEGIN
+                    UPDATE tasks SET updated_at = {NOW_MS} WHERE id = {row}.task_id;
+                    UPDATE tasks_archive SET updated_at = {NOW_MS} WHERE id = {row}.task_id;
+                END
+            """)
+
+    def _ensure_column(self, table: str, column: str, declaration: str) -> bool:
+        """Add a column to an existing table; returns True if it was missing"""
+        self.cursor.execute(f"PRAGMA table_info({table})")
+        if column in {row[1] for row in self.cursor.fetchall()}:
+            return False
+        self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+        return True
+
+    def setup_change_tracking(self):
+        """updated_at columns, tombstones for deleted rows and per-destination export watermarks"""
+        for table in ('tasks', 'tasks_archive'):
+            if self._ensure_column(table, 'updated_at', 'TIMESTAMP'):
+                self.cursor.execute(
+                    f"UPDATE {table} SET updated_at = COALESCE(completed_at, created_at, {NOW_MS})"
+                )
+            self.cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_updated ON {table}(updated_at)"
+            )
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS task_tombstones (
+                id TEXT PRIMARY KEY,
+                deleted_at TIMESTAMP NOT NULL
+            )
+        """)
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_task_tombstones_deleted ON task_tombstones(deleted_at)"
+        )
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS export_watermarks (
+                destination TEXT PRIMARY KEY,
+                exported_at TIMESTAMP NOT NULL
+            )
+        """)
+
+        # Triggers are recreated so their definitions follow this code
+        for table in ('tasks', 'tasks_archive'):
+            other = 'tasks_archive' if table == 'tasks' else 'tasks'
+            for trigger in ('touch_insert', 'touch_update', 'tombstone', 'forget_tombstone'):
+                self.cursor.execute(f"DROP TRIGGER IF EXISTS {table}_{trigger}")
+            # Bulk writers set updated_at themselves and skip the extra update
+            self.cursor.execute(f"""
+                CREATE TRIGGER {table}_touch_insert AFTER INSERT ON {table}
+                WHEN NEW.updated_at IS NULL
+                BEGIN
+                    UPDATE {table} SET updated_at = {NOW_MS} WHERE id = NEW.id;
+                END
+            """)
+            self.cursor.execute(f"""
+                CREATE TRIGGER {table}_forget_tombstone AFTER INSERT ON {table}
+                BEGIN
+                    DELETE FROM task_tombstones WHERE id = NEW.id;
+                END
+            """)
+            self.cursor.execute(f"""
+                CREATE TRIGGER {table}_touch_update
+                AFTER UPDATE OF quadrant, description, done, completed_at, deleted, due_at, remind_at ON {table}
+                BEGIN
+                    UPDATE {table} SET updated_at = {NOW_MS} WHERE id = NEW.id;
+                END
+            """)
+            # Moving a row between the tiers is not a deletion
+            self.cursor.execute(f"""
+                CREATE TRIGGER {table}_tombstone AFTER DELETE ON {table}
+                WHEN NOT EXISTS (SELECT 1 FROM {other} WHERE id = OLD.id)
+                BEGIN
+                    INSERT OR REPLACE INTO task_tombstones (id, deleted_at) VALUES (OLD.id, {NOW_MS});
+                END
+            """)
+        for event, row in (('INSERT', 'NEW'), ('DELETE', 'OLD')):
+            self.cursor.execute(f"DROP TRIGGER IF EXISTS task_tags_touch_{event.lower()}")
+            self.cursor.execute(f"""
+                CREATE TRIGGER task_tags_touch_{event.lower()} AFTER {event} ON task_tags
+                BEGIN
+                    UPDATE tasks SET updated_at = {NOW_MS} WHERE id = {row}.task_id;
+                    UPDATE tasks_archive SET updated_at = {NOW_MS} WHERE id = {row}.task_id;
+                END
+            """)
+
+    def setup_indexes(self):
+        """Indexes for the per-quadrant hot paths"""
+        # Active tasks are loaded eagerly per quadrant, completed ones paged by completion time
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_quadrant_done ON tasks(quadrant, done, completed_at)"
+        )
+        # Sort modes
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_quadrant_created ON tasks(quadrant, done, created_at)"
+        )
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_quadrant_alpha "
+            "ON tasks(quadrant, done, description COLLATE NOCASE)"
+        )
+
+    def setup_tags(self):
+        """Normalized tags: one row per tag name, one row per task/tag pair"""
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tags (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            )
+        """)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS task_tags (
+                task_id TEXT NOT NULL,
+                tag_id INTEGER NOT NULL,
+                PRIMARY KEY (task_id, tag_id)
+            ) WITHOUT ROWID
+        """)
+        # The primary key serves lookups by task, this one lookups by tag
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_task_tags_tag ON task_tags(tag_id, task_id)"
+        )
+
     def add_task(self, task_id: str, quadrant: str, description: str, done: bool = False) -> bool:
         """Add a task to the database"""
         try:
+            self._journal_capture([task_id])
             self.cursor.execute(
                 "INSERT INTO tasks (id, quadrant, description, done) VALUES (?, ?, ?, ?)",
                 (task_id, quadrant, description, done)
             )
-            self.conn.commit()
+            self._commit()
             return True
-        except sqlite3.Error:
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in add_task: {e}")
             return False
 
     def get_tasks(self, quadrant: str) -> List[Tuple]:
@@ -87,9 +529,92 @@ class DatabaseManager:
             (quadrant,)
         ).fetchall()
 
+    def get_task_order(self, quadrant: str, sort_mode: str = 'manual', text: str = '') -> List[str]:
+        """Ids of the open tasks of a quadrant matching text, in sort_mode order"""
+        condition, params = _text_filter(text)
+        order = _ACTIVE_ORDER.get(sort_mode, _ACTIVE_ORDER['manual'])
+        rows = self.cursor.execute(
+            f"SELECT id FROM tasks WHERE quadrant=? AND done=0{condition} ORDER BY {order}",
+            (quadrant,) + params
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_task_states(self, task_ids) -> Dict[str, Tuple[str, str, bool]]:
+        """(quadrant, description, done) of the given hot-table tasks; missing ids are omitted"""
+        task_ids = list(task_ids)
+        states = {}
+        for start in range(0, len(task_ids), 500):
+            chunk = task_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.cursor.execute(
+                f"SELECT id, quadrant, description, done FROM tasks WHERE id IN ({placeholders})",
+                chunk
+            ).fetchall()
+            for task_id, quadrant, description, done in rows:
+                states[task_id] = (quadrant, description, bool(done))
+        return states
+
+    def get_active_task_states(self) -> Dict[str, Tuple[str, str, bool]]:
+        """(quadrant, description, done) of every open task, in insertion order"""
+        rows = self.cursor.execute(
+            "SELECT id, quadrant, description, done FROM tasks WHERE done=0 ORDER BY rowid"
+        ).fetchall()
+        return {row[0]: (row[1], row[2], bool(row[3])) for row in rows}
+
+    def iter_active_task_chunks(self, quadrants: List[str], head_rows: int,
+                                chunk_size: int) -> Iterator[Tuple[str, List[Tuple]]]:
+        """Yield (quadrant, rows) chunks of open tasks from one read snapshot.
+
+        The first head_rows of every quadrant come first, then the remainder
+        in chunk_size pieces, so callers can fill what is visible before the rest.
+        """
+        with self.snapshot() as conn:
+            for quadrant in quadrants:
+                rows = conn.execute(
+                    "SELECT id, description, done FROM tasks WHERE quadrant=? AND done=0 "
+                    "ORDER BY rowid LIMIT ?",
+                    (quadrant, head_rows)
+                ).fetchall()
+                if rows:
+                    yield quadrant, rows
+            for quadrant in quadrants:
+                cursor = conn.execute(
+                    "SELECT id, description, done FROM tasks WHERE quadrant=? AND done=0 "
+                    "ORDER BY rowid LIMIT -1 OFFSET ?",
+                    (quadrant, head_rows)
+                )
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield quadrant, rows
+
+    def get_completed_tasks(self, quadrant: str, offset: int, limit: int,
+                            sort_mode: str = 'manual', text: str = '') -> List[Tuple]:
+        """One page of completed tasks of a quadrant, most recently completed first by default"""
+        condition, params = _text_filter(text)
+        order = _COMPLETED_ORDER.get(sort_mode, _COMPLETED_ORDER['manual'])
+        return self.cursor.execute(
+            f"SELECT id, description, done FROM tasks WHERE quadrant=? AND done=1{condition} "
+            f"ORDER BY {order} LIMIT ? OFFSET ?",
+            (quadrant,) + params + (limit, offset)
+        ).fetchall()
+
+    def count_completed_tasks(self, quadrant: str, text: str = '') -> int:
+        condition, params = _text_filter(text)
+        return self.cursor.execute(
+            f"SELECT COUNT(*) FROM tasks WHERE quadrant=? AND done=1{condition}",
+            (quadrant,) + params
+        ).fetchone()[0]
+
     def update_task_status(self, task_id: str, done: bool) -> bool:
-        """Update task status and set completed_at timestamp if done"""
+        """Update task status and set completed_at timestamp if done.
+
+        Completing an instance of a recurring series creates the next one in
+        the same transaction; reopening it removes that successor again.
+        """
         try:
+            self._journal_capture([task_id])
             if done:
                 self.cursor.execute("""
                     UPDATE tasks 
@@ -97,6 +622,7 @@ class DatabaseManager:
                         completed_at = CURRENT_TIMESTAMP 
                     WHERE id = ?
                 """, (task_id,))
+                self._advance_series(task_id)
             else:
                 self.cursor.execute("""
                     UPDATE tasks 
@@ -104,55 +630,228 @@ class DatabaseManager:
                         completed_at = NULL 
                     WHERE id = ?
                 """, (task_id,))
+                self._rewind_series(task_id)
             
-            self.conn.commit()
-            
-            # Verify the update
-            self.cursor.execute("SELECT done FROM tasks WHERE id = ?", (task_id,))
-            result = self.cursor.fetchone()
-            print(f"Task {task_id} status updated to {done}, verified value: {result[0] if result else 'not found'}")
-            
+            self._commit()
             return True
         except sqlite3.Error as e:
+            self._rollback()
             print(f"Database error in update_task_status: {e}")
             return False
 
+    def update_tasks_status(self, task_ids: List[str], done: bool) -> bool:
+        """Complete or reopen many tasks in a single transaction.
+
+        Tasks already in that state keep their completion time. Recurring
+        instances advance or rewind their series as in update_task_status.
+        """
+        try:
+            task_ids = list(task_ids)
+            self._journal_capture(task_ids)
+            recurring = []
+            for start in range(0, len(task_ids), 500):
+                chunk = task_ids[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                recurring.extend(row[0] for row in self.cursor.execute(
+                    f"SELECT id FROM tasks WHERE id IN ({placeholders}) AND series_id IS NOT NULL "
+                    "AND done != ?", chunk + [done]
+                ).fetchall())
+            rows = [(task_id,) for task_id in task_ids]
+            if done:
+                self.cursor.executemany(
+                    "UPDATE tasks SET done = 1, completed_at = CURRENT_TIMESTAMP WHERE id = ? AND done = 0", rows
+                )
+            else:
+                self.cursor.executemany(
+                    "UPDATE tasks SET done = 0, completed_at = NULL WHERE id = ? AND done = 1", rows
+                )
+            for task_id in recurring:
+                if done:
+                    self._advance_series(task_id)
+                else:
+                    self._rewind_series(task_id)
+            self._commit()
+            return True
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in update_tasks_status: {e}")
+            return False
+
+    def _advance_series(self, task_id: str):
+        """Materialize the next instance after task_id, unless one is already open"""
+        row = self.cursor.execute("""
+            SELECT s.id, s.quadrant, s.description, s.frequency, s.interval, s.anchor_at,
+                   s.remind_offset_minutes, t.due_at
+            FROM tasks t JOIN task_series s ON s.id = t.series_id
+            WHERE t.id = ?
+        """, (task_id,)).fetchone()
+        if row is None:
+            return
+        series_id, quadrant, description, frequency, interval, anchor_at, remind_offset, due_at = row
+        if self.cursor.execute(
+            "SELECT 1 FROM tasks WHERE series_id = ? AND done = 0 LIMIT 1", (series_id,)
+        ).fetchone():
+            return
+        # Occurrences missed while the task was overdue are skipped, not created
+        now = self.cursor.execute("SELECT datetime('now')").fetchone()[0]
+        next_due = next_occurrence(frequency, interval, anchor_at, max(due_at or anchor_at, now))
+        next_id = str(uuid.uuid4())
+        self._journal_capture([next_id])
+        self.cursor.execute("""
+            INSERT INTO tasks (id, quadrant, description, done, due_at, remind_at, series_id)
+            VALUES (?, ?, ?, 0, ?, CASE WHEN ? IS NOT NULL
+                                        THEN datetime(?, printf('-%d minutes', ?)) END, ?)
+        """, (next_id, quadrant, description, next_due, remind_offset, next_due, remind_offset, series_id))
+        self.cursor.execute(
+            "INSERT INTO task_tags (task_id, tag_id) SELECT ?, tag_id FROM task_tags WHERE task_id = ?",
+            (next_id, task_id)
+        )
+        self.cursor.execute("UPDATE task_series SET next_due_at = ? WHERE id = ?", (next_due, series_id))
+
+    def _rewind_series(self, task_id: str):
+        """Undo _advance_series for a reopened instance"""
+        row = self.cursor.execute(
+            "SELECT series_id, due_at FROM tasks WHERE id = ? AND series_id IS NOT NULL", (task_id,)
+        ).fetchone()
+        if row is None:
+            return
+        series_id, due_at = row
+        successors = [(successor,) for successor, in self.cursor.execute(
+            "SELECT id FROM tasks WHERE series_id = ? AND done = 0 AND id != ? AND due_at > ?",
+            (series_id, task_id, due_at or '')
+        ).fetchall()]
+        self._journal_capture([successor for successor, in successors])
+        self.cursor.executemany("DELETE FROM task_tags WHERE task_id = ?", successors)
+        self.cursor.executemany("DELETE FROM tasks WHERE id = ?", successors)
+        self.cursor.execute("UPDATE task_series SET next_due_at = ? WHERE id = ?", (due_at, series_id))
+
     def delete_task(self, task_id: str) -> bool:
         try:
+            self._journal_capture([task_id])
+            # Deleting the open instance of a recurring task ends the series
+            self.cursor.execute(
+                "DELETE FROM task_series WHERE id = (SELECT series_id FROM tasks WHERE id=? AND done=0)",
+                (task_id,)
+            )
             self.cursor.execute("DELETE FROM tasks WHERE id=?", (task_id,))
-            self.conn.commit()
+            self.cursor.execute("DELETE FROM tasks_archive WHERE id=?", (task_id,))
+            self.cursor.execute("DELETE FROM task_tags WHERE task_id=?", (task_id,))
+            self.cursor.execute("DELETE FROM task_notes WHERE task_id=?", (task_id,))
+            self._commit()
             return True
-        except sqlite3.Error:
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in delete_task: {e}")
             return False
 
     def update_task_description(self, task_id: str, description: str) -> bool:
         try:
+            self._journal_capture([task_id])
             self.cursor.execute(
                 "UPDATE tasks SET description=? WHERE id=?",
                 (description, task_id)
             )
-            self.conn.commit()
+            # Renaming the open instance renames the instances still to come
+            self.cursor.execute(
+                "UPDATE task_series SET description=? "
+                "WHERE id = (SELECT series_id FROM tasks WHERE id=? AND done=0)",
+                (description, task_id)
+            )
+            self._commit()
             return True
-        except sqlite3.Error:
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in update_task_description: {e}")
             return False
 
     def move_task(self, task_id: str, new_quadrant: str) -> bool:
         try:
+            self._journal_capture([task_id])
             self.cursor.execute(
                 "UPDATE tasks SET quadrant=? WHERE id=?",
                 (new_quadrant, task_id)
             )
-            self.conn.commit()
+            self._commit()
             return True
-        except sqlite3.Error:
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in move_task: {e}")
+            return False
+
+    def insert_tasks(self, tasks: List[Dict[str, Any]]) -> bool:
+        """Insert many tasks in a single transaction"""
+        try:
+            self._journal_capture(task['id'] for task in tasks)
+            # First row wins for duplicate ids, as with one add_task per row
+            self.cursor.executemany(f"""
+                INSERT OR IGNORE INTO tasks (id, quadrant, description, done, completed_at, updated_at)
+                VALUES (?, ?, ?, ?, CASE WHEN ? THEN CURRENT_TIMESTAMP END, {NOW_MS})
+            """, [(task['id'], task['quadrant'], task['description'], task['done'], task['done'])
+                  for task in tasks])
+            self._commit()
+            return True
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in insert_tasks: {e}")
+            return False
+
+    def upsert_tasks(self, tasks: List[Dict[str, Any]]) -> bool:
+        """Insert new tasks and update existing ones in a single transaction.
+
+        Archived rows that are still done are updated in place in the archive;
+        reopened ones move back to the hot table.
+        """
+        try:
+            archived = set()
+            ids = [task['id'] for task in tasks]
+            self._journal_capture(ids)
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                archived.update(row[0] for row in self.cursor.execute(
+                    f"SELECT id FROM tasks_archive WHERE id IN ({placeholders})", chunk
+                ))
+            reopened = [(task['id'],) for task in tasks if task['id'] in archived and not task['done']]
+            self.cursor.executemany("DELETE FROM tasks_archive WHERE id = ?", reopened)
+            archived.difference_update(task_id for task_id, in reopened)
+
+            rows = [(task['id'], task['quadrant'], task['description'], task['done'], task['done'])
+                    for task in tasks if task['id'] not in archived]
+            self.cursor.executemany(f"""
+                INSERT INTO tasks (id, quadrant, description, done, completed_at, updated_at)
+                VALUES (?, ?, ?, ?, CASE WHEN ? THEN CURRENT_TIMESTAMP END, {NOW_MS})
+                ON CONFLICT(id) DO UPDATE SET
+                    quadrant = excluded.quadrant,
+                    description = excluded.description,
+                    done = excluded.done,
+                    completed_at = CASE
+                        WHEN excluded.done = tasks.done THEN tasks.completed_at
+                        ELSE excluded.completed_at
+                    END
+            """, rows)
+            self.cursor.executemany("""
+                UPDATE tasks_archive
+                SET quadrant = ?, description = ?, done = ?,
+                    completed_at = CASE WHEN ? THEN completed_at END
+                WHERE id = ?
+            """, [(task['quadrant'], task['description'], task['done'], task['done'], task['id'])
+                  for task in tasks if task['id'] in archived])
+            self._commit()
+            return True
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in upsert_tasks: {e}")
             return False
 
     def get_all_tasks(self) -> List[Dict[str, Any]]:
-        """Get all tasks from the database"""
+        """Get all tasks from a read snapshot"""
         try:
-            self.cursor.execute("SELECT id, quadrant, description, done FROM tasks")
+            with self.snapshot() as conn:
+                rows = conn.execute(
+                    "SELECT id, quadrant, description, done FROM all_tasks"
+                ).fetchall()
             tasks = []
-            for row in self.cursor.fetchall():
+            for row in rows:
                 tasks.append({
                     'id': row[0],
                     'quadrant': row[1],
@@ -163,15 +862,752 @@ class DatabaseManager:
         except sqlite3.Error:
             return []
 
+    def search_tasks(self, text: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Find tasks whose description contains text, reading from a snapshot"""
+        condition, params = _text_filter(text)
+        try:
+            with self.snapshot() as conn:
+                rows = conn.execute(
+                    f"SELECT id, quadrant, description, done FROM all_tasks WHERE 1{condition} LIMIT ?",
+                    params + (limit,)
+                ).fetchall()
+            return [
+                {'id': row[0], 'quadrant': row[1], 'description': row[2], 'done': bool(row[3])}
+                for row in rows
+            ]
+        except sqlite3.Error as e:
+            print(f"Database error in search_tasks: {e}")
+            return []
+
+    def list_tasks(self, quadrant: Optional[str] = None, done: Optional[bool] = None, text: str = '',
+                   limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """One page of tasks from both tiers, filtered in SQL, from a read snapshot"""
+        condition, params = _text_filter(text)
+        if quadrant is not None:
+            condition += " AND quadrant = ?"
+            params += (quadrant,)
+        if done is not None:
+            condition += " AND done = ?"
+            params += (int(done),)
+        try:
+            with self.snapshot() as conn:
+                rows = conn.execute(
+                    "SELECT id, quadrant, description, done, created_at, completed_at, updated_at, due_at, remind_at "
+                    f"FROM all_tasks WHERE 1{condition} ORDER BY created_at, id LIMIT ? OFFSET ?",
+                    params + (limit, offset)
+                ).fetchall()
+            return [_task_row(row) for row in rows]
+        except sqlite3.Error as e:
+            print(f"Database error in list_tasks: {e}")
+            return []
+
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """One task from either tier with its tags, or None"""
+        with self.snapshot() as conn:
+            row = conn.execute(
+                "SELECT id, quadrant, description, done, created_at, completed_at, updated_at, due_at, remind_at "
+                "FROM all_tasks WHERE id = ?", (task_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            task = _task_row(row)
+            task['tags'] = [name for name, in conn.execute("""
+                SELECT tags.name FROM task_tags JOIN tags ON tags.id = task_tags.tag_id
+                WHERE task_tags.task_id = ? ORDER BY tags.name
+            """, (task_id,))]
+        return task
+
     def clear_all_tasks(self) -> bool:
         """Clear all tasks from the database"""
         try:
+            if self.journal_scope is not None:
+                self._journal_capture(
+                    [row[0] for row in self.cursor.execute("SELECT id FROM all_tasks").fetchall()],
+                    [row[0] for row in self.cursor.execute("SELECT id FROM task_series").fetchall()]
+                )
             self.cursor.execute("DELETE FROM tasks")
-            self.conn.commit()
+            self.cursor.execute("DELETE FROM tasks_archive")
+            self.cursor.execute("DELETE FROM task_tags")
+            self.cursor.execute("DELETE FROM task_notes")
+            self.cursor.execute("DELETE FROM task_series")
+            self._commit()
             return True
-        except sqlite3.Error:
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in clear_all_tasks: {e}")
             return False
 
+    def _tag_ids(self, names: List[str]) -> List[int]:
+        self.cursor.executemany(
+            "INSERT OR IGNORE INTO tags (name) VALUES (?)",
+            [(name,) for name in names]
+        )
+        return [
+            self.cursor.execute("SELECT id FROM tags WHERE name=?", (name,)).fetchone()[0]
+            for name in names
+        ]
+
+    def set_tags_for_tasks(self, tags_by_task: Dict[str, List[str]]) -> bool:
+        """Replace the tags of several tasks in one transaction"""
+        try:
+            self._journal_capture(tags_by_task)
+            names = sorted({name for tags in tags_by_task.values() for name in tags})
+            tag_ids = dict(zip(names, self._tag_ids(names)))
+            self.cursor.executemany(
+                "DELETE FROM task_tags WHERE task_id=?",
+                [(task_id,) for task_id in tags_by_task]
+            )
+            self.cursor.executemany(
+                "INSERT OR IGNORE INTO task_tags (task_id, tag_id) VALUES (?, ?)",
+                [(task_id, tag_ids[name])
+                 for task_id, tags in tags_by_task.items() for name in tags]
+            )
+            self._commit()
+            return True
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in set_tags_for_tasks: {e}")
+            return False
+
+    def retag_tasks(self, task_ids: List[str], add: List[str] = (), remove: List[str] = ()) -> bool:
+        """Add and/or remove tags on many tasks in one transaction, keeping their other tags"""
+        try:
+            task_ids = list(task_ids)
+            self._journal_capture(task_ids)
+            added = self._tag_ids(list(add))
+            self.cursor.executemany(
+                "INSERT OR IGNORE INTO task_tags (task_id, tag_id) VALUES (?, ?)",
+                [(task_id, tag_id) for task_id in task_ids for tag_id in added]
+            )
+            if remove:
+                placeholders = ','.join('?' * len(remove))
+                removed = [row[0] for row in self.cursor.execute(
+                    f"SELECT id FROM tags WHERE name IN ({placeholders})", list(remove)
+                ).fetchall()]
+                self.cursor.executemany(
+                    "DELETE FROM task_tags WHERE task_id = ? AND tag_id = ?",
+                    [(task_id, tag_id) for task_id in task_ids for tag_id in removed]
+                )
+            self._commit()
+            return True
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in retag_tasks: {e}")
+            return False
+
+    def set_task_tags(self, task_id: str, tags: List[str]) -> bool:
+        return self.set_tags_for_tasks({task_id: tags})
+
+    def get_task_tags(self, task_id: str) -> List[str]:
+        rows = self.cursor.execute("""
+            SELECT tags.name FROM task_tags
+            JOIN tags ON tags.id = task_tags.tag_id
+            WHERE task_tags.task_id = ?
+            ORDER BY tags.name
+        """, (task_id,)).fetchall()
+        return [row[0] for row in rows]
+
+    def get_tags_by_task(self) -> Dict[str, List[str]]:
+        """Map of task id to tag names for every tagged task"""
+        tags_by_task = {}
+        try:
+            with self.snapshot() as conn:
+                rows = conn.execute("""
+                    SELECT task_tags.task_id, tags.name FROM task_tags
+                    JOIN tags ON tags.id = task_tags.tag_id
+                    ORDER BY tags.name
+                """).fetchall()
+            for task_id, name in rows:
+                tags_by_task.setdefault(task_id, []).append(name)
+        except sqlite3.Error as e:
+            print(f"Database error in get_tags_by_task: {e}")
+        return tags_by_task
+
+    def get_task_note(self, task_id: str) -> str:
+        """The note of one task, '' if it has none; only read when the note is opened"""
+        row = self.cursor.execute(
+            "SELECT body, compressed FROM task_notes WHERE task_id = ?", (task_id,)
+        ).fetchone()
+        return _unpack_note(*row) if row else ''
+
+    def set_task_note(self, task_id: str, text: str) -> bool:
+        return self.set_task_notes({task_id: text})
+
+    def set_task_notes(self, notes_by_task: Dict[str, str]) -> bool:
+        """Replace the notes of many tasks in one transaction; empty text removes a note"""
+        try:
+            self._journal_capture(notes_by_task)
+            rows = []
+            for task_id, text in notes_by_task.items():
+                if text:
+                    body, compressed = _pack_note(text)
+                    rows.append((task_id, body, compressed, len(body)))
+            self.cursor.executemany(
+                "DELETE FROM task_notes WHERE task_id = ?",
+                [(task_id,) for task_id, text in notes_by_task.items() if not text]
+            )
+            # Notes only attach to tasks that exist, in either tier
+            self.cursor.executemany("""
+                INSERT INTO task_notes (task_id, body, compressed, size)
+                SELECT ?1, ?2, ?3, ?4 WHERE EXISTS (SELECT 1 FROM all_tasks WHERE id = ?1)
+                ON CONFLICT(task_id) DO UPDATE SET
+                    body = excluded.body, compressed = excluded.compressed, size = excluded.size
+            """, rows)
+            self._commit()
+            return True
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in set_task_notes: {e}")
+            return False
+
+    def has_notes(self) -> bool:
+        return self.cursor.execute("SELECT 1 FROM task_notes LIMIT 1").fetchone() is not None
+
+    def iter_tasks(self, include_notes: bool = False, chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Every task with its tags (and notes), streamed from a read snapshot for exports"""
+        notes = ("n.body, n.compressed" if include_notes else "NULL, 0")
+        join = "LEFT JOIN task_notes n ON n.task_id = a.id" if include_notes else ""
+        with self.snapshot() as conn:
+            cursor = conn.execute(f"""
+                SELECT a.id, a.quadrant, a.description, a.done, {notes},
+                       (SELECT group_concat(name, ';') FROM (
+                            SELECT tags.name FROM task_tags JOIN tags ON tags.id = task_tags.tag_id
+                            WHERE task_tags.task_id = a.id ORDER BY tags.name))
+                FROM all_tasks a {join}
+            """)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    task = {
+                        'id': row[0],
+                        'quadrant': row[1],
+                        'description': row[2],
+                        'done': bool(row[3]),
+                        'tags': row[6].split(';') if row[6] else []
+                    }
+                    if include_notes:
+                        task['notes'] = _unpack_note(row[4], row[5]) if row[4] is not None else ''
+                    yield task
+
+    def get_changes_since(self, since: Optional[str]) -> Tuple[str, List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Tasks changed and tombstones written since a watermark, from one snapshot.
+
+        Returns (new_watermark, tasks, deleted). With since=None every task is
+        returned and no tombstones.
+        """
+        with self.snapshot() as conn:
+            watermark = conn.execute(f"SELECT {NOW_MS}").fetchone()[0]
+            query = """
+                SELECT t.id, t.quadrant, t.description, t.done, t.updated_at,
+                       (SELECT group_concat(name, ';') FROM (
+                            SELECT tags.name FROM task_tags
+                            JOIN tags ON tags.id = task_tags.tag_id
+                            WHERE task_tags.task_id = t.id ORDER BY tags.name))
+                FROM all_tasks t
+            """
+            if since is None:
+                rows = conn.execute(query).fetchall()
+                deleted_rows = []
+            else:
+                lower_bound = (since, f"-{DELTA_EXPORT_OVERLAP_SECONDS} seconds")
+                rows = conn.execute(
+                    query + " WHERE t.updated_at >= strftime('%Y-%m-%d %H:%M:%f', ?, ?)",
+                    lower_bound
+                ).fetchall()
+                deleted_rows = conn.execute("""
+                    SELECT id, deleted_at FROM task_tombstones
+                    WHERE deleted_at >= strftime('%Y-%m-%d %H:%M:%f', ?, ?)
+                """, lower_bound).fetchall()
+
+        tasks = [{
+            'id': row[0],
+            'quadrant': row[1],
+            'description': row[2],
+            'done': bool(row[3]),
+            'updated_at': row[4],
+            'tags': row[5].split(';') if row[5] else []
+        } for row in rows]
+        deleted = [{'id': row[0], 'deleted_at': row[1]} for row in deleted_rows]
+        return watermark, tasks, deleted
+
+    def current_watermark(self) -> str:
+        """A get_changes_since watermark for "now", without reading any rows"""
+        return self.cursor.execute(f"SELECT {NOW_MS}").fetchone()[0]
+
+    def data_version(self) -> int:
+        """Changes whenever another connection or process commits to the database"""
+        return self.cursor.execute("PRAGMA data_version").fetchone()[0]
+
+    def get_export_watermark(self, destination: str) -> Optional[str]:
+        row = self.cursor.execute(
+            "SELECT exported_at FROM export_watermarks WHERE destination=?", (destination,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_export_watermark(self, destination: str, exported_at: str) -> bool:
+        """Record a delta export and drop tombstones every destination has seen"""
+        try:
+            self.cursor.execute(
+                "INSERT OR REPLACE INTO export_watermarks (destination, exported_at) VALUES (?, ?)",
+                (destination, exported_at)
+            )
+            self.cursor.execute(f"""
+                DELETE FROM task_tombstones
+                WHERE deleted_at < strftime('%Y-%m-%d %H:%M:%f', 'now', '-{TOMBSTONE_RETENTION_DAYS} days')
+                   OR deleted_at < (
+                        SELECT strftime('%Y-%m-%d %H:%M:%f', MIN(exported_at), '-{DELTA_EXPORT_OVERLAP_SECONDS} seconds')
+                        FROM export_watermarks)
+            """)
+            self._commit()
+            return True
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in set_export_watermark: {e}")
+            return False
+
+    def delete_tasks(self, task_ids: List[str]) -> bool:
+        """Delete many tasks, from either tier, in a single transaction"""
+        try:
+            self._journal_capture(task_ids)
+            rows = [(task_id,) for task_id in task_ids]
+            # As in delete_task, deleting the open instance of a recurring task ends the series
+            self.cursor.executemany(
+                "DELETE FROM task_series WHERE id = (SELECT series_id FROM tasks WHERE id=? AND done=0)", rows
+            )
+            self.cursor.executemany("DELETE FROM tasks WHERE id=?", rows)
+            self.cursor.executemany("DELETE FROM tasks_archive WHERE id=?", rows)
+            self.cursor.executemany("DELETE FROM task_tags WHERE task_id=?", rows)
+            self.cursor.executemany("DELETE FROM task_notes WHERE task_id=?", rows)
+            self._commit()
+            return True
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in delete_tasks: {e}")
+            return False
+
+    def archive_completed(self, older_than_days: int, batch_size: int = 500) -> List[Tuple[str, str]]:
+        """Move one batch of tasks completed more than older_than_days ago to the archive.
+
+        Returns the (id, quadrant) pairs that were moved; fewer than batch_size
+        means nothing is left to archive.
+        """
+        try:
+            self.cursor.execute("""
+                SELECT id, quadrant FROM tasks
+                WHERE done = 1 AND completed_at < datetime('now', ?)
+                LIMIT ?
+            """, (f"-{int(older_than_days)} days", batch_size))
+            moved = self.cursor.fetchall()
+            if not moved:
+                return []
+
+            ids = [(task_id,) for task_id, _ in moved]
+            self.cursor.executemany("""
+                INSERT OR REPLACE INTO tasks_archive
+                    (id, quadrant, description, done, created_at, completed_at, deleted, updated_at,
+                     due_at, remind_at, series_id)
+                SELECT id, quadrant, description, done, created_at, completed_at, deleted, updated_at,
+                       due_at, remind_at, series_id
+                FROM tasks WHERE id = ?
+            """, ids)
+            self.cursor.executemany("DELETE FROM tasks WHERE id = ?", ids)
+            self._commit()
+            return moved
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in archive_completed: {e}")
+            return []
+
+    def get_task_tier(self, task_id: str) -> Optional[str]:
+        """'tasks' or 'tasks_archive' for the table holding the task, None if it does not exist"""
+        row = self.cursor.execute(
+            "SELECT 'tasks' FROM tasks WHERE id = ? UNION ALL SELECT 'tasks_archive' FROM tasks_archive WHERE id = ?",
+            (task_id, task_id)
+        ).fetchone()
+        return row[0] if row else None
+
+    def restore_archived_tasks(self, task_ids: List[str]) -> bool:
+        """Move archived tasks back to the hot table, where every write method applies"""
+        try:
+            self._journal_capture(task_ids)
+            ids = [(task_id,) for task_id in task_ids]
+            self.cursor.executemany("""
+                INSERT OR IGNORE INTO tasks
+                    (id, quadrant, description, done, created_at, completed_at, deleted, updated_at,
+                     due_at, remind_at, series_id)
+                SELECT id, quadrant, description, done, created_at, completed_at, deleted, updated_at,
+                       due_at, remind_at, series_id
+                FROM tasks_archive WHERE id = ?
+            """, ids)
+            self.cursor.executemany("DELETE FROM tasks_archive WHERE id = ?", ids)
+            self._commit()
+            return True
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in restore_archived_tasks: {e}")
+            return False
+
+    def set_task_schedule(self, task_id: str, due_at: Optional[str], remind_at: Optional[str]) -> bool:
+        """Set or clear (None) the due date and reminder time, as UTC 'YYYY-MM-DD HH:MM:SS'"""
+        try:
+            due_at, remind_at = normalize_utc(due_at), normalize_utc(remind_at)
+        except ValueError as e:
+            print(f"Invalid schedule in set_task_schedule: {e}")
+            return False
+        try:
+            self._journal_capture([task_id])
+            self.cursor.execute(
+                "UPDATE tasks SET due_at=?, remind_at=? WHERE id=?",
+                (due_at, remind_at, task_id)
+            )
+            self._commit()
+            return True
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in set_task_schedule: {e}")
+            return False
+
+    def get_task_schedule(self, task_id: str) -> Tuple[Optional[str], Optional[str]]:
+        row = self.cursor.execute(
+            "SELECT due_at, remind_at FROM tasks WHERE id=?", (task_id,)
+        ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def get_upcoming_reminders(self, limit: int) -> List[Tuple[str, str]]:
+        """The first limit pending (remind_at, id) pairs in time order, read from the partial index"""
+        # Without statistics the planner prefers the done index and sorts every open task
+        return self.cursor.execute("""
+            SELECT remind_at, id FROM tasks INDEXED BY idx_tasks_remind
+            WHERE remind_at IS NOT NULL AND done = 0
+            ORDER BY remind_at, id LIMIT ?
+        """, (limit,)).fetchall()
+
+    def get_reminders(self, task_ids) -> Dict[str, str]:
+        """Pending reminder time of each given open task; tasks without one are omitted"""
+        task_ids = list(task_ids)
+        reminders = {}
+        for start in range(0, len(task_ids), 500):
+            chunk = task_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            reminders.update(self.cursor.execute(
+                f"SELECT id, remind_at FROM tasks WHERE id IN ({placeholders}) "
+                "AND remind_at IS NOT NULL AND done = 0",
+                chunk
+            ).fetchall())
+        return reminders
+
+    def clear_reminders(self, task_ids: List[str]) -> bool:
+        """Forget reminders that have fired; the due dates stay"""
+        try:
+            self.cursor.executemany(
+                "UPDATE tasks SET remind_at = NULL WHERE id = ?", [(task_id,) for task_id in task_ids]
+            )
+            self._commit()
+            return True
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in clear_reminders: {e}")
+            return False
+
+    def set_task_recurrence(self, task_id: str, frequency: Optional[str], interval: int = 1) -> bool:
+        """Make a task with a due date repeat, change its rule, or stop it (frequency=None)"""
+        try:
+            row = self.cursor.execute(
+                "SELECT quadrant, description, due_at, remind_at, series_id FROM tasks WHERE id=?",
+                (task_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            quadrant, description, due_at, remind_at, series_id = row
+            self._journal_capture([task_id])
+            if frequency is None:
+                if series_id:
+                    self._journal_capture([instance for instance, in self.cursor.execute(
+                        "SELECT id FROM tasks WHERE series_id=?", (series_id,)
+                    ).fetchall()])
+                    self.cursor.execute("DELETE FROM task_series WHERE id=?", (series_id,))
+                    self.cursor.execute("UPDATE tasks SET series_id=NULL WHERE series_id=?", (series_id,))
+            elif series_id:
+                self.cursor.execute("""
+                    UPDATE task_series
+                    SET frequency = ?, interval = ?, anchor_at = COALESCE(?, anchor_at),
+                        remind_offset_minutes = CAST(ROUND((julianday(?) - julianday(?)) * 1440) AS INTEGER)
+                    WHERE id = ?
+                """, (frequency, interval, due_at, due_at, remind_at, series_id))
+            else:
+                if due_at is None:
+                    return False
+                series_id = str(uuid.uuid4())
+                self._journal_capture([], [series_id])
+                self.cursor.execute("""
+                    INSERT INTO task_series (id, quadrant, description, frequency, interval, anchor_at,
+                                             remind_offset_minutes, next_due_at)
+                    VALUES (?, ?, ?, ?, ?, ?,
+                            CAST(ROUND((julianday(?) - julianday(?)) * 1440) AS INTEGER), ?)
+                """, (series_id, quadrant, description, frequency, interval, due_at,
+                      due_at, remind_at, due_at))
+                self.cursor.execute("UPDATE tasks SET series_id=? WHERE id=?", (series_id, task_id))
+            self._commit()
+            return True
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in set_task_recurrence: {e}")
+            return False
+
+    def get_task_recurrence(self, task_id: str) -> Tuple[Optional[str], int]:
+        """(frequency, interval) of the series a task belongs to, or (None, 1)"""
+        row = self.cursor.execute("""
+            SELECT s.frequency, s.interval FROM tasks t JOIN task_series s ON s.id = t.series_id
+            WHERE t.id = ?
+        """, (task_id,)).fetchone()
+        return (row[0], row[1]) if row else (None, 1)
+
+    def get_series_task_ids(self, task_id: str) -> List[str]:
+        """Open instances of the series task_id belongs to"""
+        rows = self.cursor.execute("""
+            SELECT id FROM tasks
+            WHERE series_id = (SELECT series_id FROM tasks WHERE id = ?) AND done = 0
+        """, (task_id,)).fetchall()
+        return [row[0] for row in rows]
+
+    def get_tasks_due_between(self, quadrant: str, after: Optional[str], until: str) -> List[str]:
+        """Open tasks of a quadrant due in (after, until]; after=None means no lower bound"""
+        condition, params = (" AND due_at > ?", (after,)) if after else ("", ())
+        rows = self.cursor.execute(
+            "SELECT id FROM tasks INDEXED BY idx_tasks_quadrant_due "
+            f"WHERE quadrant = ? AND due_at IS NOT NULL AND done = 0{condition} AND due_at <= ?",
+            (quadrant,) + params + (until,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def move_tasks(self, task_ids: List[str], new_quadrant: str) -> bool:
+        """Move many tasks to one quadrant in a single transaction"""
+        try:
+            self._journal_capture(task_ids)
+            self.cursor.executemany(
+                "UPDATE tasks SET quadrant=? WHERE id=?",
+                [(new_quadrant, task_id) for task_id in task_ids]
+            )
+            self._commit()
+            return True
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in move_tasks: {e}")
+            return False
+
+    def get_state(self, key: str) -> Optional[str]:
+        row = self.cursor.execute("SELECT value FROM app_state WHERE key=?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_state(self, key: str, value: Optional[str]) -> bool:
+        try:
+            self.cursor.execute(
+                "INSERT OR REPLACE INTO app_state (key, value) VALUES (?, ?)", (key, value)
+            )
+            self._commit()
+            return True
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in set_state: {e}")
+            return False
+
+    def _task_states(self, task_ids) -> Dict[str, Optional[list]]:
+        """Journal image of each task, None for ids that do not exist:
+        [table, rowid, quadrant, description, done, created_at, completed_at, due_at, remind_at,
+        series_id, tags, note]"""
+        task_ids = list(task_ids)
+        states = dict.fromkeys(task_ids)
+        for start in range(0, len(task_ids), 500):
+            chunk = task_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            # The hot row wins should an id briefly exist in both tiers
+            for table in ('tasks_archive', 'tasks'):
+                rowid = 'rowid' if table == 'tasks' else 'NULL'
+                for row in self.conn.execute(f"""
+                    SELECT id, {rowid}, quadrant, description, done, created_at, completed_at,
+                           due_at, remind_at, series_id
+                    FROM {table} WHERE id IN ({placeholders})
+                """, chunk):
+                    states[row[0]] = [table] + list(row[1:]) + [[], None]
+            for task_id, name in self.conn.execute(f"""
+                SELECT task_tags.task_id, tags.name FROM task_tags JOIN tags ON tags.id = task_tags.tag_id
+                WHERE task_tags.task_id IN ({placeholders}) ORDER BY tags.name
+            """, chunk):
+                if states.get(task_id) is not None:
+                    states[task_id][10].append(name)
+            for task_id, body, compressed in self.conn.execute(f"""
+                SELECT task_id, body, compressed FROM task_notes WHERE task_id IN ({placeholders})
+            """, chunk):
+                if states.get(task_id) is not None:
+                    states[task_id][11] = _unpack_note(body, compressed)
+        return states
+
+    def _series_states(self, series_ids) -> Dict[str, Optional[list]]:
+        series_ids = list(series_ids)
+        states = dict.fromkeys(series_ids)
+        for start in range(0, len(series_ids), 500):
+            chunk = series_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for row in self.conn.execute(f"""
+                SELECT id, quadrant, description, frequency, interval, anchor_at,
+                       remind_offset_minutes, next_due_at
+                FROM task_series WHERE id IN ({placeholders})
+            """, chunk):
+                states[row[0]] = list(row[1:])
+        return states
+
+    def _journal_capture(self, task_ids, series_ids=()):
+        """Remember the current state of rows about to change, if a journal() scope is open"""
+        if self.journal_scope is None:
+            return
+        tasks, series = self.journal_scope
+        new_tasks = [task_id for task_id in dict.fromkeys(task_ids) if task_id not in tasks]
+        tasks.update(self._task_states(new_tasks))
+        # The series of a touched instance may change with it (renames, next due date)
+        series_ids = set(series_ids)
+        series_ids.update(tasks[task_id][9] for task_id in new_tasks
+                          if tasks[task_id] is not None and tasks[task_id][9])
+        series.update(self._series_states(series_id for series_id in series_ids if series_id not in series))
+
+    def _record_journal(self, label: str, tasks: Dict[str, Optional[list]], series: Dict[str, Optional[list]]):
+        """Store the captured rows that changed, dropping the redo branch and the oldest entries"""
+        after_tasks = self._task_states(tasks)
+        after_series = self._series_states(series)
+        changes = {
+            'tasks': [[task_id, state, after_tasks[task_id]]
+                      for task_id, state in tasks.items() if state != after_tasks[task_id]],
+            'series': [[series_id, state, after_series[series_id]]
+                       for series_id, state in series.items() if state != after_series[series_id]],
+        }
+        if not changes['tasks'] and not changes['series']:
+            return
+        payload = zlib.compress(json.dumps(changes, separators=(',', ':')).encode('utf-8'))
+        try:
+            self.cursor.execute("DELETE FROM op_journal WHERE undone = 1")
+            self.cursor.execute(
+                "INSERT INTO op_journal (label, size, changes) VALUES (?, ?, ?)",
+                (label, len(payload), payload)
+            )
+            self.cursor.execute("""
+                DELETE FROM op_journal WHERE id IN (
+                    SELECT id FROM (
+                        SELECT id, ROW_NUMBER() OVER (ORDER BY id DESC) AS position,
+                               SUM(size) OVER (ORDER BY id DESC) AS total
+                        FROM op_journal)
+                    WHERE position > 1 AND (position > ? OR total > ?))
+            """, (JOURNAL_MAX_ENTRIES, JOURNAL_MAX_BYTES))
+            self._commit()
+        except sqlite3.Error as e:
+            self._rollback()
+            print(f"Database error in _record_journal: {e}")
+
+    def _restore_states(self, tasks: List[Tuple[str, Optional[list]]],
+                        series: List[Tuple[str, Optional[list]]]):
+        """Put rows back into the given journal states with set-wide statements"""
+        hot = [(task_id, state) for task_id, state in tasks if state and state[0] == 'tasks']
+        archived = [(task_id, state) for task_id, state in tasks if state and state[0] == 'tasks_archive']
+        # Rows reappear at their old position unless a newer row took it
+        self.cursor.executemany(f"""
+            INSERT INTO tasks (rowid, id, quadrant, description, done, created_at, completed_at,
+                               due_at, remind_at, series_id, updated_at)
+            VALUES (CASE WHEN EXISTS (SELECT 1 FROM tasks WHERE rowid = ?1) THEN NULL ELSE ?1 END,
+                    ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10, {NOW_MS})
+            ON CONFLICT(id) DO UPDATE SET
+                quadrant = excluded.quadrant,
+                description = excluded.description,
+                done = excluded.done,
+                created_at = excluded.created_at,
+                completed_at = excluded.completed_at,
+                due_at = excluded.due_at,
+                remind_at = excluded.remind_at,
+                series_id = excluded.series_id
+        """, [(state[1], task_id) + tuple(state[2:10]) for task_id, state in hot])
+        self.cursor.executemany(f"""
+            INSERT OR REPLACE INTO tasks_archive
+                (id, quadrant, description, done, created_at, completed_at, due_at, remind_at,
+                 series_id, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, {NOW_MS})
+        """, [(task_id,) + tuple(state[2:10]) for task_id, state in archived])
+        # Deleted after the inserts so tier moves leave no tombstone
+        self.cursor.executemany("DELETE FROM tasks_archive WHERE id = ?", [(task_id,) for task_id, _ in hot])
+        self.cursor.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id, _ in archived])
+        gone = [(task_id,) for task_id, state in tasks if state is None]
+        self.cursor.executemany("DELETE FROM tasks WHERE id = ?", gone)
+        self.cursor.executemany("DELETE FROM tasks_archive WHERE id = ?", gone)
+
+        self.cursor.executemany("DELETE FROM task_tags WHERE task_id = ?", [(task_id,) for task_id, _ in tasks])
+        names = sorted({name for _, state in tasks if state for name in state[10]})
+        tag_ids = dict(zip(names, self._tag_ids(names)))
+        self.cursor.executemany(
+            "INSERT OR IGNORE INTO task_tags (task_id, tag_id) VALUES (?, ?)",
+            [(task_id, tag_ids[name]) for task_id, state in tasks if state for name in state[10]]
+        )
+
+        # Entries recorded before notes existed carry no note and leave notes alone
+        noted = [(task_id, state[11] if state else None) for task_id, state in tasks
+                 if state is None or len(state) > 11]
+        self.cursor.executemany("DELETE FROM task_notes WHERE task_id = ?",
+                                [(task_id,) for task_id, note in noted if not note])
+        rows = []
+        for task_id, note in noted:
+            if note:
+                body, compressed = _pack_note(note)
+                rows.append((task_id, body, compressed, len(body)))
+        self.cursor.executemany(
+            "INSERT OR REPLACE INTO task_notes (task_id, body, compressed, size) VALUES (?, ?, ?, ?)", rows
+        )
+
+        self.cursor.executemany(
+            "DELETE FROM task_series WHERE id = ?", [(series_id,) for series_id, state in series if state is None]
+        )
+        self.cursor.executemany("""
+            INSERT OR REPLACE INTO task_series (id, quadrant, description, frequency, interval, anchor_at,
+                                                remind_offset_minutes, next_due_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(series_id,) + tuple(state) for series_id, state in series if state is not None])
+
+    def _replay_journal(self, undo: bool) -> Optional[Tuple[str, List[str]]]:
+        try:
+            row = self.cursor.execute(
+                f"SELECT id, label, changes FROM op_journal WHERE undone = ? "
+                f"ORDER BY id {'DESC' if undo else 'ASC'} LIMIT 1",
+                (0 if undo else 1,)
+            ).fetchone()
+            if row is None:
+                return None
+            entry_id, label, payload = row
+            changes = json.loads(zlib.decompress(payload))
+            state = 1 if undo else 2
+            self._restore_states([(change[0], change[state]) for change in changes['tasks']],
+                                 [(change[0], change[state]) for change in changes['series']])
+            self.cursor.execute("UPDATE op_journal SET undone = ? WHERE id = ?", (undo, entry_id))
+            self._commit()
+            return label, [change[0] for change in changes['tasks']]
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            self._rollback()
+            print(f"Database error in {'undo' if undo else 'redo'}: {e}")
+            return None
+
+    def undo(self) -> Optional[Tuple[str, List[str]]]:
+        """Revert the latest operation; returns (label, changed task ids), None if there is nothing to undo"""
+        return self._replay_journal(undo=True)
+
+    def redo(self) -> Optional[Tuple[str, List[str]]]:
+        """Re-apply the most recently undone operation"""
+        return self._replay_journal(undo=False)
+
+    def get_journal_labels(self) -> Tuple[Optional[str], Optional[str]]:
+        """Labels of the operations undo() and redo() would replay next"""
+        undo = self.cursor.execute(
+            "SELECT label FROM op_journal WHERE undone = 0 ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        redo = self.cursor.execute(
+            "SELECT label FROM op_journal WHERE undone = 1 ORDER BY id LIMIT 1"
+        ).fetchone()
+        return (undo[0] if undo else None), (redo[0] if redo else None)
+
     def get_statistics(self) -> Dict[str, Any]:
         """Get all statistics"""
         stats = {
@@ -184,60 +1620,67 @@ class DatabaseManager:
         }
 
         try:
-            # Get quadrant statistics
-            self.cursor.execute("""
-                SELECT 
-                    quadrant,
-                    COUNT(*) as total_created,
-                    SUM(CASE WHEN done = 1 THEN 1 ELSE 0 END) as completed,
-                    SUM(CASE WHEN done = 0 THEN 1 ELSE 0 END) as active,
-                    AVG(CASE 
-                        WHEN done = 1 
-                        THEN ROUND((julianday(completed_at) - julianday(created_at)) * 24 * 60, 2)
-                        ELSE NULL 
-                    END) as avg_completion_minutes
-                FROM tasks
-                WHERE deleted = 0 OR deleted IS NULL
-                GROUP BY quadrant
-            """)
-            
-            for row in self.cursor.fetchall():
-                quadrant = row[0]
-                total = row[1]
-                completed = row[2] or 0
-                active = row[3] or 0
-                avg_time = row[4]
-                
-                stats['per_quadrant'][quadrant] = {
-                    'total_created': total,
-                    'completed': completed,
-                    'active_tasks': active,
-                    'avg_completion_time': avg_time,
-                    'completion_rate': (completed / total * 100) if total > 0 else 0
-                }
-
-            # Get overview statistics
-            self.cursor.execute("""
-                SELECT 
-                    COUNT(*) as total_created,
-                    SUM(CASE WHEN done = 1 THEN 1 ELSE 0 END) as total_completed,
-                    SUM(CASE WHEN done = 0 THEN 1 ELSE 0 END) as current_active
-                FROM tasks
-                WHERE deleted = 0 OR deleted IS NULL
-            """)
-            
-            row = self.cursor.fetchone()
-            if row:
-                stats['overview']['total_created'] = row[0] or 0
-                stats['overview']['total_completed'] = row[1] or 0
-                stats['overview']['current_active'] = row[2] or 0
-
+            with self.snapshot() as conn:
+                self._collect_statistics(conn.cursor(), stats)
             return stats
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return stats
 
+    def _collect_statistics(self, cursor: sqlite3.Cursor, stats: Dict[str, Any]):
+        """Fill stats from cursor; both queries run inside the same snapshot"""
+        # Get quadrant statistics
+        cursor.execute("""
+            SELECT 
+                quadrant,
+                COUNT(*) as total_created,
+                SUM(CASE WHEN done = 1 THEN 1 ELSE 0 END) as completed,
+                SUM(CASE WHEN done = 0 THEN 1 ELSE 0 END) as active,
+                AVG(CASE 
+                    WHEN done = 1 
+                    THEN ROUND((julianday(completed_at) - julianday(created_at)) * 24 * 60, 2)
+                    ELSE NULL 
+                END) as avg_completion_minutes
+            FROM all_tasks
+            WHERE deleted = 0 OR deleted IS NULL
+            GROUP BY quadrant
+        """)
+        
+        for row in cursor.fetchall():
+            quadrant = row[0]
+            total = row[1]
+            completed = row[2] or 0
+            active = row[3] or 0
+            avg_time = row[4]
+            
+            stats['per_quadrant'][quadrant] = {
+                'total_created': total,
+                'completed': completed,
+                'active_tasks': active,
+                'avg_completion_time': avg_time,
+                'completion_rate': (completed / total * 100) if total > 0 else 0
+            }
+
+        # Get overview statistics
+        cursor.execute("""
+            SELECT 
+                COUNT(*) as total_created,
+                SUM(CASE WHEN done = 1 THEN 1 ELSE 0 END) as total_completed,
+                SUM(CASE WHEN done = 0 THEN 1 ELSE 0 END) as current_active
+            FROM all_tasks
+            WHERE deleted = 0 OR deleted IS NULL
+        """)
+        
+        row = cursor.fetchone()
+        if row:
+            stats['overview']['total_created'] = row[0] or 0
+            stats['overview']['total_completed'] = row[1] or 0
+            stats['overview']['current_active'] = row[2] or 0
 
+    def close(self):
+        if self.read_pool:
+            self.read_pool.close()
+        self.conn.close()
 
     def __del__(self):
         if self.conn:
@@ -0,0 +1,92 @@
+"""Task operations as plain dicts, shared by the command line and the local API.
+
+An operation looks like {"op": "move", "id": "...", "quadrant": 2}. Quadrants
+may be given as 1-4 or by name. Invalid operations raise ValueError or KeyError
+before anything is written.
+"""
+import uuid
+from typing import Any, Dict, Optional
+
+from src.utils.constants import QUADRANT_NAMES
+from src.utils.tag_index import normalize_tags
+from src.utils.timestamps import normalize_utc
+
+
+def resolve_quadrant(value) -> str:
+    """Accept 1-4 or a quadrant name (case-insensitive)"""
+    text = str(value).strip()
+    if text.isdigit() and 1 <= int(text) <= len(QUADRANT_NAMES):
+        return QUADRANT_NAMES[int(text) - 1]
+    for name in QUADRANT_NAMES:
+        if name.lower() == text.lower():
+            return name
+    raise ValueError(f"Unknown quadrant: {value} (use 1-4 or a quadrant name)")
+
+
+class TaskNotFoundError(ValueError):
+    """The operation names a task that is not in the database"""
+
+
+def require_task(db, task_id: str) -> str:
+    """The table holding the task (see DatabaseManager.get_task_tier)"""
+    tier = db.get_task_tier(task_id)
+    if tier is None:
+        raise TaskNotFoundError(f"No such task: {task_id}")
+    return tier
+
+
+def _check(success: bool, op: str, task_id: str):
+    # DatabaseManager reports sqlite errors by returning False
+    if not success:
+        raise ValueError(f"Could not {op} task {task_id}")
+
+
+def apply_operation(db, op: Dict[str, Any]) -> Optional[str]:
+    """Apply one operation through DatabaseManager; returns the id of the task it touched"""
+    name = op.get('op')
+    if name == 'add':
+        task_id = op.get('id') or str(uuid.uuid4())
+        description = str(op['description']).strip()
+        if not description:
+            raise ValueError("Description must not be empty")
+        _check(db.add_task(task_id, resolve_quadrant(op['quadrant']), description,
+                           bool(op.get('done', False))), name, task_id)
+        tags = normalize_tags(op.get('tags') or [])
+        if tags:
+            _check(db.set_task_tags(task_id, tags), name, task_id)
+        return task_id
+
+    if name not in ('update', 'move', 'complete', 'edit', 'tag', 'delete'):
+        raise ValueError(f"Unknown operation: {name}")
+    task_id = op['id']
+    if require_task(db, task_id) == 'tasks_archive' and name != 'delete':
+        # Changing an archived task brings it back to the hot table; the archiver
+        # moves it out again once it has been completed long enough
+        _check(db.restore_archived_tasks([task_id]), name, task_id)
+    if name == 'update':
+        # Only the fields present are changed
+        if 'quadrant' in op:
+            _check(db.move_task(task_id, resolve_quadrant(op['quadrant'])), name, task_id)
+        if 'description' in op:
+            _check(db.update_task_description(task_id, op['description']), name, task_id)
+        if 'done' in op:
+            _check(db.update_task_status(task_id, bool(op['done'])), name, task_id)
+        if 'tags' in op:
+            _check(db.set_task_tags(task_id, normalize_tags(op['tags'] or [])), name, task_id)
+        if 'due_at' in op or 'remind_at' in op:
+            # Stored as UTC 'YYYY-MM-DD HH:MM:SS'; a missing field keeps its current value
+            due_at, remind_at = db.get_task_schedule(task_id)
+            due_at = normalize_utc(op['due_at']) if 'due_at' in op else due_at
+            remind_at = normalize_utc(op['remind_at']) if 'remind_at' in op else remind_at
+            _check(db.set_task_schedule(task_id, due_at, remind_at), name, task_id)
+    elif name == 'move':
+        _check(db.move_task(task_id, resolve_quadrant(op['quadrant'])), name, task_id)
+    elif name == 'complete':
+        _check(db.update_task_status(task_id, bool(op.get('done', True))), name, task_id)
+    elif name == 'edit':
+        _check(db.update_task_description(task_id, op['description']), name, task_id)
+    elif name == 'tag':
+        _check(db.set_task_tags(task_id, normalize_tags(op.get('tags') or [])), name, task_id)
+    elif name == 'delete':
+        _check(db.delete_task(task_id), name, task_id)
+    return task_id
@@ -0,0 +1,49 @@
+from typing import Dict
+
+from PyQt5.QtWidgets import QWidget
+
+from src.database.db_manager import DatabaseManager
+from src.ui.notification_manager import NotificationManager
+from src.utils.data_manager import DataManager
+from src.utils.tag_index import TagIndex
+from src.utils.trigram_index import TrigramIndex
+
+
+class Board:
+    """One open board: its database, the quadrant page built for it and its per-board state.
+
+    Boards stay open in the main window's LRU while recently used, so their
+    widgets, tag index and reminders survive switching away and back.
+    """
+
+    def __init__(self, name: str, db: DatabaseManager, page: QWidget, quadrants: Dict[str, QWidget],
+                 tag_index: TagIndex, notification_manager: NotificationManager):
+        self.name = name
+        self.db = db
+        self.page = page
+        self.quadrants = quadrants
+        self.tag_index = tag_index
+        # Descriptions of the active tasks, for the command palette
+        self.search_index = TrigramIndex()
+        self.notification_manager = notification_manager
+        self.data_manager = DataManager(db)
+        self.promoter = None
+        self.task_loader = None
+        # Steps of a running batch merge, see EisenhowerMatrixApp.import_batch
+        self.importer = None
+        # External change tracking, see EisenhowerMatrixApp.poll_external_changes
+        self.data_version = db.data_version()
+        self.change_watermark = db.current_watermark()
+
+    def close(self):
+        if self.task_loader is not None:
+            self.task_loader.close()
+            self.task_loader = None
+        if self.importer is not None:
+            self.importer.close()
+            self.importer = None
+        self.notification_manager.stop()
+        # Parented to the main window, so it would otherwise live as long as the app
+        self.notification_manager.deleteLater()
+        self.db.close()
+        self.page.deleteLater()
@@ -0,0 +1,79 @@
+from typing import Callable, List, Optional, Tuple
+
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QLabel
+from PyQt5.QtCore import Qt, QEvent
+
+
+class CommandPalette(QDialog):
+    """Keyboard-driven task switcher: type to fuzzy-match, then go to, complete or move a task.
+
+    search(text) returns (task id, label) rows and must be cheap, it runs on
+    every keystroke. After exec_() the chosen action is in action, task_id
+    and value ('goto', 'complete' or 'move' with the target quadrant).
+    """
+
+    def __init__(self, parent, search: Callable[[str], List[Tuple[str, str]]],
+                 move_targets: List[Tuple[str, str]]):
+        super().__init__(parent, Qt.Popup | Qt.FramelessWindowHint)
+        self.search = search
+        self.move_targets = move_targets
+        self.action: Optional[str] = None
+        self.task_id: Optional[str] = None
+        self.value = None
+        self.setMinimumWidth(480)
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText("Find a task...")
+        self.query_input.textChanged.connect(self.update_results)
+        self.query_input.installEventFilter(self)
+        layout.addWidget(self.query_input)
+
+        self.results = QListWidget()
+        self.results.itemActivated.connect(lambda _: self.choose('goto'))
+        layout.addWidget(self.results)
+
+        moves = ", ".join(f"Ctrl+{number} {label}" for number, (_, label) in enumerate(self.move_targets, 1))
+        hint = QLabel(f"Enter: go to    Ctrl+Enter: complete\nMove: {moves}")
+        hint.setWordWrap(True)
+        hint.setStyleSheet("font-size: 10px;")
+        layout.addWidget(hint)
+
+    def update_results(self, text: str):
+        self.results.clear()
+        for task_id, label in self.search(text) if text.strip() else []:
+            item = QListWidgetItem(label)
+            item.setData(Qt.UserRole, task_id)
+            self.results.addItem(item)
+        if self.results.count():
+            self.results.setCurrentRow(0)
+
+    def eventFilter(self, obj, event):
+        # The list is driven from the input so typing never loses focus
+        if obj is self.query_input and event.type() == QEvent.KeyPress:
+            key, modifiers = event.key(), event.modifiers()
+            if key in (Qt.Key_Up, Qt.Key_Down):
+                step = -1 if key == Qt.Key_Up else 1
+                row = self.results.currentRow() + step
+                if 0 <= row < self.results.count():
+                    self.results.setCurrentRow(row)
+                return True
+            if key in (Qt.Key_Return, Qt.Key_Enter):
+                self.choose('complete' if modifiers & Qt.ControlModifier else 'goto')
+                return True
+            if modifiers & Qt.ControlModifier and Qt.Key_1 <= key < Qt.Key_1 + len(self.move_targets):
+                self.choose('move', self.move_targets[key - Qt.Key_1][0])
+                return True
+        return super().eventFilter(obj, event)
+
+    def choose(self, action: str, value=None):
+        item = self.results.currentItem()
+        if item is None:
+            return
+        self.action = action
+        self.task_id = item.data(Qt.UserRole)
+        self.value = value
+        self.accept()
@@ -0,0 +1,119 @@
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QFormLayout, QCheckBox, QDateTimeEdit,
+                            QHBoxLayout, QPushButton, QComboBox, QSpinBox)
+from PyQt5.QtCore import QDateTime
+
+from src.utils.constants import TIME_FORMAT
+from src.utils.recurrence import FREQUENCIES
+
+# (label, minutes before the due time)
+REMINDER_OFFSETS = [
+    ("At due time", 0),
+    ("5 minutes before", 5),
+    ("15 minutes before", 15),
+    ("1 hour before", 60),
+    ("1 day before", 24 * 60),
+]
+
+
+def to_local(value: Optional[str]) -> Optional[QDateTime]:
+    """Stored UTC text to a local QDateTime"""
+    if not value:
+        return None
+    utc = datetime.strptime(value, TIME_FORMAT).replace(tzinfo=timezone.utc)
+    return QDateTime.fromSecsSinceEpoch(int(utc.timestamp()))
+
+
+def to_utc(value: QDateTime) -> str:
+    return datetime.fromtimestamp(value.toSecsSinceEpoch(), timezone.utc).strftime(TIME_FORMAT)
+
+
+class DueDateDialog(QDialog):
+    def __init__(self, parent=None, due_at: Optional[str] = None, remind_at: Optional[str] = None,
+                 frequency: Optional[str] = None, interval: int = 1):
+        super().__init__(parent)
+        self.setWindowTitle("Due Date")
+        self.setMinimumWidth(300)
+        self.setup_ui(due_at, remind_at, frequency, interval)
+
+    def setup_ui(self, due_at, remind_at, frequency, interval):
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+
+        self.has_due = QCheckBox("Has a due date")
+        self.has_due.setChecked(due_at is not None)
+        form.addRow(self.has_due)
+
+        self.due_edit = QDateTimeEdit(to_local(due_at) or QDateTime.currentDateTime().addSecs(3600))
+        self.due_edit.setCalendarPopup(True)
+        self.due_edit.setDisplayFormat("yyyy-MM-dd HH:mm")
+        form.addRow("Due:", self.due_edit)
+
+        self.remind_check = QCheckBox("Remind me")
+        self.remind_check.setChecked(remind_at is not None or due_at is None)
+        self.remind_offset = QComboBox()
+        for label, minutes in REMINDER_OFFSETS:
+            self.remind_offset.addItem(label, minutes)
+        if remind_at and due_at:
+            minutes = (self.due_edit.dateTime().toSecsSinceEpoch()
+                       - to_local(remind_at).toSecsSinceEpoch()) // 60
+            index = self.remind_offset.findData(minutes)
+            self.remind_offset.setCurrentIndex(max(index, 0))
+        form.addRow(self.remind_check, self.remind_offset)
+
+        self.repeat_combo = QComboBox()
+        self.repeat_combo.addItem("Never", None)
+        for key, label in FREQUENCIES.items():
+            self.repeat_combo.addItem(label, key)
+        self.repeat_combo.setCurrentIndex(max(self.repeat_combo.findData(frequency), 0))
+        self.interval_spin = QSpinBox()
+        self.interval_spin.setRange(1, 365)
+        self.interval_spin.setPrefix("every ")
+        self.interval_spin.setValue(interval)
+        repeat_row = QHBoxLayout()
+        repeat_row.addWidget(self.repeat_combo)
+        repeat_row.addWidget(self.interval_spin)
+        form.addRow("Repeat:", repeat_row)
+        layout.addLayout(form)
+
+        self.has_due.toggled.connect(self.update_enabled)
+        self.repeat_combo.currentIndexChanged.connect(self.update_enabled)
+        self.remind_check.toggled.connect(self.update_enabled)
+        self.update_enabled()
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        save_button = QPushButton("Save")
+        save_button.clicked.connect(self.accept)
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        buttons.addWidget(save_button)
+        buttons.addWidget(cancel_button)
+        layout.addLayout(buttons)
+
+    def update_enabled(self):
+        has_due = self.has_due.isChecked()
+        self.due_edit.setEnabled(has_due)
+        self.remind_check.setEnabled(has_due)
+        self.remind_offset.setEnabled(has_due and self.remind_check.isChecked())
+        # A series needs a first due date to count from
+        self.repeat_combo.setEnabled(has_due)
+        self.interval_spin.setEnabled(has_due and self.repeat_combo.currentData() is not None)
+
+    def get_schedule(self) -> Tuple[Optional[str], Optional[str]]:
+        """(due_at, remind_at) as UTC text, None where unset"""
+        if not self.has_due.isChecked():
+            return None, None
+        due = self.due_edit.dateTime()
+        if not self.remind_check.isChecked():
+            return to_utc(due), None
+        remind = due.addSecs(-60 * self.remind_offset.currentData())
+        return to_utc(due), to_utc(remind)
+
+    def get_recurrence(self) -> Tuple[Optional[str], int]:
+        """(frequency, interval); frequency None means the task does not repeat"""
+        if not self.has_due.isChecked():
+            return None, 1
+        return self.repeat_combo.currentData(), self.interval_spin.value()
@@ -0,0 +1,37 @@
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QPlainTextEdit, QLabel
+
+
+class NotesDialog(QDialog):
+    """Free-form notes and checklists for one task, read from the database only when opened"""
+
+    def __init__(self, parent=None, description: str = '', notes: str = ''):
+        super().__init__(parent)
+        self.setWindowTitle("Notes")
+        self.resize(420, 360)
+        self.setup_ui(description, notes)
+
+    def setup_ui(self, description, notes):
+        layout = QVBoxLayout(self)
+
+        title = QLabel(description)
+        title.setWordWrap(True)
+        title.setStyleSheet("font-weight: bold;")
+        layout.addWidget(title)
+
+        self.notes_edit = QPlainTextEdit()
+        self.notes_edit.setPlaceholderText("Notes, or a checklist with one \"- [ ] item\" per line")
+        self.notes_edit.setPlainText(notes)
+        layout.addWidget(self.notes_edit)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        save_button = QPushButton("Save")
+        save_button.clicked.connect(self.accept)
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        buttons.addWidget(save_button)
+        buttons.addWidget(cancel_button)
+        layout.addLayout(buttons)
+
+    def get_notes(self) -> str:
+        return self.notes_edit.toPlainText().rstrip()
@@ -199,6 +199,14 @@ class DataTab(QWidget):
         export_csv_btn.clicked.connect(self.main_window.export_to_csv)
         export_layout.addWidget(export_csv_btn)
         
+        export_delta_json_btn = QPushButton("Export Changes Since Last Export (JSON)")
+        export_delta_json_btn.clicked.connect(self.main_window.export_delta_json)
+        export_layout.addWidget(export_delta_json_btn)
+        
+        export_delta_csv_btn = QPushButton("Export Changes Since Last Export (CSV)")
+        export_delta_csv_btn.clicked.connect(self.main_window.export_delta_csv)
+        export_layout.addWidget(export_delta_csv_btn)
+        
         layout.addWidget(export_group)
         
         # Import section
@@ -217,5 +225,9 @@ class DataTab(QWidget):
         import_csv_btn.clicked.connect(self.main_window.import_from_csv)
         import_layout.addWidget(import_csv_btn)
         
+        import_batch_btn = QPushButton("Merge Multiple Files...")
+        import_batch_btn.clicked.connect(self.main_window.import_batch)
+        import_layout.addWidget(import_batch_btn)
+        
         layout.addWidget(import_group)
         layout.addStretch() 
\ No newline at end of file
@@ -1,37 +1,84 @@
-import sys
+import os
+import sqlite3
 import uuid
+from contextlib import ExitStack
+from datetime import datetime
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QGridLayout, QSystemTrayIcon, 
-                            QMenu, QDialog, QLabel, QFileDialog, QMessageBox, QApplication)
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QIcon, QColor
+                            QMenu, QDialog, QLabel, QFileDialog, QMessageBox, QApplication,
+                            QInputDialog, QShortcut, QStackedWidget, QActionGroup, QProgressDialog)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QIcon, QColor, QKeySequence
 
-from src.utils.constants import WINDOW_TITLE, WINDOW_SIZE, WINDOW_POSITION, QUADRANT_NAMES, STYLE_SHEET
+from src.utils.constants import (WINDOW_TITLE, WINDOW_SIZE, WINDOW_POSITION, QUADRANT_NAMES, STYLE_SHEET,
+                                 STARTUP_VIEWPORT_ROWS, LOAD_CHUNK_SIZE, EXTERNAL_CHANGES_POLL_MS,
+                                 WRITE_COALESCE_MS, SETTINGS_SAVE_DELAY_MS, BOARD_CACHE_SIZE, PALETTE_RESULTS)
 from src.database.db_manager import DatabaseManager
+from src.database.backup_manager import BackupManager
+from src.ui.board import Board
 from src.ui.widgets.quadrant_widget import QuadrantWidget
-from src.utils.data_manager import DataManager
+from src.ui.notification_manager import NotificationManager
+from src.utils.boards import BoardRegistry
+from src.utils.lru_cache import LRUCache
+from src.utils.settings_manager import SettingsManager
+from src.utils.tag_index import TagIndex, normalize_tags
+from src.utils.urgency_promoter import UrgencyPromoter
+from src.utils.write_coalescer import UNKNOWN, WriteCoalescer
 
 class EisenhowerMatrixApp(QMainWindow):
+    # Emitted from the backup thread, delivered on the UI thread
+    backup_finished = pyqtSignal(bool, str)
+
     def __init__(self):
         super().__init__()
-        # Initialize with default colors
-        self.current_bg_color = QColor("#646464")
-        self.current_text_color = QColor("#FFFFFF")
-        self.current_opacity = 95
-        self.quadrant_names = [
-            "Important & Urgent",
-            "Important but Not Urgent",
-            "Not Important but Urgent",
-            "Not Important & Not Urgent"
-        ]
+        self.setup_settings()
+        self.tag_filter = ([], True)
+        self.setup_write_coalescing()
         self.setup_window()
-        self.setup_database()
         self.setup_ui()
         self.setup_tray()
-        self.load_tasks()
-        self.data_manager = DataManager(self.db)
+        self.setup_boards()
+        self.setup_archiving()
+        self.setup_backups()
+        self.setup_promotion()
+        self.setup_external_changes()
         
 
 
+    def setup_settings(self):
+        """Settings live in the manager; changes are applied as they happen and saved after a short pause"""
+        self.settings_manager = SettingsManager()
+        self.settings_timer = QTimer(self)
+        self.settings_timer.setSingleShot(True)
+        self.settings_timer.timeout.connect(self.settings_manager.flush)
+        self.settings_manager.save_scheduler = lambda: self.settings_timer.start(SETTINGS_SAVE_DELAY_MS)
+        self.settings_manager.subscribe(self.on_settings_changed)
+
+    def on_settings_changed(self, changed):
+        if SettingsManager.changed_under(changed, 'appearance'):
+            self.apply_style()
+        if SettingsManager.changed_under(changed, 'quadrants'):
+            self.update_quadrant_names()
+
+    @property
+    def current_bg_color(self):
+        return QColor(self.settings_manager.get('appearance.background_color', '#646464'))
+
+    @property
+    def current_text_color(self):
+        return QColor(self.settings_manager.get('appearance.text_color', '#FFFFFF'))
+
+    @property
+    def current_opacity(self):
+        return self.settings_manager.get('appearance.opacity', 95)
+
+    @property
+    def quadrant_names(self):
+        # Display names only; tasks are stored under QUADRANT_NAMES
+        names = self.settings_manager.get('quadrants.names')
+        if not isinstance(names, list) or len(names) != len(QUADRANT_NAMES):
+            return list(QUADRANT_NAMES)
+        return names
+
     def setup_window(self):
         self.setWindowTitle(WINDOW_TITLE)
         self.setGeometry(*WINDOW_POSITION, *WINDOW_SIZE)
@@ -39,32 +86,272 @@ class EisenhowerMatrixApp(QMainWindow):
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.dragging = False
 
-    def setup_database(self):
-        self.db = DatabaseManager('tasks.db')
-
     def setup_ui(self):
-        central_widget = QWidget()
+        # One page of quadrants per open board
+        central_widget = QStackedWidget()
+        self.board_stack = central_widget
         self.setCentralWidget(central_widget)
         
-        # Store the initial style sheet
-        self.current_style = STYLE_SHEET
-        central_widget.setStyleSheet(self.current_style)
+        # Styled once: the built-in sheet unless the saved appearance differs from the defaults
+        default_appearance = self.settings_manager.get_default_settings()['appearance']
+        if self.settings_manager.get('appearance') == default_appearance:
+            self.current_style = STYLE_SHEET
+            central_widget.setStyleSheet(self.current_style)
+        else:
+            self.apply_style()
 
-        layout = QGridLayout(central_widget)
-        self.quadrants = {}
+    def build_board_page(self, tag_index: TagIndex):
+        """The quadrant grid of one board; returns (page, quadrants by name)"""
+        page = QWidget()
+        layout = QGridLayout(page)
+        quadrants = {}
         positions = [(0, 0), (0, 1), (1, 0), (1, 1)]
 
-        for name, pos in zip(self.quadrant_names, positions):
+        for name, pos in zip(QUADRANT_NAMES, positions):
             quadrant = QuadrantWidget(
                 name,
                 self.add_task,
                 self.update_task_status,
                 self.delete_task,
                 self.edit_task,
-                self.move_task
+                self.move_task,
+                self.load_completed_page,
+                self.query_quadrant_view,
+                self.edit_task_tags,
+                self.edit_task_due,
+                self.bulk_action,
+                self.edit_task_notes
             )
+            quadrant.tag_lookup = tag_index.get_tags
+            quadrant.move_targets = lambda: list(zip(QUADRANT_NAMES, self.quadrant_names))
             layout.addWidget(quadrant, *pos)
-            self.quadrants[name] = quadrant
+            quadrants[name] = quadrant
+        if self.quadrant_names != QUADRANT_NAMES:
+            self.update_quadrant_names(quadrants)
+        return page, quadrants
+
+    def setup_boards(self):
+        """Open the last used board; recently used ones stay open in an LRU"""
+        self.board_registry = BoardRegistry(self.settings_manager)
+        self.boards = LRUCache(self.settings_manager.get('boards.open_limit', BOARD_CACHE_SIZE),
+                               self.close_board)
+        self.board = None
+        self.switch_board(self.board_registry.current())
+
+    def open_board(self, name: str) -> Board:
+        db = DatabaseManager(self.board_registry.path(name),
+                             configured_profile=self.settings_manager.get('database.profile'))
+        tag_index = TagIndex()
+        page, quadrants = self.build_board_page(tag_index)
+        self.board_stack.addWidget(page)
+        board = Board(name, db, page, quadrants, tag_index, NotificationManager(db, self.tray_icon, self))
+        board.promoter = self.make_promoter(db)
+        # Reminders of every open board keep firing, not only those of the visible one
+        board.notification_manager.start()
+        return board
+
+    def close_board(self, name: str, board: Board):
+        self.board_stack.removeWidget(board.page)
+        board.close()
+
+    def switch_board(self, name: str):
+        if self.board is not None and self.board.name == name:
+            return
+        # Pending edits belong to the board being left
+        self.flush_pending_writes()
+        board = self.boards.get(name)
+        fresh = board is None
+        if fresh:
+            board = self.open_board(name)
+        self.activate_board(board)
+        # Added after activation, so eviction never closes the board being shown
+        self.boards.put(name, board)
+        self.board_registry.select(name)
+        if fresh:
+            # Let the empty frame paint first, then stream the tasks in
+            QTimer.singleShot(0, lambda: self.load_tasks(board))
+        else:
+            # Catch up on what other processes committed while it was in the background
+            self.poll_external_changes()
+            self.apply_tag_filter()
+
+    def activate_board(self, board: Board):
+        """Point the window at a board; everything else works on these attributes"""
+        self.board = board
+        self.db = board.db
+        self.quadrants = board.quadrants
+        self.tag_index = board.tag_index
+        self.search_index = board.search_index
+        self.notification_manager = board.notification_manager
+        self.data_manager = board.data_manager
+        self.promoter = board.promoter
+        self.backup_manager = self.make_backup_manager(board.db.db_path)
+        self.board_stack.setCurrentWidget(board.page)
+        self.tray_icon.setToolTip(f"{WINDOW_TITLE} - {board.name}")
+
+    def update_board_menu(self):
+        self.board_menu.clear()
+        group = QActionGroup(self.board_menu)
+        for name in self.board_registry.names():
+            action = self.board_menu.addAction(name)
+            action.setCheckable(True)
+            action.setChecked(name == self.board.name)
+            action.setActionGroup(group)
+            action.triggered.connect(lambda _, name=name: self.switch_board(name))
+        self.board_menu.addSeparator()
+        new_action = self.board_menu.addAction("New Board...")
+        new_action.triggered.connect(self.add_board)
+
+    def add_board(self):
+        name, ok = QInputDialog.getText(self, "New Board", "Board name:")
+        if not ok:
+            return
+        try:
+            name = self.board_registry.add(name)
+        except ValueError as e:
+            QMessageBox.warning(self, "New Board", str(e))
+            return
+        self.switch_board(name)
+
+    def setup_archiving(self):
+        """Periodically move old completed tasks out of the hot table"""
+        self.archive_policy = self.settings_manager.settings.get('archive', {})
+        if not self.archive_policy.get('enabled', True):
+            return
+        self.archive_timer = QTimer(self)
+        self.archive_timer.timeout.connect(self.run_archive_batch)
+        self.archive_timer.start(self.archive_policy.get('interval_minutes', 60) * 60 * 1000)
+        QTimer.singleShot(5000, self.run_archive_batch)
+
+    def run_archive_batch(self):
+        """Archive one batch and schedule the next, so the UI stays responsive"""
+        if self.board.importer is not None:
+            return  # would fold into the merge's undo step; the next interval catches up
+        batch_size = self.archive_policy.get('batch_size', 500)
+        moved = self.db.archive_completed(self.archive_policy.get('done_days', 30), batch_size)
+        for task_id, quadrant in moved:
+            if quadrant in self.quadrants:
+                self.quadrants[quadrant].remove_task_widget(task_id)
+        if len(moved) == batch_size:
+            QTimer.singleShot(50, self.run_archive_batch)
+
+    def make_promoter(self, db):
+        policy = self.settings_manager.settings.get('promotion', {})
+        if not policy.get('enabled', True):
+            return None
+        return UrgencyPromoter(db, policy.get('lead_hours', 24))
+
+    def setup_promotion(self):
+        """Move tasks to the urgent quadrants as their due dates approach"""
+        policy = self.settings_manager.settings.get('promotion', {})
+        if not policy.get('enabled', True):
+            return
+        self.promotion_timer = QTimer(self)
+        self.promotion_timer.timeout.connect(self.run_promotion)
+        self.promotion_timer.start(policy.get('interval_minutes', 5) * 60 * 1000)
+        QTimer.singleShot(10 * 1000, self.run_promotion)
+
+    def run_promotion(self):
+        if self.board.importer is not None:
+            return
+        self.apply_promotions(self.promoter.tick())
+
+    def apply_promotions(self, moves):
+        """Show promoted tasks in their new quadrant"""
+        if not moves:
+            return
+        self.refresh_tasks([task_id for task_id, _, _ in moves])
+        if len(moves) == 1:
+            task_id = moves[0][0]
+            description = self.db.get_task_states([task_id]).get(task_id, (None, ''))[1]
+            message = f"Now urgent: {description}"
+        else:
+            message = f"{len(moves)} tasks became urgent"
+        self.tray_icon.showMessage("Deadlines", message, QSystemTrayIcon.Information)
+
+    def make_backup_manager(self, db_path: str) -> BackupManager:
+        # Backups are named after the database path, so every board rotates its own
+        policy = self.settings_manager.settings.get('backup', {})
+        return BackupManager(
+            db_path,
+            keep=policy.get('keep', 7),
+            compress=policy.get('compress', True)
+        )
+
+    def setup_backups(self):
+        policy = self.settings_manager.settings.get('backup', {})
+        self.backup_finished.connect(self.on_backup_finished)
+        if not policy.get('enabled', True):
+            return
+        self.backup_interval_hours = policy.get('interval_hours', 24)
+        self.backup_timer = QTimer(self)
+        self.backup_timer.timeout.connect(self.run_scheduled_backup)
+        self.backup_timer.start(60 * 60 * 1000)
+        QTimer.singleShot(60 * 1000, self.run_scheduled_backup)
+
+    def run_scheduled_backup(self):
+        last = self.backup_manager.last_backup_time()
+        if last is None or (datetime.now() - last).total_seconds() >= self.backup_interval_hours * 3600:
+            self.backup_now(notify=False)
+
+    def backup_now(self, notify: bool = True):
+        self.flush_pending_writes()
+        self.backup_notify = notify
+        self.backup_manager.create_backup(self.backup_finished.emit)
+
+    def on_backup_finished(self, success: bool, message: str):
+        if not success:
+            self.tray_icon.showMessage("Backup failed", message, QSystemTrayIcon.Warning)
+        elif self.backup_notify:
+            self.tray_icon.showMessage("Backup created", message)
+
+    def restore_backup(self):
+        filepath, _ = QFileDialog.getOpenFileName(
+            self, "Restore Backup", str(self.backup_manager.backup_dir),
+            "Backups (*.db *.db.gz)"
+        )
+        if not filepath:
+            return
+        reply = QMessageBox.question(
+            self, "Restore Backup",
+            "Replace all current tasks with this backup?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+        self.flush_pending_writes()
+        if self.backup_manager.restore(filepath, self.db):
+            self.refresh_tasks()
+            QMessageBox.information(self, "Success", "Backup restored")
+        else:
+            QMessageBox.critical(self, "Error", "Failed to restore backup")
+
+    def setup_external_changes(self):
+        """Follow edits committed by other processes, such as cli.py or the local API"""
+        self.change_timer = QTimer(self)
+        self.change_timer.timeout.connect(self.poll_external_changes)
+        self.change_timer.start(EXTERNAL_CHANGES_POLL_MS)
+
+    def poll_external_changes(self):
+        # data_version only moves when another connection commits, so idle polls cost one pragma
+        board = self.board
+        version = board.db.data_version()
+        if version == board.data_version or board.task_loader is not None:
+            return
+        board.data_version = version
+        board.change_watermark, tasks, deleted = board.db.get_changes_since(board.change_watermark)
+        for task in tasks:
+            self.tag_index.set_tags(task['id'], task['tags'])
+        for task in deleted:
+            self.tag_index.remove_task(task['id'])
+        task_ids = [task['id'] for task in tasks] + [task['id'] for task in deleted]
+        if not task_ids:
+            return
+        self.refresh_tasks(task_ids)
+        for task in tasks:
+            widget = self.find_task_widget(task['id'])
+            if widget:
+                widget.set_tags(task['tags'])
 
     def setup_tray(self):
         # Create tray icon
@@ -78,14 +365,39 @@ class EisenhowerMatrixApp(QMainWindow):
         toggle_action = tray_menu.addAction("Show/Hide")
         toggle_action.triggered.connect(self.toggle_visibility)
         
+        # Undo/redo actions, labelled with the operation they would replay
+        self.undo_action = tray_menu.addAction("Undo")
+        self.undo_action.triggered.connect(self.undo)
+        self.redo_action = tray_menu.addAction("Redo")
+        self.redo_action.triggered.connect(self.redo)
+        tray_menu.aboutToShow.connect(self.update_undo_actions)
+        
+        # Board switcher, rebuilt every time it opens
+        self.board_menu = tray_menu.addMenu("Boards")
+        self.board_menu.aboutToShow.connect(self.update_board_menu)
+        
+        # Tag filter action
+        tag_filter_action = tray_menu.addAction("Filter by Tags...")
+        tag_filter_action.triggered.connect(self.show_tag_filter)
+        
         # Statistics action
         stats_action = tray_menu.addAction("Statistics")
         stats_action.triggered.connect(self.show_statistics)
         
+        find_action = tray_menu.addAction("Find Task...\tCtrl+K")
+        find_action.triggered.connect(self.show_command_palette)
+
         # Settings action
         settings_action = tray_menu.addAction("Settings")
         settings_action.triggered.connect(self.show_settings)
         
+        # Backup actions
+        backup_menu = tray_menu.addMenu("Backups")
+        backup_action = backup_menu.addAction("Back Up Now")
+        backup_action.triggered.connect(lambda: self.backup_now())
+        restore_action = backup_menu.addAction("Restore Backup...")
+        restore_action.triggered.connect(self.restore_backup)
+        
         tray_menu.addSeparator()
         
         # Quit action
@@ -96,36 +408,395 @@ class EisenhowerMatrixApp(QMainWindow):
         self.tray_icon.setContextMenu(tray_menu)
         self.tray_icon.show()
 
+        QShortcut(QKeySequence.Undo, self, activated=self.undo)
+        QShortcut(QKeySequence.Redo, self, activated=self.redo)
+        QShortcut(QKeySequence("Ctrl+K"), self, activated=self.show_command_palette)
+
+    def update_undo_actions(self):
+        self.flush_pending_writes()
+        undo_label, redo_label = self.db.get_journal_labels()
+        self.undo_action.setText(f"Undo {undo_label}" if undo_label else "Undo")
+        self.undo_action.setEnabled(undo_label is not None)
+        self.redo_action.setText(f"Redo {redo_label}" if redo_label else "Redo")
+        self.redo_action.setEnabled(redo_label is not None)
+
+    def undo(self):
+        self.replay_journal(self.db.undo)
+
+    def redo(self):
+        self.replay_journal(self.db.redo)
+
+    def replay_journal(self, replay):
+        # Pending edits are an operation of their own and must be journaled first
+        self.flush_pending_writes()
+        result = replay()
+        if result is None:
+            return
+        _, task_ids = result
+        if len(task_ids) > 500:
+            # Imports and clears: one full reconcile beats thousands of single lookups
+            self.refresh_tasks()
+            return
+        for task_id in task_ids:
+            self.tag_index.set_tags(task_id, self.db.get_task_tags(task_id))
+        self.refresh_tasks(task_ids)
+        for task_id in task_ids:
+            widget = self.find_task_widget(task_id)
+            if widget:
+                widget.set_tags(self.tag_index.get_tags(task_id))
+        self.apply_tag_filter()
+
     def add_task(self, quadrant_name: str, description: str):
         task_id = str(uuid.uuid4())
-        if self.db.add_task(task_id, quadrant_name, description):
+        with self.db.journal("Add task"):
+            added = self.db.add_task(task_id, quadrant_name, description)
+        if added:
             self.quadrants[quadrant_name].add_task_widget(task_id, description, False)
+            self.search_index.set_text(task_id, description)
 
-    def update_task_status(self, task_id: str, done: bool):
-        """Update task status in database and UI"""
+    def setup_write_coalescing(self):
+        """Checkbox toggles and edits are written once per short window, final state only"""
+        self.write_coalescer = WriteCoalescer()
+        self.write_timer = QTimer(self)
+        self.write_timer.setSingleShot(True)
+        self.write_timer.timeout.connect(self.flush_pending_writes)
+
+    def queue_write(self, task_id: str, field: str, value, previous=UNKNOWN):
+        self.write_coalescer.add(task_id, field, value, previous)
+        # Not restarted by later writes, so a write never waits longer than one window
+        if not self.write_timer.isActive():
+            self.write_timer.start(WRITE_COALESCE_MS)
+
+    def flush_pending_writes(self):
+        """Write every pending task change; called by the timer and before anything reads them"""
+        self.write_timer.stop()
+        writes = self.write_coalescer.take()
+        if not writes:
+            return
+        status_changes = []
+        failed = set()
+        fields = {field for _, field, _ in writes}
+        label = "Edit task" if fields == {'description'} else "Change status" if fields == {'done'} else "Edit tasks"
         try:
-            # Update in database
-            success = self.db.update_task_status(task_id, done)
-            if not success:
-                print(f"Failed to update task status: {task_id}")
-            
-            # Commit the changes to ensure they're saved
-            self.db.conn.commit()
-            
-        except Exception as e:
-            print(f"Error updating task status: {e}")
+            with self.db.batch(), self.db.journal(label):
+                for task_id, field, value in writes:
+                    if field == 'done':
+                        # Open instances of a recurring task before the write, to show the next one
+                        series_ids = set(self.db.get_series_task_ids(task_id))
+                        if self.db.update_task_status(task_id, value):
+                            status_changes.append((task_id, series_ids))
+                        else:
+                            failed.add(task_id)
+                    elif field == 'description':
+                        if not self.db.update_task_description(task_id, value):
+                            failed.add(task_id)
+        except sqlite3.OperationalError as e:
+            # Another instance kept the database locked; keep the changes and try again shortly
+            print(f"Database busy, retrying {len(writes)} changes: {e}")
+            for task_id, field, value in writes:
+                self.write_coalescer.add(task_id, field, value)
+            self.write_timer.start(WRITE_COALESCE_MS)
+            return
+        if failed:
+            # The batch was rolled back; show what the database actually holds
+            print(f"Failed to save changes to {len(failed)} tasks")
+            self.refresh_tasks({task_id for task_id, _, _ in writes})
+            return
+        for task_id, series_ids in status_changes:
+            self.on_task_status_written(task_id, series_ids)
+
+    def update_task_status(self, task_id: str, done: bool):
+        """Queue a checkbox change; rapid toggles collapse into one write"""
+        self.queue_write(task_id, 'done', done, not done)
+        widget = self.find_task_widget(task_id)
+        if done:
+            self.search_index.remove_task(task_id)
+        elif widget:
+            self.search_index.set_text(task_id, widget.description)
+
+    def on_task_status_written(self, task_id: str, series_ids):
+        if series_ids:
+            created = set(self.db.get_series_task_ids(task_id)) - series_ids
+            self.refresh_tasks(series_ids | created | {task_id})
+            if self.promoter and created:
+                self.apply_promotions(self.promoter.promote_tasks(created))
+        else:
+            # Completing silences the reminder, reopening brings it back
+            self.notification_manager.update_tasks([task_id])
 
     def delete_task(self, task_id: str):
-        if self.db.delete_task(task_id):
-            # Task widget will be deleted through Qt's parent-child relationship
-            sender = self.sender()
-            if sender:
-                sender.deleteLater()
+        self.write_coalescer.discard(task_id)
+        with self.db.journal("Delete task"):
+            deleted = self.db.delete_task(task_id)
+        if deleted:
+            self.tag_index.remove_task(task_id)
+            self.search_index.remove_task(task_id)
+            self.notification_manager.update_tasks([task_id])
+            for quadrant in self.quadrants.values():
+                quadrant.remove_task_widget(task_id)
+
+    def bulk_action(self, action: str, task_ids, value=None):
+        """Apply one action to a multi-selection as a single transaction and undo step"""
+        self.flush_pending_writes()
+        task_ids = list(task_ids)
+        count = len(task_ids)
+        if action in ('complete', 'reopen'):
+            done = action == 'complete'
+            series_ids = set()
+            for task_id in task_ids:
+                series_ids.update(self.db.get_series_task_ids(task_id))
+            with self.db.journal(f"{'Complete' if done else 'Reopen'} {count} tasks"):
+                saved = self.db.update_tasks_status(task_ids, done)
+            if saved:
+                created = set()
+                for task_id in task_ids:
+                    created.update(self.db.get_series_task_ids(task_id))
+                created -= series_ids
+                self.refresh_tasks(set(task_ids) | series_ids | created)
+                if self.promoter and created:
+                    self.apply_promotions(self.promoter.promote_tasks(created))
+        elif action == 'move':
+            with self.db.journal(f"Move {count} tasks"):
+                saved = self.db.move_tasks(task_ids, value)
+            if saved:
+                self.refresh_tasks(task_ids)
+        elif action == 'delete':
+            for task_id in task_ids:
+                self.write_coalescer.discard(task_id)
+            with self.db.journal(f"Delete {count} tasks"):
+                deleted = self.db.delete_tasks(task_ids)
+            if deleted:
+                for task_id in task_ids:
+                    self.tag_index.remove_task(task_id)
+                    self.search_index.remove_task(task_id)
+                    for quadrant in self.quadrants.values():
+                        quadrant.remove_task_widget(task_id)
+                self.notification_manager.update_tasks(task_ids)
+        elif action in ('add_tags', 'remove_tags'):
+            adding = action == 'add_tags'
+            text, ok = QInputDialog.getText(
+                self, "Add Tags" if adding else "Remove Tags",
+                f"Tags to {'add to' if adding else 'remove from'} {count} tasks (comma separated):"
+            )
+            tags = normalize_tags(text) if ok else []
+            if not tags:
+                return
+            with self.db.journal(f"{'Tag' if adding else 'Untag'} {count} tasks"):
+                saved = self.db.retag_tasks(task_ids, add=tags if adding else (),
+                                            remove=() if adding else tags)
+            if saved:
+                for task_id in task_ids:
+                    current = self.tag_index.get_tags(task_id)
+                    if adding:
+                        updated = sorted(set(current) | set(tags))
+                    else:
+                        updated = [tag for tag in current if tag not in tags]
+                    self.tag_index.set_tags(task_id, updated)
+                    widget = self.find_task_widget(task_id)
+                    if widget:
+                        widget.set_tags(updated)
+                self.apply_tag_filter()
 
-    def load_tasks(self):
+    def load_tasks(self, board: Board):
+        """Populate a board's quadrants progressively through the event loop"""
+        if board.task_loader is not None:
+            board.task_loader.close()
+        board.tag_index.load(board.db.get_tags_by_task())
+        # Filled from the loaded chunks below, so it costs no query of its own
+        board.search_index.load(())
+        # Only active work is loaded eagerly; completed tasks are paged in on demand
         for quadrant in QUADRANT_NAMES:
-            for task_id, description, done in self.db.get_tasks(quadrant):
-                self.quadrants[quadrant].add_task_widget(task_id, description, done)
+            board.quadrants[quadrant].set_completed_count(board.db.count_completed_tasks(quadrant))
+        loader = board.db.iter_active_task_chunks(QUADRANT_NAMES, STARTUP_VIEWPORT_ROWS, LOAD_CHUNK_SIZE)
+        board.task_loader = loader
+        self.load_next_chunk(board, loader)
+
+    def load_next_chunk(self, board: Board, loader):
+        """Add one chunk of rows, then yield to the event loop so input stays live"""
+        if loader is not board.task_loader:
+            return  # superseded by a newer load, or the board was closed
+        try:
+            quadrant, rows = next(loader)
+        except StopIteration:
+            board.task_loader = None
+            self.on_tasks_loaded(board)
+            return
+        board.quadrants[quadrant].add_task_widgets(rows)
+        for task_id, description, done in rows:
+            if not done:
+                board.search_index.set_text(task_id, description)
+        QTimer.singleShot(0, lambda: self.load_next_chunk(board, loader))
+
+    def on_tasks_loaded(self, board: Board):
+        # Re-apply views chosen while rows were still streaming in
+        for quadrant in board.quadrants.values():
+            if quadrant.has_custom_view():
+                quadrant.apply_view()
+        if self.tag_filter[0] and board is self.board:
+            self.apply_tag_filter()
+
+    def refresh_tasks(self, task_ids=None):
+        """Bring the widgets in line with the database, touching only changed rows.
+
+        With task_ids only those tasks are checked; otherwise every open task
+        and every displayed widget is diffed by id.
+        """
+        # Pending toggles would otherwise be reverted to the stored state
+        self.flush_pending_writes()
+        if self.board.task_loader is not None:
+            # Only a full reconcile adds whatever the interrupted load had not reached
+            self.board.task_loader.close()
+            self.board.task_loader = None
+            task_ids = None
+
+        displayed = {}
+        for name, quadrant in self.quadrants.items():
+            for task_id in quadrant.displayed_task_ids():
+                displayed[task_id] = name
+
+        full = task_ids is None
+        if full:
+            old_tags = self.tag_index.tags_by_task.copy()
+            self.tag_index.load(self.db.get_tags_by_task())
+            states = self.db.get_active_task_states()
+            missing = [task_id for task_id in displayed if task_id not in states]
+            self.search_index.load((task_id, state[1]) for task_id, state in states.items())
+            states.update(self.db.get_task_states(missing))
+            task_ids = list(states) + missing
+            retagged = {task_id for task_id in displayed
+                        if old_tags.get(task_id) != self.tag_index.tags_by_task.get(task_id)}
+        else:
+            task_ids = list(task_ids)
+            states = self.db.get_task_states(task_ids)
+            retagged = set()
+
+        touched = set()
+        for task_id in task_ids:
+            state = states.get(task_id)
+            current = displayed.get(task_id)
+            if state is None or state[2]:
+                self.search_index.remove_task(task_id)
+            else:
+                self.search_index.set_text(task_id, state[1])
+            if state is None:
+                if current:
+                    self.tag_index.remove_task(task_id)
+                    self.quadrants[current].remove_task_widget(task_id)
+                    touched.add(current)
+                continue
+            quadrant_name, description, done = state
+            if quadrant_name not in self.quadrants:
+                continue
+            if current is None:
+                if not done:
+                    self.quadrants[quadrant_name].add_task_widget(task_id, description, done)
+                    touched.add(quadrant_name)
+                continue
+            widget = self.quadrants[current].find_task_widget(task_id)
+            if current != quadrant_name:
+                widget = self.quadrants[current].take_task_widget(task_id)
+                target = self.quadrants[quadrant_name]
+                target.insert_task_widget(widget, target.task_layout.count())
+                touched.update((current, quadrant_name))
+            widget.update_state(description, done)
+            if task_id in retagged:
+                widget.set_tags(self.tag_index.get_tags(task_id))
+
+        for name in (self.quadrants if full else touched):
+            quadrant = self.quadrants[name]
+            quadrant.set_completed_count(self.db.count_completed_tasks(name, quadrant.filter_text))
+            if name in touched and quadrant.has_custom_view():
+                quadrant.apply_view()
+        if self.tag_filter[0]:
+            self.apply_tag_filter()
+        if full:
+            self.notification_manager.reload()
+        else:
+            self.notification_manager.update_tasks(task_ids)
+
+    def find_task_widget(self, task_id: str):
+        for quadrant in self.quadrants.values():
+            widget = quadrant.find_task_widget(task_id)
+            if widget:
+                return widget
+        return None
+
+    def edit_task_tags(self, task_id: str):
+        current = ', '.join(self.tag_index.get_tags(task_id))
+        text, ok = QInputDialog.getText(self, "Edit Tags", "Tags (comma separated):", text=current)
+        if not ok:
+            return
+        tags = normalize_tags(text)
+        with self.db.journal("Edit tags"):
+            saved = self.db.set_task_tags(task_id, tags)
+        if saved:
+            self.tag_index.set_tags(task_id, tags)
+            widget = self.find_task_widget(task_id)
+            if widget:
+                widget.set_tags(tags)
+            self.apply_tag_filter()
+
+    def edit_task_due(self, task_id: str):
+        from .dialogs.due_date_dialog import DueDateDialog
+        dialog = DueDateDialog(self, *self.db.get_task_schedule(task_id),
+                               *self.db.get_task_recurrence(task_id))
+        if not dialog.exec_():
+            return
+        with self.db.journal("Set due date"):
+            saved = self.db.set_task_schedule(task_id, *dialog.get_schedule())
+            if saved:
+                self.db.set_task_recurrence(task_id, *dialog.get_recurrence())
+        if saved:
+            self.notification_manager.update_tasks([task_id])
+            if self.promoter:
+                self.apply_promotions(self.promoter.promote_tasks([task_id]))
+
+    def edit_task_notes(self, task_id: str):
+        from .dialogs.notes_dialog import NotesDialog
+        widget = self.find_task_widget(task_id)
+        notes = self.db.get_task_note(task_id)
+        dialog = NotesDialog(self, widget.description if widget else '', notes)
+        if not dialog.exec_() or dialog.get_notes() == notes:
+            return
+        with self.db.journal("Edit notes"):
+            self.db.set_task_note(task_id, dialog.get_notes())
+
+    def show_tag_filter(self):
+        modes = ["Match all tags (AND)", "Match any tag (OR)"]
+        tags, match_all = self.tag_filter
+        mode, ok = QInputDialog.getItem(
+            self, "Filter by Tags", "Mode:", modes, 0 if match_all else 1, False
+        )
+        if not ok:
+            return
+        hint = ', '.join(self.tag_index.all_tags())
+        text, ok = QInputDialog.getText(
+            self, "Filter by Tags",
+            f"Tags (comma separated, empty to clear):\nKnown tags: {hint}",
+            text=', '.join(tags)
+        )
+        if ok:
+            self.tag_filter = (normalize_tags(text), mode == modes[0])
+            self.apply_tag_filter()
+
+    def apply_tag_filter(self):
+        """Filter every quadrant from the in-memory tag index, no SQL involved"""
+        tags, match_all = self.tag_filter
+        task_ids = self.tag_index.filter(tags, match_all)
+        for quadrant in self.quadrants.values():
+            quadrant.set_tag_filter(task_ids)
+
+    def load_completed_page(self, quadrant_name: str, offset: int, limit: int,
+                            sort_mode: str = 'manual', text: str = ''):
+        self.flush_pending_writes()
+        return self.db.get_completed_tasks(quadrant_name, offset, limit, sort_mode, text)
+
+    def query_quadrant_view(self, quadrant_name: str, sort_mode: str, text: str):
+        self.flush_pending_writes()
+        return (
+            self.db.get_task_order(quadrant_name, sort_mode, text),
+            self.db.count_completed_tasks(quadrant_name, text)
+        )
 
     # Window drag events
     def mousePressEvent(self, event):
@@ -142,14 +813,14 @@ class EisenhowerMatrixApp(QMainWindow):
             self.dragging = False
 
     def closeEvent(self, event):
+        # Closing only hides the window; reminders keep running until Quit
         event.ignore()
         self.hide()
-        
-        # Stop notification manager
-        self.notification_manager.stop()
 
     def show_settings(self):
         from .dialogs.settings_dialog import SettingsDialog
+        # The Data tab exports and imports
+        self.flush_pending_writes()
         dialog = SettingsDialog(
             parent=self,
             bg_color=self.current_bg_color,
@@ -158,25 +829,22 @@ class EisenhowerMatrixApp(QMainWindow):
             quadrant_names=self.quadrant_names
         )
         if dialog.exec_() == QDialog.Accepted:
-            # Update the stored colors and apply new style
-            self.current_bg_color = dialog.appearance_tab.current_bg_color
-            self.current_text_color = dialog.appearance_tab.current_text_color
-            self.current_opacity = dialog.appearance_tab.opacity_spin.value()
-            
-            # Update quadrant names
-            new_names = dialog.quadrants_tab.get_quadrant_names()
-            if new_names != self.quadrant_names:
-                self.quadrant_names = new_names
-                self.update_quadrant_names()
-            
-            self.apply_style()
+            # Only values that really changed restyle or rename anything
+            self.save_settings(
+                dialog.appearance_tab.current_bg_color,
+                dialog.appearance_tab.current_text_color,
+                dialog.appearance_tab.opacity_spin.value(),
+                dialog.quadrants_tab.get_quadrant_names()
+            )
 
-    def update_quadrant_names(self):
-        # Update the quadrant labels
-        for quadrant, name in zip(self.quadrants.values(), self.quadrant_names):
-            title_label = quadrant.findChild(QLabel)
-            if title_label:
-                title_label.setText(name)
+    def update_quadrant_names(self, quadrants=None):
+        # Update the quadrant labels of one page, or of every open board
+        pages = [quadrants] if quadrants is not None else [board.quadrants for board in self.boards.values()]
+        for page in pages:
+            for quadrant, name in zip(page.values(), self.quadrant_names):
+                title_label = quadrant.findChild(QLabel)
+                if title_label:
+                    title_label.setText(name)
 
     def apply_style(self):
         style_sheet = f"""
@@ -211,6 +879,7 @@ class EisenhowerMatrixApp(QMainWindow):
                 border: 1px solid #4CAF50;
             }}
         """
+        self.current_style = style_sheet
         self.centralWidget().setStyleSheet(style_sheet)
 
     def show(self):
@@ -220,40 +889,82 @@ class EisenhowerMatrixApp(QMainWindow):
     def hide(self):
         super().hide()
 
-    def save_settings(self, bg_color, text_color, opacity):
-        self.current_bg_color = bg_color
-        self.current_text_color = text_color
-        self.current_opacity = opacity 
+    def save_settings(self, bg_color, text_color, opacity, quadrant_names=None):
+        values = {'appearance.opacity': opacity}
+        # QColor.name() is lower case; an unchanged colour must not count as a change
+        if bg_color != self.current_bg_color:
+            values['appearance.background_color'] = bg_color.name()
+        if text_color != self.current_text_color:
+            values['appearance.text_color'] = text_color.name()
+        if quadrant_names is not None:
+            values['quadrants.names'] = list(quadrant_names)
+        self.settings_manager.update(values)
 
     def edit_task(self, task_id: str, new_description: str):
-        try:
-            self.db.update_task_description(task_id, new_description)
-        except Exception as e:
-            print(f"Error updating task: {e}") 
+        self.queue_write(task_id, 'description', new_description)
+        widget = self.find_task_widget(task_id)
+        if widget and not widget.done_checkbox.isChecked():
+            self.search_index.set_text(task_id, new_description)
+
+    def show_command_palette(self):
+        from .dialogs.command_palette import CommandPalette
+        self.show()
+        targets = list(zip(QUADRANT_NAMES, self.quadrant_names))
+        dialog = CommandPalette(self, self.search_palette, targets)
+        dialog.move(self.geometry().center().x() - dialog.minimumWidth() // 2, self.geometry().top() + 40)
+        if not dialog.exec_():
+            return
+        quadrant = self.find_task_quadrant(dialog.task_id)
+        if quadrant is None:
+            return
+        if dialog.action == 'goto':
+            self.goto_task(dialog.task_id)
+        elif dialog.action == 'complete':
+            # Same path as clicking the checkbox
+            quadrant.find_task_widget(dialog.task_id).done_checkbox.setChecked(True)
+        elif dialog.action == 'move' and dialog.value != quadrant.name:
+            target = self.quadrants[dialog.value]
+            self.move_task(dialog.task_id, quadrant.name, dialog.value, target.task_layout.count())
+
+    def search_palette(self, text: str):
+        """Palette rows for text from the in-memory index; no SQL per keystroke"""
+        labels = dict(zip(QUADRANT_NAMES, self.quadrant_names))
+        rows = []
+        for task_id in self.search_index.search(text, PALETTE_RESULTS):
+            quadrant = self.find_task_quadrant(task_id)
+            if quadrant:
+                description = quadrant.find_task_widget(task_id).description
+                rows.append((task_id, f"{description}    ({labels[quadrant.name]})"))
+        return rows
+
+    def find_task_quadrant(self, task_id: str):
+        for quadrant in self.quadrants.values():
+            if quadrant.find_task_widget(task_id):
+                return quadrant
+        return None
+
+    def goto_task(self, task_id: str):
+        quadrant = self.find_task_quadrant(task_id)
+        widget = quadrant.find_task_widget(task_id)
+        quadrant.scroll.ensureWidgetVisible(widget)
+        quadrant.set_selection({task_id})
+        quadrant.selection_anchor = task_id
+        widget.setFocus()
 
     def move_task(self, task_id: str, source_quadrant: str, target_quadrant: str, target_index: int):
         try:
             # Update the database
-            self.db.move_task(task_id, target_quadrant)
+            with self.db.journal("Move task"):
+                self.db.move_task(task_id, target_quadrant)
             
             # Update the UI
-            # First, find and remove the task widget from the source quadrant
             source = self.quadrants[source_quadrant]
             target = self.quadrants[target_quadrant]
             
-            task_widget = None
-            for i in range(source.task_layout.count() - 1):
-                widget = source.task_layout.itemAt(i).widget()
-                if widget and widget.task_id == task_id:
-                    task_widget = widget
-                    source.task_layout.removeWidget(widget)
-                    break
-            
+            task_widget = source.take_task_widget(task_id)
             if task_widget:
-                # Update the task's quadrant name
-                task_widget.quadrant_name = target_quadrant
                 # Add it to the target quadrant at the specified index
-                target.task_layout.insertWidget(target_index, task_widget)
+                target.insert_task_widget(task_widget, target_index)
                 
         except Exception as e:
             print(f"Error moving task: {e}") 
@@ -264,7 +975,7 @@ class EisenhowerMatrixApp(QMainWindow):
         )
         if filepath:
             try:
-                saved_path = self.data_manager.export_to_json(filepath)
+                saved_path = self.data_manager.export_to_json(filepath, self.ask_include_notes())
                 QMessageBox.information(self, "Success", f"Tasks exported to:\n{saved_path}")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to export tasks: {str(e)}")
@@ -275,20 +986,78 @@ class EisenhowerMatrixApp(QMainWindow):
         )
         if filepath:
             try:
-                saved_path = self.data_manager.export_to_csv(filepath)
+                saved_path = self.data_manager.export_to_csv(filepath, self.ask_include_notes())
                 QMessageBox.information(self, "Success", f"Tasks exported to:\n{saved_path}")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to export tasks: {str(e)}")
 
+    def ask_include_notes(self) -> bool:
+        """Notes can be large, so full exports only carry them when asked to"""
+        if not self.db.has_notes():
+            return False
+        answer = QMessageBox.question(self, "Export Tasks", "Include task notes in the export?",
+                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        return answer == QMessageBox.Yes
+
+    def export_delta_json(self):
+        filepath, _ = QFileDialog.getSaveFileName(
+            self, "Export Changed Tasks", "", "JSON Files (*.json)"
+        )
+        if filepath:
+            try:
+                saved_path = self.data_manager.export_delta_json(filepath)
+                QMessageBox.information(self, "Success", f"Changes exported to:\n{saved_path}")
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to export changes: {str(e)}")
+
+    def export_delta_csv(self):
+        filepath, _ = QFileDialog.getSaveFileName(
+            self, "Export Changed Tasks", "", "CSV Files (*.csv)"
+        )
+        if filepath:
+            try:
+                saved_path = self.data_manager.export_delta_csv(filepath)
+                QMessageBox.information(self, "Success", f"Changes exported to:\n{saved_path}")
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to export changes: {str(e)}")
+
+    def ask_import_mode(self):
+        """True to merge into the current tasks, False to replace them, None to cancel"""
+        box = QMessageBox(self)
+        box.setWindowTitle("Import Tasks")
+        box.setText("Merge the file into your current tasks, or replace all tasks with it?")
+        merge_button = box.addButton("Merge", QMessageBox.AcceptRole)
+        replace_button = box.addButton("Replace", QMessageBox.DestructiveRole)
+        box.addButton(QMessageBox.Cancel)
+        box.exec_()
+        if box.clickedButton() == merge_button:
+            return True
+        if box.clickedButton() == replace_button:
+            return False
+        return None
+
+    def run_import(self, import_file):
+        """Run an import as one transaction and one undo step; a failed import changes nothing"""
+        try:
+            with self.db.batch(), self.db.journal("Import tasks"):
+                return import_file()
+        except sqlite3.OperationalError as e:
+            return False, f"The database is busy, please try again: {e}"
+
     def import_from_json(self):
         filepath, _ = QFileDialog.getOpenFileName(
             self, "Import Tasks", "", "JSON Files (*.json)"
         )
         if filepath:
-            success, message = self.data_manager.import_from_json(filepath)
+            merge = self.ask_import_mode()
+            if merge is None:
+                return
+            success, message = self.run_import(
+                lambda: self.data_manager.import_from_json(filepath, merge=merge)
+            )
             if success:
                 QMessageBox.information(self, "Success", message)
-                self.load_tasks()  # Refresh the UI
+                self.refresh_tasks()  # Reconcile the UI with the imported rows
             else:
                 QMessageBox.critical(self, "Error", message)
 
@@ -297,15 +1066,68 @@ class EisenhowerMatrixApp(QMainWindow):
             self, "Import Tasks", "", "CSV Files (*.csv)"
         )
         if filepath:
-            success, message = self.data_manager.import_from_csv(filepath)
+            merge = self.ask_import_mode()
+            if merge is None:
+                return
+            success, message = self.run_import(
+                lambda: self.data_manager.import_from_csv(filepath, merge=merge)
+            )
             if success:
                 QMessageBox.information(self, "Success", message)
-                self.load_tasks()  # Refresh the UI
+                self.refresh_tasks()  # Reconcile the UI with the imported rows
             else:
                 QMessageBox.critical(self, "Error", message)
 
+    def import_batch(self):
+        filepaths, _ = QFileDialog.getOpenFileNames(
+            self, "Merge Task Files", "", "Task Exports (*.json *.csv)"
+        )
+        if not filepaths or self.board.importer is not None:
+            return
+        self.flush_pending_writes()
+        # Later files win, so the newest export of a task is applied last
+        filepaths.sort(key=os.path.getmtime)
+        board = self.board
+        progress = QProgressDialog(f"Merging {len(filepaths)} files...", "Stop", 0, 0, self)
+        progress.setWindowModality(Qt.ApplicationModal)
+        progress.setMinimumDuration(0)
+        # Every chunk commits on its own, but the whole merge is one undo step
+        journal = ExitStack()
+        journal.enter_context(board.db.journal("Merge task files"))
+        board.importer = board.data_manager.import_batch_steps(filepaths)
+        self.import_next_chunk(board, board.importer, journal, progress)
+
+    def import_next_chunk(self, board: Board, importer, journal: ExitStack, progress: QProgressDialog):
+        """Write one chunk of a batch merge, then yield to the event loop so the window stays live"""
+        if importer is not board.importer:
+            return  # the board was closed
+        if progress.wasCanceled():
+            importer.close()
+            result = False, "Merge stopped; the tasks written so far can be undone"
+        else:
+            try:
+                result = next(importer)
+            except Exception as e:
+                result = False, f"Error importing data: {e}"
+            if result is None:
+                QTimer.singleShot(0, lambda: self.import_next_chunk(board, importer, journal, progress))
+                return
+        board.importer = None
+        journal.close()
+        progress.close()
+        success, message = result
+        if board is self.board:
+            self.refresh_tasks()
+        if success:
+            QMessageBox.information(self, "Success", message)
+        else:
+            QMessageBox.critical(self, "Error", message)
+
     def quit_application(self):
-        self.db.conn.close()  # Close database connection
+        self.flush_pending_writes()
+        self.settings_timer.stop()
+        self.settings_manager.flush()
+        self.boards.clear()  # Stops reminders and closes every open board's database
         QApplication.quit()  # Quit the application 
 
     def toggle_visibility(self):
@@ -316,5 +1138,6 @@ class EisenhowerMatrixApp(QMainWindow):
 
     def show_statistics(self):
         from .dialogs.statistics_dialog import StatisticsDialog
+        self.flush_pending_writes()
         dialog = StatisticsDialog(self)
         dialog.exec_() 
\ No newline at end of file
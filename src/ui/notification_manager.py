@@ -0,0 +1,89 @@
+from datetime import datetime, timezone
+from typing import Iterable
+
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtWidgets import QSystemTrayIcon
+
+from src.utils.constants import REMINDER_MAX_WAIT_MS, TIME_FORMAT
+from src.utils.reminder_scheduler import ReminderScheduler
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).strftime(TIME_FORMAT)
+
+
+class NotificationManager(QObject):
+    """Shows tray reminders using one single-shot timer armed for the earliest one"""
+
+    def __init__(self, db, tray_icon: QSystemTrayIcon, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.tray_icon = tray_icon
+        self.scheduler = ReminderScheduler(db.get_upcoming_reminders)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.fire_due)
+
+    def start(self):
+        self.scheduler.load()
+        # Reminders missed while the app was closed fire right away
+        self.arm()
+
+    def stop(self):
+        self.timer.stop()
+
+    def reload(self):
+        """Re-read the window after bulk changes such as imports or a restore"""
+        self.scheduler.load()
+        self.arm()
+
+    def update_tasks(self, task_ids: Iterable[str]):
+        """Pick up new, changed, completed or deleted reminders of these tasks"""
+        task_ids = list(task_ids)
+        reminders = self.db.get_reminders(task_ids)
+        for task_id in task_ids:
+            self.scheduler.update(task_id, reminders.get(task_id))
+        self.arm()
+
+    def arm(self):
+        while True:
+            next_time = self.scheduler.next_time()
+            if next_time is None:
+                self.timer.stop()
+                return
+            try:
+                due = datetime.strptime(next_time, TIME_FORMAT).replace(tzinfo=timezone.utc)
+                break
+            except ValueError:
+                # Written before times were validated; it could never fire, so drop it
+                task_ids = self.scheduler.pop_due(next_time)
+                print(f"Skipping unreadable reminder time {next_time!r} of {len(task_ids)} task(s)")
+                if not self.db.clear_reminders(task_ids):
+                    self.timer.stop()
+                    return
+        delay_ms = (due - datetime.now(timezone.utc)).total_seconds() * 1000
+        self.timer.start(int(min(max(delay_ms, 0), REMINDER_MAX_WAIT_MS)))
+
+    def fire_due(self):
+        now = utc_now()
+        due = []
+        while True:
+            # Refills the window if every loaded reminder was due
+            next_time = self.scheduler.next_time()
+            if next_time is None or next_time > now:
+                break
+            task_ids = self.scheduler.pop_due(now)
+            due.extend(task_ids)
+            if not self.db.clear_reminders(task_ids):
+                break
+        if due:
+            self.show_reminders(due)
+        self.arm()
+
+    def show_reminders(self, task_ids):
+        states = self.db.get_task_states(task_ids)
+        descriptions = [states[task_id][1] for task_id in task_ids if task_id in states]
+        if not descriptions:
+            return
+        title = "Reminder" if len(descriptions) == 1 else f"{len(descriptions)} Reminders"
+        self.tray_icon.showMessage(title, "\n".join(descriptions[:5]), QSystemTrayIcon.Information)
@@ -1,12 +1,14 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QScrollArea, 
-                            QLineEdit, QApplication, QColorDialog)
-from PyQt5.QtCore import Qt
-from src.utils.constants import QUADRANT_MARGINS, TASK_SPACING
+                            QLineEdit, QApplication, QColorDialog, QPushButton, QMenu)
+from PyQt5.QtCore import Qt, QTimer
+from src.utils.constants import QUADRANT_MARGINS, TASK_SPACING, COMPLETED_PAGE_SIZE, SORT_MODES
 from .task_widget import TaskWidget
 
 class QuadrantWidget(QWidget):
     def __init__(self, name: str, on_add_task, on_task_status_change, 
-                 on_task_delete, on_task_edit, on_task_move):
+                 on_task_delete, on_task_edit, on_task_move, on_load_completed=None,
+                 on_query_view=None, on_task_tags=None, on_task_due=None, on_bulk_action=None,
+                 on_task_notes=None):
         super().__init__()
         self.name = name
         self.on_add_task = on_add_task
@@ -14,25 +16,86 @@ class QuadrantWidget(QWidget):
         self.on_task_delete = on_task_delete
         self.on_task_edit = on_task_edit
         self.on_task_move = on_task_move
+        self.on_load_completed = on_load_completed
+        self.on_query_view = on_query_view
+        self.on_task_tags = on_task_tags
+        self.on_task_due = on_task_due
+        # on_bulk_action(action, task_ids, value) applies a menu action to the whole selection
+        self.on_bulk_action = on_bulk_action
+        self.on_task_notes = on_task_notes
+        # Sort and filter state, evaluated by the database
+        self.sort_mode = 'manual'
+        self.hide_done = False
+        self.filter_text = ''
+        # Ids hidden by the sort/filter view, and the tag filter (None = off)
+        self.view_hidden = set()
+        self.tag_filter_ids = None
+        # Optional callable returning the tags of a task, for tooltips
+        self.tag_lookup = None
+        # Optional callable returning (quadrant, label) pairs for "Move to"
+        self.move_targets = None
+        # Multi-selection (Ctrl/Shift+click); the anchor is where Shift ranges start
+        self.selected = set()
+        self.selection_anchor = None
+        # Active tasks live in task_layout, lazily loaded completed ones below it
+        self.task_widgets = {}
+        self.completed_widgets = {}
+        self.completed_total = 0
+        self.completed_offset = 0
+        self.completed_expanded = False
         self.setup_ui()
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
         layout.setSpacing(2)
         
-        # Title
+        # Title, right-click for sort and filter options
         title = QLabel(self.name)
         title.setAlignment(Qt.AlignCenter)
+        title.setContextMenuPolicy(Qt.CustomContextMenu)
+        title.customContextMenuRequested.connect(
+            lambda pos: self.show_view_menu(title.mapToGlobal(pos))
+        )
         layout.addWidget(title)
+
+        # Text filter (hidden until requested)
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter...")
+        self.filter_input.setClearButtonEnabled(True)
+        self.filter_input.hide()
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(150)
+        self.filter_timer.timeout.connect(self.apply_filter_text)
+        self.filter_input.textChanged.connect(self.filter_timer.start)
+        layout.addWidget(self.filter_input)
         
         # Scrollable task area
         self.scroll = QScrollArea()
         self.scroll.setWidgetResizable(True)
         self.task_container = QWidget()
-        self.task_layout = QVBoxLayout(self.task_container)
+        container_layout = QVBoxLayout(self.task_container)
+        container_layout.setSpacing(2)
+        self.task_layout = QVBoxLayout()
         self.task_layout.setSpacing(2)
-        self.task_layout.addStretch()
+        container_layout.addLayout(self.task_layout)
+
+        # Collapsed "Completed" section, filled page by page when opened
+        self.completed_toggle = QPushButton()
+        self.completed_toggle.setFlat(True)
+        self.completed_toggle.clicked.connect(self.toggle_completed)
+        self.completed_toggle.hide()
+        container_layout.addWidget(self.completed_toggle)
+        self.completed_container = QWidget()
+        self.completed_layout = QVBoxLayout(self.completed_container)
+        self.completed_layout.setContentsMargins(0, 0, 0, 0)
+        self.completed_layout.setSpacing(2)
+        self.completed_container.hide()
+        container_layout.addWidget(self.completed_container)
+        container_layout.addStretch()
+
         self.scroll.setWidget(self.task_container)
+        self.scroll.verticalScrollBar().valueChanged.connect(self.on_scroll)
         layout.addWidget(self.scroll)
 
         # Enable drops
@@ -49,7 +112,16 @@ class QuadrantWidget(QWidget):
 
     def dropEvent(self, event):
         task_data = event.mimeData().text().split('|')
-        if len(task_data) == 2:
+        if len(task_data) == 2 and ',' in task_data[0]:
+            # A dragged selection
+            task_ids, source_quadrant = task_data[0].split(','), task_data[1]
+            if source_quadrant != self.name:
+                if self.on_bulk_action:
+                    self.on_bulk_action('move', task_ids, self.name)
+            else:
+                self.reorder_tasks(task_ids, self.get_drop_index(event.pos()))
+            event.acceptProposedAction()
+        elif len(task_data) == 2:
             task_id, source_quadrant = task_data
             
             # Get the target position
@@ -60,7 +132,7 @@ class QuadrantWidget(QWidget):
             if source_quadrant == self.name:
                 # Find current index of the task
                 current_index = -1
-                for i in range(self.task_layout.count() - 1):
+                for i in range(self.task_layout.count()):
                     widget = self.task_layout.itemAt(i).widget()
                     if widget and widget.task_id == task_id:
                         current_index = i
@@ -82,8 +154,8 @@ class QuadrantWidget(QWidget):
         # Convert position to task container coordinates
         container_pos = self.task_container.mapFrom(self, y_pos)
         
-        # Get the number of tasks (excluding stretch)
-        task_count = self.task_layout.count() - 1
+        # Get the number of active tasks
+        task_count = self.task_layout.count()
         
         for i in range(task_count):
             widget = self.task_layout.itemAt(i).widget()
@@ -92,7 +164,7 @@ class QuadrantWidget(QWidget):
                 if container_pos.y() < widget_bottom:
                     return i
         
-        # If we're below all widgets, return the last position before stretch
+        # If we're below all widgets, return the last position
         return task_count
 
     def reorder_task(self, task_id, new_index):
@@ -100,7 +172,7 @@ class QuadrantWidget(QWidget):
         task_widget = None
         current_index = -1
         
-        for i in range(self.task_layout.count() - 1):
+        for i in range(self.task_layout.count()):
             widget = self.task_layout.itemAt(i).widget()
             if widget and widget.task_id == task_id:
                 task_widget = widget
@@ -112,6 +184,22 @@ class QuadrantWidget(QWidget):
             self.task_layout.removeWidget(task_widget)
             self.task_layout.insertWidget(new_index, task_widget)
 
+    def reorder_tasks(self, task_ids, new_index):
+        """Move several tasks of this quadrant as one block, keeping their order"""
+        block = [self.task_widgets[task_id] for task_id in self.task_order() if task_id in task_ids
+                 and task_id in self.task_widgets]
+        for widget in block:
+            if self.task_layout.indexOf(widget) < new_index:
+                new_index -= 1
+            self.task_layout.removeWidget(widget)
+        for offset, widget in enumerate(block):
+            self.task_layout.insertWidget(new_index + offset, widget)
+
+    def mousePressEvent(self, event):
+        # Clicking the empty part of the quadrant drops the selection
+        self.clear_selection()
+        super().mousePressEvent(event)
+
     def mouseDoubleClickEvent(self, event):
         task_input = QLineEdit()
         task_input.setPlaceholderText("Enter task...")
@@ -119,7 +207,7 @@ class QuadrantWidget(QWidget):
         task_input.returnPressed.connect(
             lambda: self.handle_new_task(task_input)
         )
-        self.task_layout.insertWidget(self.task_layout.count() - 1, task_input)
+        self.task_layout.addWidget(task_input)
         task_input.setFocus()
 
     def handle_new_task(self, input_field):
@@ -128,14 +216,294 @@ class QuadrantWidget(QWidget):
             input_field.deleteLater()
             self.on_add_task(self.name, description)
 
-    def add_task_widget(self, task_id: str, description: str, done: bool):
+    def create_task_widget(self, task_id: str, description: str, done: bool):
         task = TaskWidget(task_id, description, done, self.name)
-        task.done_checkbox.stateChanged.connect(
-            lambda state: self.on_task_status_change(task_id, state)
-        )
+        # TaskWidget already listens to its checkbox and reports (task_id, done)
+        task.on_task_status_change = self.on_task_status_change
         task.on_delete = self.on_task_delete
         task.on_edit = self.on_task_edit
-        self.task_layout.insertWidget(self.task_layout.count() - 1, task)
+        if self.on_task_tags:
+            task.on_edit_tags = self.on_task_tags
+        if self.on_task_due:
+            task.on_edit_due = self.on_task_due
+        if self.on_task_notes:
+            task.on_edit_notes = self.on_task_notes
+        if self.on_bulk_action:
+            task.on_select = self.select_task
+            task.on_selection_menu = self.show_selection_menu
+            task.on_drag_ids = self.drag_task_ids
+        if self.tag_lookup:
+            task.set_tags(self.tag_lookup(task_id))
+        return task
+
+    def add_task_widget(self, task_id: str, description: str, done: bool):
+        task = self.create_task_widget(task_id, description, done)
+        if self.tag_filter_ids is not None and task_id not in self.tag_filter_ids:
+            task.hide()
+        self.task_layout.addWidget(task)
+        self.task_widgets[task_id] = task
+
+    def add_task_widgets(self, rows):
+        """Add a chunk of (id, description, done) rows with a single relayout"""
+        self.task_container.setUpdatesEnabled(False)
+        for task_id, description, done in rows:
+            self.add_task_widget(task_id, description, done)
+        self.task_container.setUpdatesEnabled(True)
+
+    def displayed_task_ids(self):
+        return list(self.task_widgets) + list(self.completed_widgets)
+
+    def has_custom_view(self) -> bool:
+        return self.sort_mode != 'manual' or self.hide_done or bool(self.filter_text)
+
+    def find_task_widget(self, task_id: str):
+        return self.task_widgets.get(task_id) or self.completed_widgets.get(task_id)
+
+    def take_task_widget(self, task_id: str):
+        """Detach a task widget from either section without deleting it"""
+        if task_id in self.selected:
+            self.set_selection(self.selected - {task_id})
+        widget = self.task_widgets.pop(task_id, None)
+        if widget:
+            self.task_layout.removeWidget(widget)
+            return widget
+        widget = self.completed_widgets.pop(task_id, None)
+        if widget:
+            self.completed_layout.removeWidget(widget)
+        return widget
+
+    def insert_task_widget(self, widget, index: int):
+        widget.quadrant_name = self.name
+        self.task_layout.insertWidget(index, widget)
+        self.task_widgets[widget.task_id] = widget
+
+    def remove_task_widget(self, task_id: str):
+        widget = self.take_task_widget(task_id)
+        if widget:
+            widget.deleteLater()
+
+    def task_order(self):
+        """Ids of the task widgets as laid out, active section first"""
+        order = []
+        for layout in (self.task_layout, self.completed_layout):
+            for i in range(layout.count()):
+                task_id = getattr(layout.itemAt(i).widget(), 'task_id', None)
+                if task_id is not None:
+                    order.append(task_id)
+        return order
+
+    def select_task(self, task_id: str, modifiers):
+        if modifiers & Qt.ShiftModifier and self.selection_anchor is not None:
+            order = [task_id for task_id in self.task_order() if self.is_task_visible(task_id)]
+            if task_id in order and self.selection_anchor in order:
+                start, end = sorted((order.index(self.selection_anchor), order.index(task_id)))
+                self.set_selection(self.selected | set(order[start:end + 1]))
+                return
+        if modifiers & (Qt.ControlModifier | Qt.ShiftModifier):
+            self.set_selection(self.selected ^ {task_id})
+            self.selection_anchor = task_id
+        elif task_id not in self.selected:
+            # A plain click on a selected task keeps the selection so it can be dragged
+            self.clear_selection()
+            self.selection_anchor = task_id
+
+    def set_selection(self, task_ids):
+        for task_id in self.selected - task_ids:
+            widget = self.find_task_widget(task_id)
+            if widget:
+                widget.set_selected(False)
+        for task_id in task_ids - self.selected:
+            widget = self.find_task_widget(task_id)
+            if widget:
+                widget.set_selected(True)
+        self.selected = set(task_ids)
+
+    def clear_selection(self):
+        self.set_selection(set())
+        self.selection_anchor = None
+
+    def selected_task_ids(self):
+        return [task_id for task_id in self.task_order() if task_id in self.selected]
+
+    def drag_task_ids(self, task_id: str):
+        return self.selected_task_ids() if task_id in self.selected else [task_id]
+
+    def show_selection_menu(self, task_id: str, global_pos) -> bool:
+        """Context menu for a multi-selection; False lets the task show its own menu"""
+        if task_id not in self.selected or len(self.selected) < 2:
+            return False
+        task_ids = self.selected_task_ids()
+        count = len(task_ids)
+        menu = QMenu()
+        complete_action = menu.addAction(f"Complete {count} Tasks")
+        reopen_action = menu.addAction(f"Reopen {count} Tasks")
+        move_menu = menu.addMenu("Move to")
+        move_actions = {}
+        for quadrant, label in (self.move_targets() if self.move_targets else []):
+            if quadrant != self.name:
+                move_actions[move_menu.addAction(label)] = quadrant
+        add_tags_action = menu.addAction("Add Tags...")
+        remove_tags_action = menu.addAction("Remove Tags...")
+        delete_action = menu.addAction(f"Delete {count} Tasks")
+        menu.addSeparator()
+        clear_action = menu.addAction("Clear Selection")
+
+        action = menu.exec_(global_pos)
+        if action is None:
+            return True
+        if action == clear_action:
+            self.clear_selection()
+            return True
+        actions = {
+            complete_action: ('complete', None),
+            reopen_action: ('reopen', None),
+            add_tags_action: ('add_tags', None),
+            remove_tags_action: ('remove_tags', None),
+            delete_action: ('delete', None),
+        }
+        actions.update({move_action: ('move', quadrant) for move_action, quadrant in move_actions.items()})
+        if action in actions:
+            self.clear_selection()
+            self.on_bulk_action(actions[action][0], task_ids, actions[action][1])
+        return True
+
+    def set_completed_count(self, count: int):
+        self.completed_total = count
+        self.update_completed_toggle()
+
+    def update_completed_toggle(self):
+        arrow = "▾" if self.completed_expanded else "▸"
+        self.completed_toggle.setText(f"{arrow} Completed ({self.completed_total})")
+        self.completed_toggle.setVisible(self.completed_total > 0 and not self.hide_done)
+        self.completed_container.setVisible(self.completed_expanded and not self.hide_done)
+
+    def show_view_menu(self, global_pos):
+        menu = QMenu()
+        sort_actions = {}
+        for mode, label in SORT_MODES.items():
+            action = menu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(mode == self.sort_mode)
+            sort_actions[action] = mode
+        menu.addSeparator()
+        hide_action = menu.addAction("Hide Completed")
+        hide_action.setCheckable(True)
+        hide_action.setChecked(self.hide_done)
+        filter_action = menu.addAction("Filter...")
+
+        action = menu.exec_(global_pos)
+        if action in sort_actions:
+            self.sort_mode = sort_actions[action]
+            self.apply_view()
+        elif action == hide_action:
+            self.hide_done = hide_action.isChecked()
+            self.apply_view()
+        elif action == filter_action:
+            self.filter_input.show()
+            self.filter_input.setFocus()
+
+    def apply_filter_text(self):
+        text = self.filter_input.text().strip()
+        if text != self.filter_text:
+            self.filter_text = text
+            self.apply_view()
+        if not text and not self.filter_input.hasFocus():
+            self.filter_input.hide()
+
+    def matches_view(self, widget) -> bool:
+        """Visibility of a widget the database query did not return (ticked this session)"""
+        if not widget.done_checkbox.isChecked() or self.hide_done:
+            return False
+        return self.filter_text.lower() in widget.description.lower()
+
+    def apply_view(self):
+        """Re-order and filter the existing task widgets from one indexed query"""
+        if not self.on_query_view:
+            return
+        ordered_ids, completed_count = self.on_query_view(self.name, self.sort_mode, self.filter_text)
+
+        self.task_container.setUpdatesEnabled(False)
+        # Detach everything from the end (O(1) per item), then re-add in order
+        others = []
+        while self.task_layout.count():
+            widget = self.task_layout.takeAt(self.task_layout.count() - 1).widget()
+            # Keep non-task widgets such as an open "Enter task..." input
+            if widget is not None and getattr(widget, 'task_id', None) not in self.task_widgets:
+                others.append(widget)
+        placed = set()
+        for task_id in ordered_ids:
+            widget = self.task_widgets.get(task_id)
+            if widget:
+                self.task_layout.addWidget(widget)
+                placed.add(task_id)
+        self.view_hidden = set()
+        for task_id, widget in self.task_widgets.items():
+            if task_id not in placed:
+                self.task_layout.addWidget(widget)
+                if not self.matches_view(widget):
+                    self.view_hidden.add(task_id)
+        self.refresh_visibility()
+        for widget in reversed(others):
+            self.task_layout.addWidget(widget)
+
+        # The completed section is re-fetched with the new order and filter
+        for widget in self.completed_widgets.values():
+            self.completed_layout.removeWidget(widget)
+            widget.deleteLater()
+        self.completed_widgets.clear()
+        self.completed_offset = 0
+        self.set_completed_count(completed_count)
+        if self.completed_expanded and not self.hide_done:
+            self.load_completed_page()
+        self.task_container.setUpdatesEnabled(True)
+
+    def toggle_completed(self):
+        self.completed_expanded = not self.completed_expanded
+        self.completed_container.setVisible(self.completed_expanded)
+        self.update_completed_toggle()
+        if self.completed_expanded and self.completed_offset == 0:
+            self.load_completed_page()
+
+    def on_scroll(self, value):
+        # Fetch the next page once the user scrolls near the end of the section
+        if self.completed_expanded and value >= self.scroll.verticalScrollBar().maximum() - 20:
+            self.load_completed_page()
+
+    def is_task_visible(self, task_id: str) -> bool:
+        if task_id in self.view_hidden:
+            return False
+        return self.tag_filter_ids is None or task_id in self.tag_filter_ids
+
+    def refresh_visibility(self):
+        for task_id, widget in self.task_widgets.items():
+            widget.setVisible(self.is_task_visible(task_id))
+        for task_id, widget in self.completed_widgets.items():
+            widget.setVisible(self.is_task_visible(task_id))
+
+    def set_tag_filter(self, task_ids):
+        """Show only tasks in task_ids; None clears the tag filter"""
+        self.tag_filter_ids = task_ids
+        self.task_container.setUpdatesEnabled(False)
+        self.refresh_visibility()
+        self.task_container.setUpdatesEnabled(True)
+
+    def load_completed_page(self):
+        if not self.on_load_completed or self.completed_offset >= self.completed_total:
+            return
+        rows = self.on_load_completed(
+            self.name, self.completed_offset, COMPLETED_PAGE_SIZE, self.sort_mode, self.filter_text
+        )
+        self.completed_offset += COMPLETED_PAGE_SIZE
+        if not rows:
+            self.completed_offset = self.completed_total
+        for task_id, description, done in rows:
+            # Tasks ticked off this session are still shown in the active list
+            if task_id in self.task_widgets or task_id in self.completed_widgets:
+                continue
+            task = self.create_task_widget(task_id, description, done)
+            task.setVisible(self.is_task_visible(task_id))
+            self.completed_layout.addWidget(task)
+            self.completed_widgets[task_id] = task
 
     def change_color(self):
         color = QColorDialog.getColor()
@@ -2,7 +2,7 @@ from PyQt5.QtWidgets import (QWidget, QHBoxLayout, QLabel, QCheckBox,
                             QSizePolicy, QMenu, QLineEdit, QApplication, QPushButton)
 from PyQt5.QtCore import Qt, QMimeData
 from PyQt5.QtGui import QDrag, QPixmap, QPainter
-from src.utils.constants import TASK_LABEL_STYLE, TASK_MARGINS
+from src.utils.constants import TASK_LABEL_STYLE, TASK_MARGINS, SELECTED_TASK_STYLE
 
 class TaskWidget(QWidget):
     def __init__(self, task_id: str, description: str, done: bool, quadrant_name: str):
@@ -11,6 +11,7 @@ class TaskWidget(QWidget):
         self.quadrant_name = quadrant_name
         self.description = description
         self.editing = False
+        self.selected = False
         self.setup_ui(description, done)
         
         # Enable mouse tracking for drag and drop
@@ -48,8 +49,14 @@ class TaskWidget(QWidget):
 
 
     def show_context_menu(self, position):
+        # Right-clicking a task of a multi-selection acts on the whole selection
+        if hasattr(self, 'on_selection_menu') and self.on_selection_menu(self.task_id, self.mapToGlobal(position)):
+            return
         menu = QMenu()
         edit_action = menu.addAction("Edit Task")
+        tags_action = menu.addAction("Edit Tags...") if hasattr(self, 'on_edit_tags') else None
+        due_action = menu.addAction("Set Due Date...") if hasattr(self, 'on_edit_due') else None
+        notes_action = menu.addAction("Notes...") if hasattr(self, 'on_edit_notes') else None
         delete_action = menu.addAction("Delete Task")
         
         action = menu.exec_(self.mapToGlobal(position))
@@ -57,6 +64,31 @@ class TaskWidget(QWidget):
             self.on_delete(self.task_id)
         elif action == edit_action:
             self.start_editing()
+        elif tags_action and action == tags_action:
+            self.on_edit_tags(self.task_id)
+        elif due_action and action == due_action:
+            self.on_edit_due(self.task_id)
+        elif notes_action and action == notes_action:
+            self.on_edit_notes(self.task_id)
+
+    def update_state(self, description: str, done: bool):
+        """Apply externally changed values without firing the edit/status callbacks"""
+        if description != self.description and not self.editing:
+            self.description = description
+            self.task_label.setText(description)
+            self.edit_input.setText(description)
+        if self.done_checkbox.isChecked() != done:
+            self.done_checkbox.blockSignals(True)
+            self.done_checkbox.setChecked(done)
+            self.done_checkbox.blockSignals(False)
+
+    def set_selected(self, selected: bool):
+        if selected != self.selected:
+            self.selected = selected
+            self.task_label.setStyleSheet(TASK_LABEL_STYLE + (SELECTED_TASK_STYLE if selected else ""))
+
+    def set_tags(self, tags):
+        self.setToolTip(f"Tags: {', '.join(tags)}" if tags else "")
 
     def start_editing(self):
         self.editing = True
@@ -81,6 +113,9 @@ class TaskWidget(QWidget):
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self.drag_start_position = event.pos()
+            # Ctrl+click toggles, Shift+click extends the quadrant's selection
+            if hasattr(self, 'on_select'):
+                self.on_select(self.task_id, event.modifiers())
 
     def mouseMoveEvent(self, event):
         if not (event.buttons() & Qt.LeftButton):
@@ -94,8 +129,9 @@ class TaskWidget(QWidget):
 
         drag = QDrag(self)
         mime_data = QMimeData()
-        # Store both task ID and current quadrant name
-        mime_data.setText(f"{self.task_id}|{self.quadrant_name}")
+        # Store the task IDs (the whole selection when dragging a selected task) and current quadrant name
+        task_ids = self.on_drag_ids(self.task_id) if hasattr(self, 'on_drag_ids') else [self.task_id]
+        mime_data.setText(f"{','.join(task_ids)}|{self.quadrant_name}")
         drag.setMimeData(mime_data)
 
         # Create a pixmap of the task description for visual feedback
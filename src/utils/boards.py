@@ -0,0 +1,48 @@
+import re
+from pathlib import Path
+from typing import List, Optional
+
+from src.utils.constants import DEFAULT_BOARD
+
+
+class BoardRegistry:
+    """Board names and their database files, kept in the settings ('boards' section)"""
+
+    def __init__(self, settings_manager, boards_dir: Optional[Path] = None):
+        self.settings_manager = settings_manager
+        self.boards_dir = boards_dir or Path.home() / '.eisenhower_matrix' / 'boards'
+
+    def paths(self):
+        return self.settings_manager.get('boards.paths', {DEFAULT_BOARD: 'tasks.db'})
+
+    def names(self) -> List[str]:
+        return list(self.paths())
+
+    def path(self, name: str) -> Optional[str]:
+        return self.paths().get(name)
+
+    def current(self) -> str:
+        name = self.settings_manager.get('boards.current')
+        return name if name in self.paths() else DEFAULT_BOARD
+
+    def select(self, name: str):
+        self.settings_manager.set('boards.current', name)
+
+    def add(self, name: str) -> str:
+        """Register a new board with its own database file; returns the board name"""
+        name = name.strip()
+        if not name:
+            raise ValueError("Board name cannot be empty")
+        paths = dict(self.paths())
+        if name in paths:
+            raise ValueError(f"A board named '{name}' already exists")
+        slug = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'board'
+        taken = {Path(path).resolve() for path in paths.values()}
+        path, number = self.boards_dir / f"{slug}.db", 1
+        while path.exists() or path.resolve() in taken:
+            number += 1
+            path = self.boards_dir / f"{slug}-{number}.db"
+        self.boards_dir.mkdir(parents=True, exist_ok=True)
+        paths[name] = str(path)
+        self.settings_manager.set('boards.paths', paths)
+        return name
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, Dict, List
 
 WINDOW_TITLE = "Eisenhower Matrix Widget"
 WINDOW_SIZE = (400, 400)
@@ -42,6 +42,137 @@ STYLE_SHEET = """
 """
 
 TASK_LABEL_STYLE = "font-size: 11px; color: #FFFFFF;"
+# Added to the label of tasks in a multi-selection
+SELECTED_TASK_STYLE = "background-color: rgba(76, 175, 80, 110); border-radius: 3px;"
 QUADRANT_MARGINS = (5, 5, 5, 5)
 TASK_MARGINS = (5, 2, 5, 2)
-TASK_SPACING = 2 
\ No newline at end of file
+TASK_SPACING = 2
+
+# Startup streams active tasks into the quadrants: the first rows of every
+# quadrant (what is visible without scrolling) first, then chunks of the rest
+STARTUP_VIEWPORT_ROWS = 20
+LOAD_CHUNK_SIZE = 100
+
+# Completed tasks are fetched lazily, this many rows at a time
+COMPLETED_PAGE_SIZE = 50
+
+# Per-quadrant sort modes (key -> menu label); the ordering itself runs in SQL
+SORT_MODES: Dict[str, str] = {
+    "manual": "Manual Order",
+    "oldest": "Oldest First",
+    "newest": "Newest First",
+    "alpha": "Alphabetical",
+} 
+
+# SQLite performance profiles, selectable through the settings file
+# ('database' -> 'profile'), overridden by the EISENHOWER_DB_PROFILE environment
+# variable and by an explicit profile (cli.py --profile).
+DEFAULT_DB_PROFILE = "balanced"
+DB_PROFILE_ENV_VAR = "EISENHOWER_DB_PROFILE"
+
+# Delta exports re-send rows changed this many seconds before the previous
+# watermark, so rows committed just after an export snapshot are never missed
+DELTA_EXPORT_OVERLAP_SECONDS = 5
+# Tombstones are kept until every delta destination has seen them, at most this long
+TOMBSTONE_RETENTION_DAYS = 90
+
+# Batch imports: rows per write transaction, and how many such chunks may
+# wait between the parser processes and the single writer
+IMPORT_CHUNK_SIZE = 5000
+IMPORT_QUEUE_CHUNKS = 8
+# Longest the writer waits for the next parsed chunk before handing control
+# back to its caller, so the window's event loop keeps running
+IMPORT_POLL_MS = 50
+
+# Read-only snapshot connections used by exports, statistics and search
+READ_POOL_SIZE = 4
+
+# Task notes live out of line in task_notes; bodies of at least this many
+# bytes are stored zlib-compressed. Exports stream rows this many at a time
+NOTE_COMPRESS_MIN_BYTES = 512
+EXPORT_CHUNK_SIZE = 1000
+
+# Several app instances, cli.py and the API may share one database file.
+# SQLite waits this long for a lock; write batches then retry taking the
+# write lock with growing delays before giving up
+DB_BUSY_TIMEOUT_MS = 5000
+DB_LOCK_RETRIES = 4
+DB_LOCK_RETRY_DELAY_MS = 100
+
+# Local JSON API (python cli.py serve). Writes queue up and commit in groups
+API_HOST = "127.0.0.1"
+API_PORT = 8765
+API_MAX_BODY_BYTES = 1024 * 1024
+API_WRITE_BATCH_SIZE = 256      # operations per commit
+API_WRITE_QUEUE_SIZE = 1024     # pending write requests before clients wait
+
+# Due dates, reminders and series anchors are stored as UTC text in this format,
+# which also makes them sort and compare correctly as strings
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Reminders: only the next REMINDER_WINDOW are held in memory; the single
+# timer is re-armed at least this often to stay correct across sleep/clock changes
+REMINDER_WINDOW = 256
+REMINDER_MAX_WAIT_MS = 60 * 60 * 1000
+
+# Urgency promotion: tasks move from the key quadrant to the value quadrant
+# once their due date is closer than the configured lead time
+PROMOTION_RULES: Dict[str, str] = {
+    QUADRANT_NAMES[1]: QUADRANT_NAMES[0],
+    QUADRANT_NAMES[3]: QUADRANT_NAMES[2],
+}
+
+# Checkbox toggles and edits are merged for this long before one write per task
+WRITE_COALESCE_MS = 400
+
+# Settings changes are written to disk once they have been quiet this long
+SETTINGS_SAVE_DELAY_MS = 1000
+
+# Undo journal: the oldest operations are dropped past either limit (the newest is always kept)
+JOURNAL_MAX_ENTRIES = 200
+JOURNAL_MAX_BYTES = 32 * 1024 * 1024
+
+# Boards: every board is its own database; this many stay open (with their
+# quadrant views built) so switching back to a recent board is instant
+DEFAULT_BOARD = "Default"
+BOARD_CACHE_SIZE = 3
+
+# How often the app checks for commits made by other processes
+EXTERNAL_CHANGES_POLL_MS = 2000
+
+DB_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Every commit is fsynced; slowest, survives power loss.
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -2000,        # KiB when negative (2 MB)
+        "temp_store": "DEFAULT",
+        "cached_statements": 128,
+    },
+    # WAL + NORMAL: safe against application crashes, fsyncs on checkpoint.
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 64 * 1024 * 1024,
+        "cache_size": -16000,
+        "temp_store": "MEMORY",
+        "cached_statements": 256,
+    },
+    # No fsyncs at all; recent commits can be lost on an OS crash.
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+        "cached_statements": 512,
+    },
+}
+
+# Command palette (Ctrl+K): rows shown for a fuzzy search of the active tasks
+PALETTE_RESULTS = 20
+# A task matches a search when it shares this share of the query's trigrams;
+# at most SEARCH_MAX_CANDIDATES tasks are scored per keystroke
+SEARCH_MIN_SIMILARITY = 0.5
+SEARCH_MAX_CANDIDATES = 2000
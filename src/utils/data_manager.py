@@ -1,8 +1,118 @@
 import json
 import csv
+import hashlib
+import os
+import queue
+import sqlite3
+import threading
+import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+
+from .constants import QUADRANT_NAMES, IMPORT_CHUNK_SIZE, IMPORT_QUEUE_CHUNKS, IMPORT_POLL_MS, EXPORT_CHUNK_SIZE
+from .tag_index import normalize_tags
+
+
+def task_content_hash(task: Dict[str, Any]) -> str:
+    """Hash of the user-visible content of a task, used to skip unchanged rows"""
+    content = "\x1f".join([
+        task['quadrant'],
+        task['description'],
+        '1' if task['done'] else '0',
+        ';'.join(sorted(task.get('tags', [])))
+    ])
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _read_json_tasks(filepath) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Raw tasks and tombstoned ids of a JSON export"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if "tasks" not in data:
+        raise ValueError("Invalid file format: no tasks found")
+    tasks = [{
+        'id': task["id"],
+        'quadrant': task["quadrant"],
+        'description': task["description"],
+        'done': task["done"],
+        'tags': task.get("tags", []),
+        'notes': task.get("notes")
+    } for task in data["tasks"]]
+    return tasks, [tombstone["id"] for tombstone in data.get("deleted", [])]
+
+
+def _read_csv_tasks(filepath) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Raw tasks and tombstoned ids of a CSV export"""
+    tasks = []
+    deleted_ids = []
+    with open(filepath, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            # Tombstone rows written by delta exports
+            if row['Status'].lower() == 'deleted':
+                deleted_ids.append(row['ID'])
+                continue
+            tasks.append({
+                'id': row['ID'],
+                'quadrant': row['Quadrant'],
+                'description': row['Description'],
+                'done': row['Status'].lower() == 'done',
+                'tags': row.get('Tags') or '',
+                'notes': row.get('Notes')
+            })
+    return tasks, deleted_ids
+
+
+def _normalize_task(task: Dict[str, Any]):
+    """Validated, normalized copy of a raw task, or None if it cannot be imported"""
+    quadrant = (task.get('quadrant') or '').strip()
+    description = task.get('description')
+    if quadrant not in QUADRANT_NAMES or not isinstance(description, str) or not description.strip():
+        return None
+    done = task.get('done')
+    if isinstance(done, str):
+        done = done.strip().lower() in ('1', 'true', 'yes', 'done')
+    return {
+        'id': str(task.get('id') or '').strip() or str(uuid.uuid4()),
+        'quadrant': quadrant,
+        'description': description.strip(),
+        'done': bool(done),
+        'tags': normalize_tags(task.get('tags') or []),
+        'notes': _notes(task)
+    }
+
+
+def _notes(task: Dict[str, Any]):
+    """Notes of a raw task; None when the file does not carry notes, so existing ones are kept"""
+    notes = task.get('notes')
+    return notes if isinstance(notes, str) else None
+
+
+def _check(success: bool, op: str):
+    # DatabaseManager reports sqlite errors by returning False; raising rolls the batch back
+    if not success:
+        raise ValueError(f"Could not {op}")
+
+
+def parse_task_file(filepath: str) -> Dict[str, Any]:
+    """Read, validate and normalize one export file; runs in a worker process"""
+    result = {'path': filepath, 'tasks': [], 'deleted': [], 'invalid': 0, 'error': None}
+    try:
+        if filepath.lower().endswith('.csv'):
+            raw_tasks, result['deleted'] = _read_csv_tasks(filepath)
+        else:
+            raw_tasks, result['deleted'] = _read_json_tasks(filepath)
+        for raw in raw_tasks:
+            task = _normalize_task(raw)
+            if task is None:
+                result['invalid'] += 1
+            else:
+                result['tasks'].append(task)
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
 
 class DataManager:
     def __init__(self, db_manager):
@@ -10,99 +120,330 @@ class DataManager:
         self.export_dir = Path.home() / '.eisenhower_matrix' / 'exports'
         self.export_dir.mkdir(parents=True, exist_ok=True)
 
-    def export_to_json(self, filepath: str = None) -> str:
-        """Export all tasks to JSON format"""
-        tasks = self.db_manager.get_all_tasks()
-        export_data = {
-            "version": "1.0",
-            "exported_at": datetime.now().isoformat(),
-            "tasks": tasks
-        }
+    def export_to_json(self, filepath: str = None, include_notes: bool = False) -> str:
+        """Export all tasks to JSON format.
 
+        Tasks are streamed to the file one at a time, so notes never have to
+        fit in memory all at once.
+        """
         if not filepath:
             filepath = self.export_dir / f"eisenhower_matrix_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
 
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+            f.write('{\n')
+            f.write(f'  "version": "1.0",\n  "exported_at": {json.dumps(datetime.now().isoformat())},\n')
+            f.write('  "tasks": [')
+            separator = '\n    '
+            for task in self.db_manager.iter_tasks(include_notes, EXPORT_CHUNK_SIZE):
+                f.write(separator)
+                f.write(json.dumps(task, ensure_ascii=False))
+                separator = ',\n    '
+            f.write('\n  ]\n}\n')
 
         return str(filepath)
 
-    def import_from_json(self, filepath: str) -> tuple[bool, str]:
-        """Import tasks from JSON file"""
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            if "tasks" not in data:
-                return False, "Invalid file format: no tasks found"
+    def _delta_destination(self, kind: str, filepath) -> str:
+        """Watermarks are kept per export format and target folder"""
+        return f"{kind}:{Path(filepath).resolve().parent}"
 
-            # Clear existing tasks if import successful
-            self.db_manager.clear_all_tasks()
+    def export_delta_json(self, filepath: str = None) -> str:
+        """Export only tasks changed or deleted since the last delta export to the same folder"""
+        if not filepath:
+            filepath = self.export_dir / f"eisenhower_matrix_delta_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        destination = self._delta_destination('json', filepath)
+        since = self.db_manager.get_export_watermark(destination)
+        watermark, tasks, deleted = self.db_manager.get_changes_since(since)
+        export_data = {
+            "version": "1.1",
+            "exported_at": datetime.now().isoformat(),
+            "delta": True,
+            "since": since,
+            "tasks": tasks,
+            "deleted": deleted
+        }
 
-            # Import tasks
-            for task in data["tasks"]:
-                self.db_manager.add_task(
-                    task["id"],
-                    task["quadrant"],
-                    task["description"],
-                    task["done"]
-                )
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(export_data, f, indent=2, ensure_ascii=False)
 
-            return True, f"Successfully imported {len(data['tasks'])} tasks"
-        except Exception as e:
-            return False, f"Error importing data: {str(e)}"
+        self.db_manager.set_export_watermark(destination, watermark)
+        return str(filepath)
 
-    def export_to_csv(self, filepath: str = None) -> str:
-        """Export all tasks to CSV format"""
-        tasks = self.db_manager.get_all_tasks()
-        
+    def export_delta_csv(self, filepath: str = None) -> str:
+        """CSV delta export; deleted tasks appear as rows with status Deleted"""
         if not filepath:
-            filepath = self.export_dir / f"eisenhower_matrix_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            filepath = self.export_dir / f"eisenhower_matrix_delta_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        destination = self._delta_destination('csv', filepath)
+        since = self.db_manager.get_export_watermark(destination)
+        watermark, tasks, deleted = self.db_manager.get_changes_since(since)
 
         with open(filepath, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
-            # Write header
-            writer.writerow(['ID', 'Quadrant', 'Description', 'Status'])
-            # Write tasks
+            writer.writerow(['ID', 'Quadrant', 'Description', 'Status', 'Tags'])
             for task in tasks:
                 writer.writerow([
                     task['id'],
                     task['quadrant'],
                     task['description'],
-                    'Done' if task['done'] else 'Pending'
+                    'Done' if task['done'] else 'Pending',
+                    ';'.join(task['tags'])
                 ])
+            for tombstone in deleted:
+                writer.writerow([tombstone['id'], '', '', 'Deleted', ''])
 
+        self.db_manager.set_export_watermark(destination, watermark)
         return str(filepath)
 
-    def import_from_csv(self, filepath: str) -> tuple[bool, str]:
-        """Import tasks from CSV file"""
+    def import_from_json(self, filepath: str, merge: bool = False) -> tuple[bool, str]:
+        """Import tasks from JSON file, replacing all tasks or merging into them"""
         try:
-            tasks = []
-            with open(filepath, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    tasks.append({
-                        'id': row['ID'],
-                        'quadrant': row['Quadrant'],
-                        'description': row['Description'],
-                        'done': row['Status'].lower() == 'done'
-                    })
-
-            if not tasks:
-                return False, "No tasks found in CSV file"
+            raw_tasks, deleted_ids = _read_json_tasks(filepath)
+            tasks = [{
+                'id': task["id"],
+                'quadrant': task["quadrant"],
+                'description': task["description"],
+                'done': bool(task["done"]),
+                'tags': normalize_tags(task["tags"]),
+                'notes': _notes(task)
+            } for task in raw_tasks]
 
-            # Clear existing tasks if import successful
-            self.db_manager.clear_all_tasks()
+            if merge:
+                return True, self.merge_tasks(tasks, deleted_ids)
+            self.replace_tasks(tasks)
+            return True, f"Successfully imported {len(tasks)} tasks"
+        except json.JSONDecodeError as e:
+            return False, f"Error importing data: {str(e)}"
+        except ValueError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Error importing data: {str(e)}"
 
-            # Import tasks
-            for task in tasks:
-                self.db_manager.add_task(
+    def export_to_csv(self, filepath: str = None, include_notes: bool = False) -> str:
+        """Export all tasks to CSV format, streamed like export_to_json"""
+        if not filepath:
+            filepath = self.export_dir / f"eisenhower_matrix_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            # Write header
+            header = ['ID', 'Quadrant', 'Description', 'Status', 'Tags']
+            writer.writerow(header + ['Notes'] if include_notes else header)
+            # Write tasks
+            for task in self.db_manager.iter_tasks(include_notes, EXPORT_CHUNK_SIZE):
+                row = [
                     task['id'],
                     task['quadrant'],
                     task['description'],
-                    task['done']
-                )
+                    'Done' if task['done'] else 'Pending',
+                    ';'.join(task['tags'])
+                ]
+                writer.writerow(row + [task['notes']] if include_notes else row)
 
+        return str(filepath)
+
+    def import_from_csv(self, filepath: str, merge: bool = False) -> tuple[bool, str]:
+        """Import tasks from CSV file, replacing all tasks or merging into them"""
+        try:
+            raw_tasks, deleted_ids = _read_csv_tasks(filepath)
+            tasks = [dict(task, tags=normalize_tags(task['tags']), notes=_notes(task)) for task in raw_tasks]
+
+            if not tasks and not deleted_ids:
+                return False, "No tasks found in CSV file"
+
+            if merge:
+                return True, self.merge_tasks(tasks, deleted_ids)
+            self.replace_tasks(tasks)
             return True, f"Successfully imported {len(tasks)} tasks"
         except Exception as e:
-            return False, f"Error importing data: {str(e)}" 
\ No newline at end of file
+            return False, f"Error importing data: {str(e)}"
+
+    def replace_tasks(self, tasks: List[Dict[str, Any]]):
+        """Replace every stored task with tasks in one transaction; raises ValueError if a step fails"""
+        with self.db_manager.batch():
+            _check(self.db_manager.clear_all_tasks(), "clear the existing tasks")
+            _check(self.db_manager.insert_tasks(tasks), "insert the tasks")
+            _check(self.db_manager.set_tags_for_tasks(
+                {task['id']: task['tags'] for task in tasks if task['tags']}
+            ), "set the tags")
+            _check(self.db_manager.set_task_notes(
+                {task['id']: task['notes'] for task in tasks if task.get('notes')}
+            ), "set the notes")
+
+    def existing_hashes(self) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+        """Content hash of every stored task, plus the current tags"""
+        tags_by_task = self.db_manager.get_tags_by_task()
+        existing = {}
+        for task in self.db_manager.get_all_tasks():
+            task['tags'] = tags_by_task.get(task['id'], [])
+            existing[task['id']] = task_content_hash(task)
+        return existing, tags_by_task
+
+    def write_changed(self, tasks: List[Dict[str, Any]], existing: Dict[str, str],
+                      tags_by_task: Dict[str, List[str]]) -> Tuple[int, int, int]:
+        """Upsert the tasks whose hash differs from existing; returns (added, updated, unchanged).
+
+        The writes form one transaction (or join the caller's batch) and raise
+        ValueError if one fails. Only once they are in are existing and
+        tags_by_task updated, so consecutive calls see earlier writes.
+        """
+        # Later rows with the same id win, as they would with sequential writes
+        incoming = {task['id']: task for task in tasks}
+        changed = []
+        for task_id, task in incoming.items():
+            content_hash = task_content_hash(task)
+            if existing.get(task_id) != content_hash:
+                changed.append((task, content_hash))
+        added = sum(1 for task, _ in changed if task['id'] not in existing)
+
+        # Notes are not part of the content hash; files that carry them always set them
+        notes = {task_id: task['notes'] for task_id, task in incoming.items() if task.get('notes') is not None}
+
+        with self.db_manager.batch():
+            if changed:
+                _check(self.db_manager.upsert_tasks([task for task, _ in changed]), "write the tasks")
+                _check(self.db_manager.set_tags_for_tasks({
+                    task['id']: task['tags'] for task, _ in changed
+                    if sorted(task['tags']) != tags_by_task.get(task['id'], [])
+                }), "set the tags")
+            if notes:
+                _check(self.db_manager.set_task_notes(notes), "set the notes")
+        for task, content_hash in changed:
+            existing[task['id']] = content_hash
+            tags_by_task[task['id']] = sorted(task['tags'])
+        return added, len(changed) - added, len(incoming) - len(changed)
+
+    def merge_tasks(self, tasks: List[Dict[str, Any]], deleted_ids: List[str] = None) -> str:
+        """Upsert tasks, writing only rows whose content hash changed, and apply deletions.
+
+        All of it is one transaction; raises ValueError if a write fails.
+        """
+        existing, tags_by_task = self.existing_hashes()
+        incoming = {task['id'] for task in tasks}
+        # A tombstone only applies if the file does not also carry the task
+        deleted = [task_id for task_id in dict.fromkeys(deleted_ids or [])
+                   if task_id in existing and task_id not in incoming]
+        with self.db_manager.batch():
+            added, updated, unchanged = self.write_changed(tasks, existing, tags_by_task)
+            if deleted:
+                _check(self.db_manager.delete_tasks(deleted), "delete the tombstoned tasks")
+        summary = f"Merged {len(incoming)} tasks: {added} added, {updated} updated, {unchanged} unchanged"
+        if deleted:
+            summary += f", {len(deleted)} deleted"
+        return summary
+
+    def import_batch(self, filepaths: List[str], workers: int = None) -> tuple[bool, str]:
+        """Merge many JSON/CSV exports into the database.
+
+        Files are parsed, validated and normalized in a process pool. A feeder
+        thread hands the rows over a bounded queue to this thread, the only
+        writer, which commits every IMPORT_CHUNK_SIZE rows with their tags
+        and notes as one transaction.
+
+        Files are written in the order given, whatever order the workers
+        finish in: when several files carry the same task, the last one wins.
+        """
+        result = None
+        for result in self.import_batch_steps(filepaths, workers):
+            pass
+        return result
+
+    def import_batch_steps(self, filepaths: List[str], workers: int = None) -> Iterator[Optional[Tuple[bool, str]]]:
+        """import_batch one chunk at a time, for callers that must stay responsive.
+
+        Yields None after each committed chunk, or after IMPORT_POLL_MS without
+        a parsed chunk to write, and finally import_batch's (success, summary).
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        if not filepaths:
+            yield False, "No files selected"
+            return
+        rows_queue = queue.Queue(maxsize=IMPORT_QUEUE_CHUNKS)
+        report = {'files': 0, 'invalid': 0, 'errors': [], 'deleted': []}
+        workers = workers or min(len(filepaths), os.cpu_count() or 1)
+        # Set when the writer gives up or its caller closes the steps early
+        stop = threading.Event()
+
+        def hand_over(chunk) -> bool:
+            while not stop.is_set():
+                try:
+                    rows_queue.put(chunk, timeout=IMPORT_POLL_MS / 1000)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def feed():
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    futures = [pool.submit(parse_task_file, str(path)) for path in filepaths]
+                    # Parsed in parallel but handed over in submission order
+                    for future in futures:
+                        if stop.is_set():
+                            pool.shutdown(cancel_futures=True)
+                            return
+                        result = future.result()
+                        if result['error']:
+                            report['errors'].append(f"{Path(result['path']).name}: {result['error']}")
+                            continue
+                        report['files'] += 1
+                        report['invalid'] += result['invalid']
+                        report['deleted'].extend(result['deleted'])
+                        tasks = result['tasks']
+                        for start in range(0, len(tasks), IMPORT_CHUNK_SIZE):
+                            if not hand_over(tasks[start:start + IMPORT_CHUNK_SIZE]):
+                                break
+            except Exception as e:
+                report['errors'].append(str(e))
+            finally:
+                hand_over(None)
+
+        feeder = threading.Thread(target=feed, name="import-feeder", daemon=True)
+        feeder.start()
+
+        existing, tags_by_task = self.existing_hashes()
+        seen = set()
+        totals = [0, 0, 0]
+        failure = None
+        try:
+            while True:
+                try:
+                    chunk = rows_queue.get(timeout=IMPORT_POLL_MS / 1000)
+                except queue.Empty:
+                    yield None
+                    continue
+                if chunk is None:
+                    break
+                try:
+                    counts = self.write_changed(chunk, existing, tags_by_task)
+                except (ValueError, sqlite3.Error) as e:
+                    failure = str(e)
+                    break
+                seen.update(task['id'] for task in chunk)
+                for i, count in enumerate(counts):
+                    totals[i] += count
+                yield None
+        finally:
+            stop.set()
+        feeder.join()
+
+        deleted = []
+        if failure is None:
+            deleted = [task_id for task_id in set(report['deleted'])
+                       if task_id in existing and task_id not in seen]
+            if deleted and not self.db_manager.delete_tasks(deleted):
+                failure = "Could not delete the tombstoned tasks"
+                deleted = []
+
+        added, updated, unchanged = totals
+        summary = (f"Imported {report['files']} of {len(filepaths)} files: "
+                   f"{added} added, {updated} updated, {unchanged} unchanged")
+        if deleted:
+            summary += f", {len(deleted)} deleted"
+        if report['invalid']:
+            summary += f", {report['invalid']} invalid rows skipped"
+        if report['errors']:
+            summary += "\n" + "\n".join(report['errors'])
+        if failure:
+            yield False, f"Import stopped: {failure}\n{summary}"
+        else:
+            yield report['files'] > 0, summary
@@ -0,0 +1,51 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterator, Optional
+
+
+class LRUCache:
+    """Mapping that keeps at most capacity entries, evicting the least recently used.
+
+    on_evict(key, value) runs for every entry that leaves the cache through
+    eviction, pop() or clear(), so owners can release what the value holds.
+    """
+
+    def __init__(self, capacity: int, on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        self.capacity = max(int(capacity), 1)
+        self.on_evict = on_evict
+        self.entries: OrderedDict = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Look up key and mark it as most recently used"""
+        if key not in self.entries:
+            return default
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key: Hashable, value: Any):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+        self.entries[key] = value
+        while len(self.entries) > self.capacity:
+            self._evict(*self.entries.popitem(last=False))
+
+    def pop(self, key: Hashable):
+        if key in self.entries:
+            self._evict(key, self.entries.pop(key))
+
+    def clear(self):
+        while self.entries:
+            self._evict(*self.entries.popitem(last=False))
+
+    def values(self) -> Iterator[Any]:
+        """Entries from least to most recently used"""
+        return iter(list(self.entries.values()))
+
+    def _evict(self, key: Hashable, value: Any):
+        if self.on_evict:
+            self.on_evict(key, value)
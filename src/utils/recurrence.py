@@ -0,0 +1,50 @@
+import calendar
+from datetime import datetime, timedelta
+from typing import Dict
+
+from src.utils.constants import TIME_FORMAT
+
+# Repeat options (key -> label)
+FREQUENCIES: Dict[str, str] = {
+    'daily': "Daily",
+    'weekly': "Weekly",
+    'monthly': "Monthly",
+    'yearly': "Yearly",
+}
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """Same day and time months later, clamped to the end of shorter months"""
+    month_index = value.month - 1 + months
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+def occurrence(frequency: str, interval: int, anchor: datetime, index: int) -> datetime:
+    """The index-th occurrence of a series, always counted from its anchor so month ends don't drift"""
+    if frequency == 'daily':
+        return anchor + timedelta(days=interval * index)
+    if frequency == 'weekly':
+        return anchor + timedelta(weeks=interval * index)
+    if frequency == 'monthly':
+        return add_months(anchor, interval * index)
+    if frequency == 'yearly':
+        return add_months(anchor, 12 * interval * index)
+    raise ValueError(f"Unknown frequency: {frequency}")
+
+
+def next_occurrence(frequency: str, interval: int, anchor: str, after: str) -> str:
+    """First occurrence strictly later than after (all times as 'YYYY-MM-DD HH:MM:SS')"""
+    interval = max(int(interval), 1)
+    start = datetime.strptime(anchor, TIME_FORMAT)
+    limit = datetime.strptime(after, TIME_FORMAT)
+    if limit < start:
+        return anchor
+    # Jump close to the answer instead of stepping through every missed occurrence
+    days = (limit - start).days
+    period_days = {'daily': 1, 'weekly': 7, 'monthly': 31, 'yearly': 366}[frequency] * interval
+    index = max(days // period_days, 0)
+    while occurrence(frequency, interval, start, index) <= limit:
+        index += 1
+    return occurrence(frequency, interval, start, index).strftime(TIME_FORMAT)
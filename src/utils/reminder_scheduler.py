@@ -0,0 +1,85 @@
+import heapq
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.utils.constants import REMINDER_WINDOW
+
+
+class ReminderScheduler:
+    """Min-heap of the next pending reminders, without Qt.
+
+    Only the earliest `window` reminders are loaded (through load_next, which
+    returns (remind_at, task_id) pairs in order). `horizon` is the last pair
+    loaded: every reminder up to it is in the heap, anything later stays in
+    the database until the heap runs dry and is refilled. None means the
+    whole set fitted. Times are 'YYYY-MM-DD HH:MM:SS' strings, which sort
+    chronologically.
+
+    Changed tasks are applied with update(); the database must already hold
+    the new value, since later refills read it from there.
+    """
+
+    def __init__(self, load_next: Callable[[int], List[Tuple[str, str]]], window: int = REMINDER_WINDOW):
+        self.load_next = load_next
+        self.window = window
+        self.heap: List[Tuple[str, str]] = []
+        # Current reminder per task in the heap; heap entries that disagree are stale
+        self.entries: Dict[str, str] = {}
+        self.horizon: Optional[Tuple[str, str]] = None
+
+    def load(self):
+        rows = [tuple(row) for row in self.load_next(self.window)]
+        # Already sorted, which is a valid heap
+        self.heap = rows
+        self.entries = {task_id: remind_at for remind_at, task_id in rows}
+        self.horizon = rows[-1] if len(rows) >= self.window else None
+
+    def update(self, task_id: str, remind_at: Optional[str]):
+        """Reflect a changed, cleared (None), completed or deleted task's reminder"""
+        if self.entries.get(task_id) == remind_at:
+            return
+        self.entries.pop(task_id, None)
+        if remind_at is None:
+            return
+        key = (remind_at, task_id)
+        if self.horizon is not None and key > self.horizon:
+            # Beyond the loaded window; a later refill reads it from the database
+            return
+        self.entries[task_id] = remind_at
+        heapq.heappush(self.heap, key)
+        if len(self.heap) > 2 * self.window:
+            self.compact()
+
+    def compact(self):
+        """Drop stale heap entries and shrink the window back to its size"""
+        live = sorted((remind_at, task_id) for task_id, remind_at in self.entries.items())
+        if len(live) > self.window:
+            live = live[:self.window]
+            self.horizon = live[-1]
+        self.heap = live
+        self.entries = {task_id: remind_at for remind_at, task_id in live}
+
+    def _drop_stale(self):
+        while self.heap and self.entries.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+
+    def next_time(self) -> Optional[str]:
+        """Earliest pending reminder time, refilling from the database when needed"""
+        self._drop_stale()
+        if not self.heap and self.horizon is not None:
+            self.load()
+            self._drop_stale()
+        return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, now: str) -> List[str]:
+        """Remove and return the ids of the loaded reminders at or before now.
+
+        If the window ran out, more may be due beyond it: once these are
+        cleared in the database, next_time() refills and returns <= now again.
+        """
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            remind_at, task_id = heapq.heappop(self.heap)
+            if self.entries.get(task_id) == remind_at:
+                del self.entries[task_id]
+                due.append(task_id)
+        return due
@@ -1,23 +1,115 @@
+import copy
 import json
+import os
+import tempfile
 from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from src.utils.constants import BOARD_CACHE_SIZE, DEFAULT_BOARD
+
+
+def merge_defaults(defaults: Dict[str, Any], stored: Dict[str, Any]) -> Dict[str, Any]:
+    """Stored values over defaults, recursively; keys missing from the file get their default"""
+    merged = copy.deepcopy(defaults)
+    for key, value in stored.items():
+        if isinstance(merged.get(key), dict):
+            # A non-dict where a section belongs is a broken file, keep the default section
+            if isinstance(value, dict):
+                merged[key] = merge_defaults(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
 
 class SettingsManager:
-    def __init__(self):
-        self.settings_file = Path.home() / '.eisenhower_matrix' / 'settings.json'
-        self.settings_file.parent.mkdir(exist_ok=True)
+    """In-memory settings backed by settings.json.
+
+    Values are read and changed through dotted paths ('appearance.opacity').
+    Changes notify subscribers with the set of changed paths and mark the
+    file dirty; the file is rewritten atomically by flush(). When a
+    save_scheduler is set (the UI passes a debounce timer) flush runs later,
+    otherwise right away.
+    """
+
+    def __init__(self, settings_file: Optional[Path] = None):
+        self.settings_file = settings_file or Path.home() / '.eisenhower_matrix' / 'settings.json'
+        self.settings_file.parent.mkdir(parents=True, exist_ok=True)
+        self.listeners: List[Callable[[set], None]] = []
+        self.save_scheduler: Optional[Callable[[], None]] = None
+        self.dirty = False
         self.load_settings()
 
     def load_settings(self):
+        stored = {}
         if self.settings_file.exists():
-            with open(self.settings_file) as f:
-                self.settings = json.load(f)
+            try:
+                with open(self.settings_file) as f:
+                    stored = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Could not read settings, using defaults: {e}")
+            if not isinstance(stored, dict):
+                stored = {}
+        # Defaults are filled in memory only; the file is written when something changes
+        self.settings = merge_defaults(self.get_default_settings(), stored)
+
+    def get(self, path: str, default: Any = None) -> Any:
+        value = self.settings
+        for key in path.split('.'):
+            if not isinstance(value, dict) or key not in value:
+                return default
+            value = value[key]
+        return value
+
+    def set(self, path: str, value: Any):
+        self.update({path: value})
+
+    def update(self, values: Dict[str, Any]):
+        """Change several values with one notification and one save"""
+        changed = set()
+        for path, value in values.items():
+            if self.get(path) == value:
+                continue
+            *parents, key = path.split('.')
+            section = self.settings
+            for parent in parents:
+                section = section.setdefault(parent, {})
+            section[key] = copy.deepcopy(value)
+            changed.add(path)
+        if not changed:
+            return
+        for listener in list(self.listeners):
+            listener(changed)
+        self.dirty = True
+        if self.save_scheduler:
+            self.save_scheduler()
         else:
-            self.settings = self.get_default_settings()
+            self.flush()
+
+    def subscribe(self, listener: Callable[[set], None]):
+        self.listeners.append(listener)
+
+    @staticmethod
+    def changed_under(changed: Iterable[str], section: str) -> bool:
+        return any(path == section or path.startswith(section + '.') for path in changed)
+
+    def flush(self):
+        if self.dirty:
             self.save_settings()
 
     def save_settings(self):
-        with open(self.settings_file, 'w') as f:
-            json.dump(self.settings, f, indent=2)
+        """Write to a temporary file and rename it over settings.json"""
+        fd, temp_path = tempfile.mkstemp(dir=self.settings_file.parent, prefix='.settings', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.settings, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.settings_file)
+            self.dirty = False
+        except OSError as e:
+            print(f"Could not save settings: {e}")
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
 
     def get_default_settings(self):
         return {
@@ -34,5 +126,30 @@ class SettingsManager:
                     "Not Important & Not Urgent"
                 ]
             },
-            'theme': 'dark'
-        } 
\ No newline at end of file
+            'theme': 'dark',
+            'database': {
+                'profile': 'balanced'
+            },
+            'archive': {
+                'enabled': True,
+                'done_days': 30,
+                'batch_size': 500,
+                'interval_minutes': 60
+            },
+            'backup': {
+                'enabled': True,
+                'interval_hours': 24,
+                'keep': 7,
+                'compress': True
+            },
+            'promotion': {
+                'enabled': True,
+                'lead_hours': 24,
+                'interval_minutes': 5
+            },
+            'boards': {
+                'current': DEFAULT_BOARD,
+                'paths': {DEFAULT_BOARD: 'tasks.db'},
+                'open_limit': BOARD_CACHE_SIZE
+            }
+        }
@@ -0,0 +1,65 @@
+from typing import Dict, Iterable, List, Optional, Set
+
+
+def normalize_tags(tags) -> List[str]:
+    """Turn "a, B ,a" or ["a", "B"] into ["a", "b"]: trimmed, lower-case, unique"""
+    if isinstance(tags, str):
+        tags = tags.replace(';', ',').split(',')
+    normalized = []
+    for tag in tags:
+        tag = tag.strip().lower()
+        if tag and tag not in normalized:
+            normalized.append(tag)
+    return normalized
+
+
+class TagIndex:
+    """In-memory tag -> task id sets for instant multi-tag filtering"""
+
+    def __init__(self):
+        self.tasks_by_tag: Dict[str, Set[str]] = {}
+        self.tags_by_task: Dict[str, Set[str]] = {}
+
+    def load(self, tags_by_task: Dict[str, List[str]]):
+        self.tasks_by_tag.clear()
+        self.tags_by_task.clear()
+        for task_id, tags in tags_by_task.items():
+            self.set_tags(task_id, tags)
+
+    def set_tags(self, task_id: str, tags: Iterable[str]):
+        self.remove_task(task_id)
+        tags = set(tags)
+        if not tags:
+            return
+        self.tags_by_task[task_id] = tags
+        for tag in tags:
+            self.tasks_by_tag.setdefault(tag, set()).add(task_id)
+
+    def remove_task(self, task_id: str):
+        for tag in self.tags_by_task.pop(task_id, ()):
+            task_ids = self.tasks_by_tag[tag]
+            task_ids.discard(task_id)
+            if not task_ids:
+                del self.tasks_by_tag[tag]
+
+    def get_tags(self, task_id: str) -> List[str]:
+        return sorted(self.tags_by_task.get(task_id, ()))
+
+    def all_tags(self) -> List[str]:
+        return sorted(self.tasks_by_tag)
+
+    def filter(self, tags: Iterable[str], match_all: bool = True) -> Optional[Set[str]]:
+        """Task ids carrying all (AND) or any (OR) of tags; None means no filter"""
+        sets = [self.tasks_by_tag.get(tag, set()) for tag in tags]
+        if not sets:
+            return None
+        if match_all:
+            # Intersect starting from the smallest set
+            sets.sort(key=len)
+            result = set(sets[0])
+            for task_ids in sets[1:]:
+                result &= task_ids
+                if not result:
+                    break
+            return result
+        return set().union(*sets)
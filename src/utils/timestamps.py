@@ -0,0 +1,27 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from src.utils.constants import TIME_FORMAT
+
+
+def normalize_utc(value) -> Optional[str]:
+    """Stored form of a due or reminder time: UTC TIME_FORMAT text, None to clear.
+
+    Accepts TIME_FORMAT itself and ISO 8601 ('2026-10-20T10:00:00Z',
+    '...+02:00'); times without an offset are taken as UTC. Anything else
+    raises ValueError.
+    """
+    if value is None or value == '':
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid time: {value!r} (use 'YYYY-MM-DD HH:MM:SS' UTC or ISO 8601)")
+    text = value.strip()
+    if text.endswith(('Z', 'z')):
+        text = text[:-1] + '+00:00'
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        raise ValueError(f"Invalid time: {value!r} (use 'YYYY-MM-DD HH:MM:SS' UTC or ISO 8601)") from None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime(TIME_FORMAT)
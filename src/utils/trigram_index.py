@@ -0,0 +1,105 @@
+import heapq
+import math
+import re
+from collections import Counter
+from itertools import islice
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .constants import SEARCH_MIN_SIMILARITY, SEARCH_MAX_CANDIDATES
+
+_WORD = re.compile(r'\w+')
+_NO_TASKS = frozenset()
+
+
+def trigrams(text: str, prefix: bool = False) -> Set[str]:
+    """Trigrams of every word, padded as in pg_trgm: "cat" -> "  c", " ca", "cat", "at ".
+
+    With prefix the last word is left open at its end, for text still being typed.
+    """
+    words = _WORD.findall(text.lower())
+    grams = set()
+    for i, word in enumerate(words):
+        padded = f"  {word}" if prefix and i == len(words) - 1 else f"  {word} "
+        grams.update(padded[j:j + 3] for j in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """In-memory trigram -> task id sets for fuzzy description search without SQL.
+
+    A task matches when it shares SEARCH_MIN_SIMILARITY of the query's
+    trigrams, which tolerates a typo or swapped letters ("clint", "meetnig").
+    """
+
+    def __init__(self):
+        self.tasks_by_gram: Dict[str, Set[str]] = {}
+        # Lower-cased descriptions, for removal and ranking
+        self.texts: Dict[str, str] = {}
+
+    def __len__(self):
+        return len(self.texts)
+
+    def load(self, texts: Iterable[Tuple[str, str]]):
+        """Replace the index with (task id, description) pairs"""
+        self.tasks_by_gram.clear()
+        self.texts.clear()
+        for task_id, text in texts:
+            self.set_text(task_id, text)
+
+    def set_text(self, task_id: str, text: str):
+        text = text.lower()
+        if self.texts.get(task_id) == text:
+            return
+        self.remove_task(task_id)
+        self.texts[task_id] = text
+        for gram in trigrams(text):
+            self.tasks_by_gram.setdefault(gram, set()).add(task_id)
+
+    def remove_task(self, task_id: str):
+        text = self.texts.pop(task_id, None)
+        if text is None:
+            return
+        for gram in trigrams(text):
+            task_ids = self.tasks_by_gram[gram]
+            task_ids.discard(task_id)
+            if not task_ids:
+                del self.tasks_by_gram[gram]
+
+    def search(self, query: str, limit: int = 20) -> List[str]:
+        """Ids of the best matches, best first: most shared trigrams, then exact
+        substrings, then shorter descriptions.
+
+        At most SEARCH_MAX_CANDIDATES tasks are scored, so a keystroke stays
+        cheap as the index grows.
+        """
+        needle = query.strip().lower()
+        words = _WORD.findall(needle)
+        texts = self.texts
+        if len(words) == 1 and len(words[0]) < 3:
+            # One or two letters carry no full trigram: shortest descriptions with a word starting so
+            task_ids = self.tasks_by_gram.get(f"  {words[0]}"[-3:], _NO_TASKS)
+            return heapq.nsmallest(limit, islice(task_ids, SEARCH_MAX_CANDIDATES),
+                                   key=lambda task_id: len(texts[task_id]))
+        grams = trigrams(needle, prefix=True)
+        if not grams:
+            return []
+        postings = sorted((self.tasks_by_gram.get(gram, _NO_TASKS) for gram in grams), key=len)
+        required = math.ceil(len(postings) * SEARCH_MIN_SIMILARITY)
+        # Tasks holding every trigram come first, then the tasks of the
+        # len - required + 1 rarest trigrams, one of which every match holds
+        candidates = set(postings[0].intersection(*postings[1:]))
+        if len(candidates) > SEARCH_MAX_CANDIDATES:
+            candidates = set(islice(candidates, SEARCH_MAX_CANDIDATES))
+        for task_ids in postings[:len(postings) - required + 1]:
+            room = SEARCH_MAX_CANDIDATES - len(candidates)
+            if room <= 0:
+                break
+            candidates.update(task_ids if len(task_ids) <= room else islice(task_ids, room))
+        # Set intersections run in C and cost at most the candidate count each
+        hits = Counter()
+        for task_ids in postings:
+            hits.update(candidates & task_ids)
+        matches = [task_id for task_id, count in hits.items() if count >= required]
+        return heapq.nsmallest(limit, matches, key=lambda task_id: (
+            -hits[task_id], needle not in texts[task_id], len(texts[task_id])
+        ))
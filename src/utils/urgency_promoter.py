@@ -0,0 +1,66 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.utils.constants import PROMOTION_RULES, TIME_FORMAT
+
+# app_state key holding the deadline threshold of the previous tick
+STATE_KEY = 'promotion_threshold'
+
+
+class UrgencyPromoter:
+    """Moves tasks to their urgent quadrant as deadlines approach.
+
+    A task becomes urgent when due_at <= now + lead. Each tick only reads the
+    tasks whose deadline crossed that threshold since the previous tick,
+    (previous threshold, new threshold], through the (quadrant, due_at)
+    index, and moves them in one transaction together with the new
+    threshold. A task dragged back out of the urgent quadrant therefore
+    stays where the user put it.
+    """
+
+    def __init__(self, db, lead_hours: float = 24, rules: Dict[str, str] = None):
+        self.db = db
+        self.lead = timedelta(hours=lead_hours)
+        self.rules = rules or PROMOTION_RULES
+
+    def threshold(self, now: Optional[datetime] = None) -> str:
+        now = now or datetime.now(timezone.utc)
+        return (now + self.lead).strftime(TIME_FORMAT)
+
+    def tick(self, now: Optional[datetime] = None) -> List[Tuple[str, str, str]]:
+        """Promote every task that crossed the threshold; returns (task_id, from, to)"""
+        until = self.threshold(now)
+        after = self.db.get_state(STATE_KEY)
+        if after and after >= until:
+            return []
+        moves = []
+        try:
+            with self.db.batch():
+                for source, target in self.rules.items():
+                    task_ids = self.db.get_tasks_due_between(source, after, until)
+                    if task_ids:
+                        if not self.db.move_tasks(task_ids, target):
+                            raise ValueError("move_tasks failed")
+                        moves.extend((task_id, source, target) for task_id in task_ids)
+                if not self.db.set_state(STATE_KEY, until):
+                    raise ValueError("set_state failed")
+        except (ValueError, sqlite3.Error):
+            # Failed writes or a database locked by another instance: the next tick retries
+            return []
+        return moves
+
+    def promote_tasks(self, task_ids: Iterable[str], now: Optional[datetime] = None) -> List[Tuple[str, str, str]]:
+        """Check tasks whose due date was just set, which a tick would no longer see"""
+        until = self.threshold(now)
+        states = self.db.get_task_states(task_ids)
+        moves = []
+        for task_id, (quadrant, _, done) in states.items():
+            target = self.rules.get(quadrant)
+            due_at = self.db.get_task_schedule(task_id)[0]
+            if target and not done and due_at and due_at <= until:
+                moves.append((task_id, quadrant, target))
+        for target in set(target for _, _, target in moves):
+            if not self.db.move_tasks([task_id for task_id, _, to in moves if to == target], target):
+                moves = [move for move in moves if move[2] != target]
+        return moves
@@ -0,0 +1,39 @@
+from typing import Any, Dict, List, Tuple
+
+# previous value for writes whose starting state is unknown; they are always written
+UNKNOWN = object()
+
+
+class WriteCoalescer:
+    """Pending per-task field writes, merged until flushed.
+
+    Only the final value of each (task, field) is kept. If it ends up equal
+    to the value the field had before the first pending write (a checkbox
+    toggled on and off again), nothing is written at all.
+    """
+
+    def __init__(self):
+        # (task_id, field) -> [value before the first write, latest value], in first-write order
+        self.pending: Dict[Tuple[str, str], List[Any]] = {}
+
+    def __len__(self):
+        return len(self.pending)
+
+    def add(self, task_id: str, field: str, value: Any, previous: Any = UNKNOWN):
+        key = (task_id, field)
+        if key in self.pending:
+            self.pending[key][1] = value
+        else:
+            self.pending[key] = [previous, value]
+
+    def discard(self, task_id: str):
+        """Forget pending writes of a task, e.g. because it is being deleted"""
+        for key in [key for key in self.pending if key[0] == task_id]:
+            del self.pending[key]
+
+    def take(self) -> List[Tuple[str, str, Any]]:
+        """Return and clear the (task_id, field, value) writes that still change something"""
+        writes = [(task_id, field, value) for (task_id, field), (previous, value) in self.pending.items()
+                  if previous is UNKNOWN or previous != value]
+        self.pending.clear()
+        return writes